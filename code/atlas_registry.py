@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import pandas as pd
+from data_pack import pack_path, resource_exists, resource_isdir, list_resource_dir, open_resource
+
+def get_resource_path(relative_path):
+    """Get the absolute path to a resource, works for both development and PyInstaller.
+
+    Resources missing on disk resolve to their virtual path inside the data
+    pack when one is mounted (see data_pack.py); open those with the
+    data_pack helpers rather than open() or nib.load().
+    """
+    if hasattr(sys, '_MEIPASS'):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    path = os.path.join(base_path, relative_path)
+    if not os.path.exists(path):
+        return pack_path(relative_path.replace(os.sep, "/")) or path
+    return path
+
+def get_template_path():
+    """Path of the anatomical template every atlas is displayed on."""
+    template_file = get_resource_path("data/tpl-ICBM_regrid_stride.nii.gz")
+    if not resource_exists(template_file):
+        template_file = get_resource_path("data/MNI_template_1mm_stride.nii.gz")
+    return template_file
+
+# Atlases with a display name and a LUT that does not follow the naming convention.
+REGISTRY_FILE = "data/atlases.json"
+ATLAS_SUFFIXES = (".nii.gz", ".nii")
+
+def atlas_stem(path):
+    name = os.path.basename(path)
+    for suffix in ATLAS_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return None
+
+def discover_atlases():
+    """Display name -> (label volume, LUT), relative to the resource root.
+
+    Atlases listed in data/atlases.json come first, in their listed order. Any
+    other data/<stem>.nii[.gz] with a data/<stem>.txt LUT next to it registers
+    itself under its stem, so new atlases need no code changes.
+    """
+    atlases = {}
+    registry_file = get_resource_path(REGISTRY_FILE)
+    if resource_exists(registry_file):
+        with open_resource(registry_file, 'r') as f:
+            for entry in json.load(f).get("atlases", []):
+                atlases[entry["name"]] = ("data/" + entry["atlas"], "data/" + entry["lut"])
+    registered = {atlas for atlas, _ in atlases.values()}
+    data_dir = get_resource_path("data")
+    if resource_isdir(data_dir):
+        for name in list_resource_dir(data_dir):
+            stem = atlas_stem(name)
+            if stem is None or "data/" + name in registered:
+                continue
+            if resource_exists(os.path.join(data_dir, stem + ".txt")) and stem not in atlases:
+                atlases[stem] = ("data/" + name, f"data/{stem}.txt")
+    return atlases
+
+def default_atlas_options():
+    """Display name -> (atlas path, LUT path) for the bundled atlases."""
+    return {name: (get_resource_path(atlas), get_resource_path(lut)) for name, (atlas, lut) in discover_atlases().items()}
+
+def read_lut(region_file):
+    """Parse a colour LUT into ({index: name}, {index: (r, g, b)})."""
+    with open_resource(region_file, 'r') as f:
+        region_df = pd.read_csv(f, sep=r"\s+", comment="#", header=None,
+                                names=["Index", "RegionName", "R", "G", "B", "A"])
+    region_map = {row["Index"]: row["RegionName"] for _, row in region_df.iterrows()}
+    colormap = {row["Index"]: (row["R"], row["G"], row["B"]) for _, row in region_df.iterrows()}
+    return region_map, colormap
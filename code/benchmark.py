@@ -0,0 +1,220 @@
+"""Headless benchmarks for loading, rendering and guess validation.
+
+Runs the real game window under Qt's offscreen platform plugin, writes the
+results as JSON and compares them against a stored baseline:
+
+    python benchmark.py                      # all atlases, compare to baseline
+    python benchmark.py --atlas AAL --save-baseline
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QMessageBox
+import cache_utils
+
+DEFAULT_BASELINE = os.path.join(Path.home(), ".neuroguessr", "benchmarks", "baseline.json")
+MODES = ["Practice", "Contre la Montre", "Streak"]
+# Differences below this are timer noise, whatever the ratio.
+NOISE_FLOOR_MS = 0.05
+
+def median_ms(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(times))
+
+def wait_for_background_load(app, game, timeout=120.0):
+    """Pump events until the background decode of the current load has finished."""
+    if game.load_timings.first_frame is None:  # fell back to dummy data, nothing runs in the background
+        return
+    deadline = time.perf_counter() + timeout
+    while game.load_timings.fully_loaded is None and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+def wait_for_startup(app, game, timeout=120.0):
+    """Pump events until the landing page's deferred startup work (manifest refresh, previews) is done."""
+    deadline = time.perf_counter() + timeout
+    while (not game.startup_finished or game.preview_thread is not None) and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+def load_atlas(app, game, atlas):
+    game.current_atlas = atlas
+    start = time.perf_counter()
+    game.load_data()
+    first_frame = (time.perf_counter() - start) * 1000.0
+    wait_for_background_load(app, game)
+    return first_frame, (time.perf_counter() - start) * 1000.0
+
+def bench_loading(app, game, atlas, results):
+    cache_root = cache_utils.CACHE_ROOT
+    cold_root = tempfile.mkdtemp(prefix="neuroguessr-bench-")
+    try:
+        cache_utils.CACHE_ROOT = cold_root
+        results["load_cold_first_frame_ms"], results["load_cold_full_ms"] = load_atlas(app, game, atlas)
+        results["load_warm_first_frame_ms"], results["load_warm_full_ms"] = load_atlas(app, game, atlas)
+    finally:
+        cache_utils.CACHE_ROOT = cache_root
+        shutil.rmtree(cold_root, ignore_errors=True)
+
+def bench_sweeps(game, results, step):
+    shape = game.brain_volume.shape
+    # current_positions and the sliders are ordered (z, y, x).
+    for plane_index, (name, size) in enumerate(zip(["axial", "coronal", "sagittal"], [shape[2], shape[1], shape[0]])):
+        times = []
+        for index in range(0, size, step):
+            start = time.perf_counter()
+            game.update_slice_position(plane_index, index)
+            times.append((time.perf_counter() - start) * 1000.0)
+        results[f"sweep_{name}_median_ms"] = float(np.median(times))
+        results[f"sweep_{name}_total_ms"] = float(np.sum(times))
+
+def bench_update_slice(game, results, repeats):
+    view = game.slice_views[0]
+    z = game.current_positions[0]
+    labels = game.brain_volume[:, :, z].T
+    template = game.template_volume[:, :, z].T
+    region = int(labels.max())
+    results["update_slice_color_ms"] = median_ms(
+        lambda: view.update_slice(labels, template, game.colormap, None, True), repeats)
+    results["update_slice_no_color_ms"] = median_ms(
+        lambda: view.update_slice(labels, template, None, None, True), repeats)
+    view.blinking, view.blink_state = True, True
+    results["update_slice_blink_ms"] = median_ms(
+        lambda: view.update_slice(labels, template, game.colormap, region, True), repeats)
+    view.blinking = False
+
+def bench_validation(game, results, repeats, rng):
+    game.game_mode = "Practice"
+    game.start_game()
+    voxels = [tuple(int(rng.integers(0, n)) for n in game.brain_volume.shape) for _ in range(repeats)]
+    times = []
+    for voxel in voxels:
+        game.selected_position = voxel
+        start = time.perf_counter()
+        game.validate_guess()
+        times.append((time.perf_counter() - start) * 1000.0)
+    results["validate_guess_ms"] = float(np.median(times))
+
+def bench_targets(game, results, repeats):
+    for mode in MODES:
+        game.game_mode = mode
+        game.start_game()
+
+        def select():
+            if mode == "Contre la Montre" and not game.remaining_regions:
+                game.remaining_regions = game.all_regions.copy()
+            game.select_new_target()
+        results[f"select_new_target_{mode.lower().replace(' ', '_')}_ms"] = median_ms(select, repeats)
+    game.game_timer.stop()
+    game.game_running = False
+
+def run_benchmarks(atlases=None, repeats=20, sweep_step=1, seed=0):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    # Modal dialogs would block the headless run.
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+    random.seed(seed)
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+    from neuroguessr import NeuroGuessrGame
+    game = NeuroGuessrGame()
+    # Benchmark guesses must not end up in the player's click heatmaps.
+    game.heatmap_root = tempfile.mkdtemp(prefix="neuroguessr-bench-heatmaps-")
+    game.show()
+    wait_for_startup(app, game)
+    results = {}
+    for atlas in atlases or list(game.atlas_options):
+        if atlas not in game.atlas_options:
+            print(f"Warning: Unknown atlas {atlas}, skipping.")
+            continue
+        print(f"Benchmarking {atlas}...")
+        atlas_results = {}
+        bench_loading(app, game, atlas, atlas_results)
+        bench_sweeps(game, atlas_results, sweep_step)
+        bench_update_slice(game, atlas_results, repeats)
+        bench_validation(game, atlas_results, repeats, rng)
+        bench_targets(game, atlas_results, repeats)
+        results[atlas] = atlas_results
+    game.reset_distance_maps()
+    game.close()
+    shutil.rmtree(game.heatmap_root, ignore_errors=True)
+    return {
+        "meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                 "numpy": np.__version__, "machine": platform.node(), "platform": platform.platform(),
+                 "repeats": repeats, "sweep_step": sweep_step},
+        "results": results,
+    }
+
+def compare(current, baseline, threshold):
+    """(rows, regressions) for every metric present in both runs."""
+    rows, regressions = [], []
+    for atlas, metrics in current["results"].items():
+        base_metrics = baseline["results"].get(atlas, {})
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if base is None:
+                continue
+            ratio = value / base if base > 0 else float("inf")
+            regressed = ratio > 1.0 + threshold and value - base > NOISE_FLOOR_MS
+            rows.append((atlas, metric, base, value, ratio, regressed))
+            if regressed:
+                regressions.append((atlas, metric))
+    return rows, regressions
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless NeuroGuessr benchmarks.")
+    parser.add_argument("--atlas", action="append", help="atlas to benchmark (repeatable, default: all)")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write this run's results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before a metric counts as a regression")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--sweep-step", type=int, default=1, help="slice step of the plane sweeps")
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.atlas, args.repeats, args.sweep_step)
+    write_json(args.output, current)
+    print(f"Results written to {args.output}")
+    if args.save_baseline:
+        write_json(args.baseline, current)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    rows, regressions = compare(current, baseline, args.threshold)
+    for atlas, metric, base, value, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{atlas:<28}{metric:<40}{base:>10.2f}{value:>10.2f}  x{ratio:.2f}{flag}")
+    if regressions:
+        print(f"{len(regressions)} metric(s) slower than baseline by more than {args.threshold:.0%}.")
+        return 1
+    print("No regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
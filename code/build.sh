@@ -1,2 +1,4 @@
 cd code
-pyinstaller --name NeuroGuessr --windowed --add-data "../data:data"  --add-data "../code:code" -i "neuroguessr5.icns" neuroguessr_2d.py
+python data_pack.py build ../data -o NeuroGuessr.data
+pyinstaller --name NeuroGuessr --windowed --add-data "../code:code" -i "neuroguessr5.icns" neuroguessr_2d.py
+cp NeuroGuessr.data dist/NeuroGuessr.app/Contents/Resources/
@@ -0,0 +1,83 @@
+import os
+import json
+import uuid
+import hashlib
+import numpy as np
+from pathlib import Path
+from data_pack import packed_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CACHE_ROOT = os.path.join(Path.home(), ".neuroguessr", "cache")
+
+_hash_memo = {}
+
+def get_cache_dir(*parts):
+    """Return (and create) a directory under the NeuroGuessr cache root."""
+    path = os.path.join(CACHE_ROOT, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def file_hash(path, chunk_size=1 << 20):
+    """Content hash of a file, memoized on (path, size, mtime) for the session."""
+    stored = packed_hash(path)  # data pack entries carry the same hash in the index
+    if stored is not None:
+        return stored
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _hash_memo:
+        return _hash_memo[memo_key]
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+def temp_path(path):
+    """Unique sibling temp name for path: threads of one process must not share a temp file."""
+    return f"{path}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+
+def atomic_save_npy(path, array):
+    """Write an array to .npy through a temp file so readers never see a partial file."""
+    tmp_path = temp_path(path)
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp_path, path)
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Write JSON through a temp file in the same directory, then rename it into place."""
+    tmp_path = temp_path(path)
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **dump_kwargs)
+    os.replace(tmp_path, path)
+
+class FileLock:
+    """Exclusive advisory lock on a sidecar file, shared by every NeuroGuessr process."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a+')
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+        return False
@@ -1,6 +1,7 @@
 import nibabel as nib
 import numpy as np
 import os
+from probabilistic import write_probability_store
 
 # Load the probabilistic atlas
 prob_atlas = nib.load('/Users/francoisramon/Downloads/HippoAmyg/HippoAmygProbs.MNIsymSpace.left.nii.gz')
@@ -21,4 +22,8 @@ single_volume[sum_prob == 0] = 0
 discrete_atlas = nib.Nifti1Image(single_volume, prob_atlas.affine, prob_atlas.header)
 
 # Save the new discrete atlas
-nib.save(discrete_atlas, "/Users/francoisramon/Downloads/Brainstem/Brainstem-thr0.nii.gz")
\ No newline at end of file
+nib.save(discrete_atlas, "/Users/francoisramon/Downloads/Brainstem/Brainstem-thr0.nii.gz")
+
+# Keep the probabilities too: quantized per-region blocks for the probabilistic scoring mode.
+# The store must sit next to the atlas LUT: copy it to data/ beside hippoamyg_left_lut.txt.
+write_probability_store(prob_atlas, "/Users/francoisramon/Downloads/HippoAmyg/hippoamyg_left_lut.probs")
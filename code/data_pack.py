@@ -0,0 +1,287 @@
+"""Read-only, memory-mapped archive of the game's data/ directory.
+
+Layout (all integers little-endian):
+
+    header   b"NGPACK01", u64 index offset, u64 index size      (one page)
+    entries  raw file bytes, each starting on a 4096-byte page boundary
+    index    JSON {relative path: {"offset", "size", "hash"}}
+
+Offsets are relative to the start of the pack, so a pack can also be appended
+to another file and found through a 24-byte trailer at its very end:
+b"NGPKTAIL", u64 pack start, u64 pack size.
+
+Files inside a mounted pack are addressed with virtual paths of the form
+<pack file>/<relative path>. They never exist on disk; the helpers below read
+them straight from the mapping instead:
+
+    python data_pack.py build ../data -o NeuroGuessr.data
+    python data_pack.py list NeuroGuessr.data
+"""
+import io
+import os
+import sys
+import json
+import mmap
+import gzip
+import struct
+import hashlib
+import argparse
+import numpy as np
+import nibabel as nib
+
+PAGE_SIZE = 4096
+MAGIC = b"NGPACK01"
+HEADER = struct.Struct("<8sQQ")
+TRAILER_MAGIC = b"NGPKTAIL"
+TRAILER = struct.Struct("<8sQQ")
+PACK_NAME = "NeuroGuessr.data"
+
+def _align(offset):
+    return (offset + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+class DataPack:
+    """A pack mapped read-only into memory; opening it costs one index read, whatever it holds."""
+
+    def __init__(self, path, start=0):
+        self.path = os.path.abspath(path)
+        self.start = start
+        with open(self.path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_size = HEADER.unpack_from(self.mm, start)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a NeuroGuessr data pack.")
+        index_start = start + index_offset
+        self.entries = json.loads(bytes(self.mm[index_start:index_start + index_size]))
+        self.dirs = set()
+        for rel in self.entries:
+            parts = rel.split("/")[:-1]
+            self.dirs.update("/".join(parts[:i]) for i in range(1, len(parts) + 1))
+        self.mtime_ns = os.stat(self.path).st_mtime_ns
+
+    def view(self, rel):
+        """Zero-copy memoryview of one entry."""
+        entry = self.entries[rel]
+        offset = self.start + entry["offset"]
+        return memoryview(self.mm)[offset:offset + entry["size"]]
+
+    def listdir(self, rel_dir):
+        prefix = rel_dir.rstrip("/") + "/"
+        names = {rel[len(prefix):].split("/")[0] for rel in self.entries if rel.startswith(prefix)}
+        return sorted(names)
+
+class ViewReader(io.RawIOBase):
+    """Read-only file object over a memoryview; reads copy only the bytes asked for."""
+
+    def __init__(self, view):
+        super().__init__()
+        self.view = view
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), len(self.view) - self.pos)
+        if n <= 0:
+            return 0
+        buffer[:n] = self.view[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: len(self.view)}[whence]
+        self.pos = max(base + offset, 0)
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+def build_pack(root, output, prefix="data", append=False):
+    """Pack every file under root as <prefix>/<relative path>; with append, add it to the end of output."""
+    files = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if name.startswith("."):  # .DS_Store and friends
+                continue
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, root).replace(os.sep, "/")
+            files.append((f"{prefix}/{rel}" if prefix else rel, full))
+    files.sort()
+    with open(output, 'r+b' if append else 'wb') as out:
+        start = out.seek(0, os.SEEK_END)
+        if append and start % PAGE_SIZE:
+            out.write(b"\0" * (_align(start) - start))
+            start = out.tell()
+        out.write(b"\0" * PAGE_SIZE)  # header placeholder
+        index = {}
+        for rel, full in files:
+            out.write(b"\0" * (_align(out.tell()) - out.tell()))
+            offset = out.tell() - start
+            digest = hashlib.blake2b(digest_size=16)
+            with open(full, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+                    out.write(chunk)
+            index[rel] = {"offset": offset, "size": out.tell() - start - offset, "hash": digest.hexdigest()}
+        index_bytes = json.dumps(index, separators=(",", ":")).encode()
+        index_offset = out.tell() - start
+        out.write(index_bytes)
+        size = out.tell() - start
+        if append:
+            out.write(TRAILER.pack(TRAILER_MAGIC, start, size))
+        out.seek(start)
+        out.write(HEADER.pack(MAGIC, index_offset, len(index_bytes)))
+    return index
+
+def pack_in_file(path):
+    """Start offset of a pack inside path (0 for a standalone pack), or None."""
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) == MAGIC:
+                return 0
+            f.seek(0, os.SEEK_END)
+            if f.tell() < TRAILER.size:
+                return None
+            f.seek(-TRAILER.size, os.SEEK_END)
+            magic, start, _ = TRAILER.unpack(f.read(TRAILER.size))
+            return start if magic == TRAILER_MAGIC else None
+    except OSError:
+        return None
+
+def find_data_pack():
+    """The pack to read data/ from: $NEUROGUESSR_DATA_PACK, a sidecar next to the app, or one appended to it."""
+    candidates = [os.environ.get("NEUROGUESSR_DATA_PACK")]
+    if getattr(sys, 'frozen', False):
+        exe_dir = os.path.dirname(sys.executable)
+        candidates += [os.path.join(exe_dir, PACK_NAME),
+                       os.path.join(exe_dir, "..", "Resources", PACK_NAME),  # macOS .app bundle
+                       sys.executable]
+    candidates.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", PACK_NAME))
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            start = pack_in_file(candidate)
+            if start is not None:
+                try:
+                    return DataPack(candidate, start)
+                except (OSError, ValueError) as e:
+                    print(f"Warning: Failed to open data pack {candidate}: {e}")
+    return None
+
+_mounted = []
+
+def mounted_pack():
+    """The data pack of this process, located once on first use."""
+    if not _mounted:
+        _mounted.append(find_data_pack())
+    return _mounted[0]
+
+def pack_path(rel):
+    """Virtual path of a packed file or directory, or None when there is no pack or it lacks rel."""
+    pack = mounted_pack()
+    if pack is None or (rel not in pack.entries and rel not in pack.dirs):
+        return None
+    return os.path.join(pack.path, *rel.split("/"))
+
+def pack_member(path):
+    """Relative name inside the mounted pack for a virtual path, or None for ordinary paths."""
+    pack = mounted_pack()
+    if pack is None:
+        return None
+    path = os.path.abspath(path)
+    if not path.startswith(pack.path + os.sep):
+        return None
+    return os.path.relpath(path, pack.path).replace(os.sep, "/")
+
+def resource_exists(path):
+    rel = pack_member(path)
+    if rel is None:
+        return os.path.exists(path)
+    return rel in mounted_pack().entries or rel in mounted_pack().dirs
+
+def resource_isdir(path):
+    rel = pack_member(path)
+    if rel is None:
+        return os.path.isdir(path)
+    return rel in mounted_pack().dirs
+
+def list_resource_dir(path):
+    rel = pack_member(path)
+    if rel is None:
+        return sorted(os.listdir(path))
+    return mounted_pack().listdir(rel)
+
+def resource_stat(path):
+    """(size, mtime_ns); packed files share the pack's mtime."""
+    rel = pack_member(path)
+    if rel is None:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    pack = mounted_pack()
+    return pack.entries[rel]["size"], pack.mtime_ns
+
+def packed_hash(path):
+    """Content hash recorded in the pack index, or None for ordinary paths."""
+    rel = pack_member(path)
+    if rel is None:
+        return None
+    return mounted_pack().entries[rel]["hash"]
+
+def open_resource(path, mode='r'):
+    """open() for ordinary and packed files (read-only); packed files are read in place from the map."""
+    rel = pack_member(path)
+    if rel is None:
+        return open(path, mode)
+    raw = io.BufferedReader(ViewReader(mounted_pack().view(rel)))
+    return raw if 'b' in mode else io.TextIOWrapper(raw, encoding='utf-8')
+
+def load_nifti(path):
+    """nib.load for ordinary and packed NIfTI files."""
+    rel = pack_member(path)
+    if rel is None:
+        return nib.load(path)
+    stream = open_resource(path, 'rb')
+    if rel.endswith(".gz"):
+        stream = gzip.GzipFile(fileobj=stream)
+    return nib.Nifti1Image.from_stream(stream)
+
+def load_npy(path):
+    """Read-only .npy array; memory-mapped for ordinary files, a zero-copy view for packed ones."""
+    rel = pack_member(path)
+    if rel is None:
+        return np.load(path, mmap_mode='r')
+    view = mounted_pack().view(rel)
+    header = io.BytesIO(view[:PAGE_SIZE])
+    if np.lib.format.read_magic(header) == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+    count = int(np.prod(shape))
+    array = np.frombuffer(view, dtype=dtype, count=count, offset=header.tell())
+    return array.reshape(shape, order='F' if fortran_order else 'C')
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect a NeuroGuessr data pack.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="pack a data directory")
+    build.add_argument("data_dir")
+    build.add_argument("-o", "--output", default=PACK_NAME)
+    build.add_argument("--append", action="store_true", help="append to an existing file (found via its trailer)")
+    show = sub.add_parser("list", help="list the entries of a pack")
+    show.add_argument("pack")
+    args = parser.parse_args()
+    if args.command == "build":
+        index = build_pack(args.data_dir, args.output, append=args.append)
+        print(f"Packed {len(index)} files into {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
+    else:
+        start = pack_in_file(args.pack)
+        if start is None:
+            sys.exit(f"{args.pack} contains no data pack.")
+        pack = DataPack(args.pack, start)
+        for rel, entry in pack.entries.items():
+            print(f"{entry['size']:>12}  {rel}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from scipy import ndimage
+from memory import BudgetedCache
+from rle_volume import RLEVolume
+
+MAX_DISTANCE_MM = 255  # distances are stored as uint8 millimetres
+
+class DistanceMapCache:
+    """Per-label Euclidean distance maps, computed lazily off the GUI thread.
+
+    Each map covers the label's bounding box padded by pad_voxels, stores the
+    distance in whole millimetres as uint8 (clipped at 255), and lives in a
+    cache bounded by max_bytes and by the shared memory budget.
+    """
+
+    def __init__(self, label_volume, voxel_size=(1.0, 1.0, 1.0), pad_voxels=24, max_bytes=64 * 1024 * 1024):
+        self.label_volume = label_volume
+        self.voxel_size = np.asarray(voxel_size, dtype=np.float64)
+        self.pad_voxels = pad_voxels
+        self.max_bytes = max_bytes
+        self.maps = BudgetedCache("distance_maps", max_bytes=max_bytes)  # label -> (origin, uint8 map)
+        self.pending = {}
+        self.bounding_boxes = None
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="distance-maps")
+
+    @property
+    def nbytes(self):
+        return self.maps.nbytes
+
+    def prefetch(self, label):
+        """Schedule the map for label if it is neither cached nor already queued."""
+        with self.lock:
+            if label in self.maps or label in self.pending:
+                return
+            self.pending[label] = self.executor.submit(self.compute, label)
+
+    def distance_mm(self, label, voxel, wait=False):
+        """Distance in mm from voxel to label, or None if the map is not ready and wait is False."""
+        entry = self.maps.get(label)
+        with self.lock:
+            future = self.pending.get(label)
+        if entry is None:
+            if future is None:
+                self.prefetch(label)
+                with self.lock:
+                    future = self.pending.get(label)
+            if future is None or (not wait and not future.done()):
+                return None
+            entry = future.result()
+            if entry is None:
+                return None
+        origin, dist = entry
+        local = np.asarray(voxel) - origin
+        if np.all(local >= 0) and np.all(local < dist.shape):
+            return float(dist[tuple(local)])
+        # Outside the padded box: fall back to the distance to the box itself.
+        gap = np.maximum(np.maximum(origin - voxel, np.asarray(voxel) - (origin + dist.shape - 1)), 0)
+        return float(min(np.sqrt(np.sum((gap * self.voxel_size) ** 2)) + self.pad_voxels * self.voxel_size.min(),
+                         MAX_DISTANCE_MM))
+
+    def compute(self, label):
+        try:
+            if self.bounding_boxes is None:
+                if isinstance(self.label_volume, RLEVolume):
+                    self.bounding_boxes = self.label_volume.find_objects()
+                else:
+                    self.bounding_boxes = ndimage.find_objects(np.asarray(self.label_volume))
+            if label <= 0 or label > len(self.bounding_boxes) or self.bounding_boxes[label - 1] is None:
+                return None
+            start = time.perf_counter()
+            box = self.bounding_boxes[label - 1]
+            shape = self.label_volume.shape
+            lo = np.array([max(s.start - self.pad_voxels, 0) for s in box])
+            hi = np.array([min(s.stop + self.pad_voxels, n) for s, n in zip(box, shape)])
+            region = np.asarray(self.label_volume[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]]) != label
+            dist = ndimage.distance_transform_edt(region, sampling=self.voxel_size)
+            entry = (lo, np.minimum(np.rint(dist), MAX_DISTANCE_MM).astype(np.uint8))
+            return self.maps.put(label, entry, entry[1].nbytes, (time.perf_counter() - start) * 1000)
+        finally:
+            with self.lock:
+                self.pending.pop(label, None)
+
+    def shutdown(self, wait=False):
+        """Drop queued maps; with wait, also block until the one being computed is done."""
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+def near_miss_credit(distance_mm, full_miss_mm=20.0):
+    """Partial credit in [0, 1) that decays linearly to zero at full_miss_mm."""
+    if distance_mm is None:
+        return 0.0
+    return max(0.0, 1.0 - distance_mm / full_miss_mm)
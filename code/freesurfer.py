@@ -0,0 +1,61 @@
+import os
+import numpy as np
+import nibabel as nib
+from nibabel import orientations
+from atlas_registry import read_lut
+from resampling import label_array, needs_resampling, resample_labels
+
+SUBJECT_FILES = ("mri/T1.mgz", "mri/aparc.a2009s+aseg.mgz")
+
+def find_subject_files(subject_dir):
+    """(T1, aparc.a2009s+aseg) paths inside a FreeSurfer subject directory, or None."""
+    paths = [os.path.join(subject_dir, rel) for rel in SUBJECT_FILES]
+    return tuple(paths) if all(os.path.exists(p) for p in paths) else None
+
+def reorient(img, axcodes):
+    """Reorder and flip an image's axes so it shares the display orientation of the template."""
+    transform = orientations.ornt_transform(orientations.io_orientation(img.affine),
+                                            orientations.axcodes2ornt(axcodes))
+    data = orientations.apply_orientation(np.asanyarray(img.dataobj), transform)
+    affine = img.affine @ orientations.inv_ornt_aff(transform, img.shape[:3])
+    return nib.Nifti1Image(data, affine)
+
+def dense_remap(volume, keep_ids=None):
+    """Remap sparse label IDs to a dense uint16 index through one vectorized lookup.
+
+    Returns (dense volume, original IDs) where original_ids[dense] == original.
+    Background (0) always maps to 0, as does any label missing from keep_ids.
+    """
+    counts = np.bincount(volume.ravel())
+    present = np.flatnonzero(counts)
+    if keep_ids is not None:
+        present = present[np.isin(present, np.asarray(list(keep_ids)))]
+    if present.size == 0 or present[0] != 0:
+        present = np.concatenate(([0], present))
+    if len(present) > np.iinfo(np.uint16).max:
+        raise ValueError(f"Too many distinct labels ({len(present)}) for a uint16 index.")
+    lookup = np.zeros(len(counts), dtype=np.uint16)
+    lookup[present] = np.arange(len(present), dtype=np.uint16)
+    return lookup[volume], present
+
+def load_freesurfer_subject(t1_file, aparc_file, lut_file, axcodes=("L", "P", "I")):
+    """Load a subject's T1 and aparc+aseg in native space with dense labels.
+
+    Returns (t1 image, t1 volume, label image, dense labels, region_map,
+    colormap, original_ids). region_map and colormap are keyed by dense ID and
+    only contain the LUT entries present in the volume.
+    """
+    t1_img = reorient(nib.load(t1_file), axcodes)
+    label_img = reorient(nib.load(aparc_file), axcodes)
+    labels = label_array(label_img)
+    if needs_resampling(label_img, t1_img):
+        labels = resample_labels(labels, label_img.affine, t1_img.shape[:3], t1_img.affine)
+    lut_names, lut_colors = read_lut(lut_file)
+    dense, original_ids = dense_remap(labels, keep_ids=lut_names.keys())
+    region_map, colormap = {}, {}
+    for dense_id, original in enumerate(original_ids):
+        original = int(original)
+        region_map[dense_id] = lut_names.get(original, "Unknown")
+        colormap[dense_id] = lut_colors.get(original, (0, 0, 0))
+    label_img = nib.Nifti1Image(dense, t1_img.affine)
+    return t1_img, np.asanyarray(t1_img.dataobj), label_img, dense, region_map, colormap, original_ids
@@ -0,0 +1,125 @@
+"""Grade exam answer sheets of MNI coordinates in bulk.
+
+Input is a CSV or Parquet file with one answer per row:
+
+    student,atlas,target,x,y,z
+    alice,AAL,Precentral_L,-38,-20,56
+
+target is a region name of the atlas's LUT (case-insensitive) or its label
+number; x, y, z are world coordinates in mm. Rows are read in chunks,
+converted to voxels with one affine product and looked up in the memory-mapped
+multi-atlas index, so memory stays bounded however long the file is:
+
+    python grade.py answers.csv -o scores.csv
+    python grade.py answers.parquet -o scores.csv --details graded.csv
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from multi_atlas import load_multi_atlas_index
+
+COLUMNS = ["student", "atlas", "target", "x", "y", "z"]
+CHUNK_ROWS = 500_000
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """DataFrames of at most chunk_rows answers from a CSV or Parquet file."""
+    if path.lower().endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet answer sheets needs pyarrow (pip install pyarrow).")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=COLUMNS):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=COLUMNS, chunksize=chunk_rows,
+                               dtype={"student": str, "atlas": str, "target": str})
+
+class Grader:
+    """Grades answer chunks against the multi-atlas index and keeps per-student totals."""
+
+    def __init__(self, index=None):
+        self.index = index or load_multi_atlas_index()
+        self.atlas_codes = {atlas: i for i, atlas in enumerate(self.index.atlases)}
+        self.name_to_label = [{name.lower(): label for label, name in names.items()} for names in self.index.names]
+        self.totals = None
+
+    def target_label(self, atlas_code, target):
+        """Label of a target name or number in one atlas, or -1 when the atlas does not define it.
+
+        Background (label 0) is never a valid target.
+        """
+        if atlas_code < 0:
+            return -1
+        target = str(target).strip()
+        if target.isdigit():
+            label = int(target)
+            return label if label > 0 and label in self.index.names[atlas_code] else -1
+        label = self.name_to_label[atlas_code].get(target.lower(), -1)
+        return label if label > 0 else -1
+
+    def grade_chunk(self, chunk):
+        """The chunk with clicked label, expected label and correct/valid columns added."""
+        atlas_codes = chunk["atlas"].map(self.atlas_codes).fillna(-1).to_numpy(dtype=np.intp)
+        # Resolve each distinct (atlas, target) pair once, then gather per row.
+        target_codes, targets = pd.factorize(chunk["target"].astype(str))
+        pairs, pair_codes = np.unique((atlas_codes + 1) * len(targets) + target_codes, return_inverse=True)
+        pair_labels = np.array([self.target_label(pair // len(targets) - 1, targets[pair % len(targets)])
+                                for pair in pairs], dtype=np.int64)
+        expected = pair_labels[pair_codes]
+        voxels = self.index.mm_to_voxels(chunk[["x", "y", "z"]].to_numpy(dtype=np.float64))
+        inside = np.all((voxels >= 0) & (voxels < np.array(self.index.shape)), axis=1)
+        valid = inside & (expected > 0)
+        clicked = np.zeros(len(chunk), dtype=np.int64)
+        v = voxels[valid]
+        clicked[valid] = self.index.labels[v[:, 0], v[:, 1], v[:, 2], atlas_codes[valid]]
+        correct = valid & (clicked == expected)
+        totals = pd.DataFrame({"student": chunk["student"].to_numpy(), "answers": 1, "correct": correct, "invalid": ~valid})
+        totals = totals.groupby("student", sort=False).sum()
+        self.totals = totals if self.totals is None else self.totals.add(totals, fill_value=0)
+        return chunk.assign(expected=expected, clicked=clicked, valid=valid, correct=correct)
+
+    def scores(self):
+        """Per-student answers, correct, invalid and score (percent of answers)."""
+        if self.totals is None:
+            return pd.DataFrame(columns=["answers", "correct", "invalid", "score"])
+        scores = self.totals.astype(np.int64).sort_index()
+        scores["score"] = (scores["correct"] / scores["answers"] * 100).round(2)
+        return scores
+
+def grade_file(path, index=None, details=None, chunk_rows=CHUNK_ROWS):
+    """Grade every answer of a file; optionally stream graded rows to a details CSV."""
+    grader = Grader(index)
+    header = True
+    for chunk in read_chunks(path, chunk_rows):
+        graded = grader.grade_chunk(chunk)
+        if details:
+            graded.to_csv(details, mode='w' if header else 'a', header=header, index=False)
+            header = False
+    return grader.scores()
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade answer sheets of (student, atlas, target, x, y, z) rows.")
+    parser.add_argument("answers", help="CSV or Parquet answer file")
+    parser.add_argument("-o", "--output", default="scores.csv", help="per-student scores CSV")
+    parser.add_argument("--details", help="also write every graded answer to this CSV")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="answers read per chunk")
+    args = parser.parse_args()
+    if not os.path.exists(args.answers):
+        sys.exit(f"Answer file {args.answers} not found.")
+    start = time.perf_counter()
+    try:
+        scores = grade_file(args.answers, details=args.details, chunk_rows=args.chunk_rows)
+    except (ImportError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+    scores.to_csv(args.output, index_label="student")
+    answers = int(scores["answers"].sum()) if len(scores) else 0
+    print(f"Graded {answers} answers from {len(scores)} students in {time.perf_counter() - start:.1f} s -> {args.output}")
+    invalid = int(scores["invalid"].sum()) if len(scores) else 0
+    if invalid:
+        print(f"Warning: {invalid} answers had an unknown atlas or target, or fell outside the template.")
+
+if __name__ == "__main__":
+    main()
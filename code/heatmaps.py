@@ -0,0 +1,249 @@
+"""Cross-session click heatmaps: where players click when looking for each region.
+
+Every guess adds one count at (target, voxel). Counts are sparse: sorted uint64
+keys target * voxels + flat voxel index, each with a uint32 count, stored
+under ~/.neuroguessr/heatmaps/<atlas>/ as
+
+    counts.npz       compacted counts of earlier sessions
+    session-*.npz    one small delta per finished game
+
+Games only ever add deltas, so concurrent instances never contend; deltas are
+folded into counts.npz under a file lock once enough of them pile up.
+Heatmap directories collected from several machines merge the same way:
+
+    python heatmaps.py merge alice/heatmaps bob/heatmaps -o class/heatmaps
+    python heatmaps.py summary --root class/heatmaps --atlas AAL
+"""
+import os
+import re
+import glob
+import time
+import uuid
+import argparse
+import numpy as np
+from pathlib import Path
+from scipy.ndimage import gaussian_filter
+from cache_utils import FileLock, temp_path
+from rendering import PLANE_AXES
+
+HEATMAP_ROOT = os.path.join(Path.home(), ".neuroguessr", "heatmaps")
+COUNTS_FILE = "counts.npz"
+COMPACT_AFTER = 32  # session deltas tolerated before they are folded into counts.npz
+SLAB = 2            # clicks up to this many slices away still show on a slice
+SIGMA = 1.5         # smoothing of the splatted clicks, in pixels
+
+EMPTY = (np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.uint32))
+
+def atlas_dir_name(atlas):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", atlas).strip("_") or "atlas"
+
+def merge_counts(parts):
+    """Sum sparse (keys, counts) pairs into one pair with sorted, unique keys."""
+    parts = [(keys, counts) for keys, counts in parts if len(keys)]
+    if not parts:
+        return EMPTY
+    if len(parts) == 1:
+        return parts[0]
+    keys, inverse = np.unique(np.concatenate([keys for keys, _ in parts]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([counts for _, counts in parts]), minlength=len(keys))
+    return keys, counts.astype(np.uint32)
+
+def read_counts(path):
+    """(keys, counts, shape, atlas) of one counts or session file."""
+    with np.load(path) as f:
+        return f["keys"], f["counts"], tuple(int(n) for n in f["shape"]), str(f["atlas"])
+
+def write_counts(path, keys, counts, shape, atlas):
+    tmp_path = temp_path(path)
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, keys=keys, counts=counts, shape=np.array(shape), atlas=np.array(atlas))
+    os.replace(tmp_path, path)
+
+def session_files(directory):
+    return sorted(glob.glob(os.path.join(directory, "session-*.npz")))
+
+def load_directory(directory, shape=None, sessions=None):
+    """Merged (keys, counts, shape, atlas) of a heatmap directory; files on another grid are skipped.
+
+    sessions restricts the deltas read to the given paths (default: all of them).
+    """
+    parts, atlas = [], None
+    if sessions is None:
+        sessions = session_files(directory)
+    for path in [os.path.join(directory, COUNTS_FILE)] + sessions:
+        try:
+            keys, counts, file_shape, atlas = read_counts(path)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Skipping unreadable heatmap file {path}: {e}")
+            continue
+        if shape is None:
+            shape = file_shape
+        if file_shape != tuple(shape):
+            print(f"Warning: Skipping heatmap file {path} recorded on a {file_shape} grid.")
+            continue
+        parts.append((keys, counts))
+    keys, counts = merge_counts(parts)
+    return keys, counts, shape, atlas
+
+def compact(directory):
+    """Fold the session deltas of a directory into its counts.npz."""
+    with FileLock(os.path.join(directory, ".lock")):
+        sessions = session_files(directory)
+        if not sessions:
+            return
+        # Only the listed deltas are folded and deleted; one saved meanwhile waits for the next compaction.
+        keys, counts, shape, atlas = load_directory(directory, sessions=sessions)
+        if shape is None:
+            return
+        write_counts(os.path.join(directory, COUNTS_FILE), keys, counts, shape, atlas)
+        for path in sessions:
+            os.remove(path)
+
+class ClickHeatmap:
+    """Click counts of one atlas (at one region level) on one voxel grid."""
+
+    def __init__(self, atlas, shape, root=None):
+        self.atlas = atlas
+        self.shape = tuple(int(n) for n in shape[:3])
+        self.voxels = int(np.prod(self.shape))
+        self.directory = os.path.join(root or HEATMAP_ROOT, atlas_dir_name(atlas))
+        self.pending = []
+        self.stored = None
+        self.version = 0
+
+    def add(self, target, voxel):
+        """Count one guess at a voxel while looking for target."""
+        flat = np.ravel_multi_index(tuple(int(c) for c in voxel), self.shape)
+        self.pending.append(int(target) * self.voxels + int(flat))
+        self.version += 1
+
+    def session_counts(self):
+        if not self.pending:
+            return EMPTY
+        keys, counts = np.unique(np.array(self.pending, dtype=np.uint64), return_counts=True)
+        return keys, counts.astype(np.uint32)
+
+    def load(self):
+        """Counts of all saved sessions, read once."""
+        if self.stored is None:
+            keys, counts, _, _ = load_directory(self.directory, self.shape)
+            self.stored = (keys, counts)
+        return self.stored
+
+    def counts(self):
+        """Saved counts plus this session's clicks."""
+        return merge_counts([self.load(), self.session_counts()])
+
+    def save_session(self):
+        """Write this session's clicks as a delta file and compact once enough have piled up."""
+        if not self.pending:
+            return
+        keys, counts = self.session_counts()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            name = f"session-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}.npz"
+            write_counts(os.path.join(self.directory, name), keys, counts, self.shape, self.atlas)
+            if self.stored is not None:
+                self.stored = merge_counts([self.stored, (keys, counts)])
+            self.pending = []
+            if len(session_files(self.directory)) >= COMPACT_AFTER:
+                compact(self.directory)
+        except OSError as e:
+            print(f"Warning: Failed to save click heatmap {self.directory}: {e}")
+
+    def target_points(self, target):
+        """(voxel coordinates (N, 3), counts (N,)) of the clicks made while looking for target."""
+        keys, counts = self.counts()
+        lo, hi = np.searchsorted(keys, np.array([target, target + 1], dtype=np.uint64) * np.uint64(self.voxels))
+        flat = (keys[lo:hi] - np.uint64(target) * np.uint64(self.voxels)).astype(np.intp)
+        return np.stack(np.unravel_index(flat, self.shape), axis=1), counts[lo:hi]
+
+def splat(cols, rows, weights, shape):
+    """Smoothed 2D density of weighted points on a (rows, cols) image."""
+    inside = (cols >= 0) & (cols < shape[1]) & (rows >= 0) & (rows < shape[0])
+    density = np.bincount(rows[inside] * shape[1] + cols[inside], weights=weights[inside],
+                          minlength=shape[0] * shape[1]).reshape(shape)
+    return gaussian_filter(density, SIGMA)
+
+def heat_levels(density, peak):
+    """Density to overlay palette indices 1..255; 0 leaves the pixel uncovered."""
+    levels = np.clip(np.ceil(density / peak * 255), 0, 255).astype(np.uint8)
+    levels[density < peak * 0.02] = 0
+    return levels
+
+def peak_density(counts):
+    """Density at the centre of the busiest voxel's smoothed splat."""
+    return max(float(counts.max()), 1.0) / (2 * np.pi * SIGMA ** 2) if len(counts) else 1.0
+
+def plane_heat(points, counts, plane_index, slice_index, shape):
+    """Overlay levels for one orthogonal view, laid out like update_all_slices' transposed slices."""
+    depth_axis, row_axis, col_axis = PLANE_AXES[plane_index]
+    near = np.abs(points[:, depth_axis] - slice_index) <= SLAB
+    density = splat(points[near, col_axis], points[near, row_axis], counts[near].astype(np.float64),
+                    (shape[row_axis], shape[col_axis]))
+    return heat_levels(density, peak_density(counts))
+
+def oblique_heat(points, counts, plane, centre):
+    """Overlay levels for the oblique view through centre."""
+    cols, rows, depths = plane.project_points(points, centre)
+    near = np.abs(depths) <= SLAB
+    density = splat(cols[near], rows[near], counts[near].astype(np.float64), (plane.size, plane.size))
+    return heat_levels(density, peak_density(counts))
+
+def summary(root, atlas=None):
+    """(atlas, target, clicks, distinct voxels) rows for every heatmap under root."""
+    rows = []
+    for directory in sorted(glob.glob(os.path.join(root, "*"))):
+        keys, counts, shape, name = load_directory(directory)
+        if shape is None or (atlas and name != atlas):
+            continue
+        targets = (keys // np.uint64(int(np.prod(shape)))).astype(np.int64)
+        for target in np.unique(targets):
+            mask = targets == target
+            rows.append((name, int(target), int(counts[mask].sum()), int(mask.sum())))
+    return rows
+
+def merge_directories(sources, output):
+    """Merge the heatmaps of several roots (e.g. one per student) into output."""
+    by_atlas = {}
+    for root in sources:
+        for directory in sorted(glob.glob(os.path.join(root, "*"))):
+            if os.path.isdir(directory):
+                by_atlas.setdefault(os.path.basename(directory), []).append(directory)
+    for name, directories in by_atlas.items():
+        parts, shape, atlas = [], None, None
+        for directory in directories:
+            keys, counts, dir_shape, dir_atlas = load_directory(directory, shape)
+            if dir_shape is None:
+                continue
+            shape, atlas = dir_shape, dir_atlas
+            parts.append((keys, counts))
+        target_dir = os.path.join(output, name)
+        os.makedirs(target_dir, exist_ok=True)
+        existing_keys, existing_counts, _, _ = load_directory(target_dir, shape)
+        keys, counts = merge_counts(parts + [(existing_keys, existing_counts)])
+        write_counts(os.path.join(target_dir, COUNTS_FILE), keys, counts, shape, atlas)
+        for path in session_files(target_dir):
+            os.remove(path)
+        print(f"{atlas}: {int(counts.sum())} clicks from {len(parts)} heatmap(s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and merge NeuroGuessr click heatmaps.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    merge = sub.add_parser("merge", help="merge heatmap roots into one")
+    merge.add_argument("sources", nargs="+")
+    merge.add_argument("-o", "--output", required=True)
+    show = sub.add_parser("summary", help="clicks per target")
+    show.add_argument("--root", default=HEATMAP_ROOT)
+    show.add_argument("--atlas")
+    args = parser.parse_args()
+    if args.command == "merge":
+        merge_directories(args.sources, args.output)
+    else:
+        for atlas, target, clicks, voxels in summary(args.root, args.atlas):
+            print(f"{atlas:<32}{target:>8}{clicks:>8} clicks{voxels:>8} voxels")
+
+if __name__ == "__main__":
+    main()
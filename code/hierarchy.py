@@ -0,0 +1,85 @@
+import os
+import re
+import json
+import numpy as np
+from data_pack import resource_exists, open_resource
+from rle_volume import RLEVolume
+
+FINE_LEVEL = "All Regions"
+MERGED_LEVEL = "Left/Right Merged"
+HEMISPHERE_LEVEL = "Hemispheres"
+
+# (pattern, side) pairs covering the naming styles of the bundled LUTs and FreeSurfer.
+_SIDE_PATTERNS = [
+    (re.compile(r"^(?:Left|left)[-_]"), "Left"),
+    (re.compile(r"^(?:Right|right)[-_]"), "Right"),
+    (re.compile(r"[-_]L$"), "Left"),
+    (re.compile(r"[-_]R$"), "Right"),
+    (re.compile(r"_lh_"), "Left"),
+    (re.compile(r"_rh_"), "Right"),
+]
+
+def hierarchy_path(region_file):
+    """Hierarchy sidecar of a LUT, e.g. data/aal.txt -> data/aal_hierarchy.json."""
+    return os.path.splitext(region_file)[0] + "_hierarchy.json"
+
+def split_side(name):
+    """(side, name without the side marker); side is None for midline structures."""
+    for pattern, side in _SIDE_PATTERNS:
+        if pattern.search(name):
+            stripped = pattern.sub("_" if pattern.pattern.startswith("_") else "", name, count=1)
+            return side, stripped.strip("-_")
+    return None, name
+
+def automatic_levels(region_map):
+    """Label -> group maps that can be derived from left/right naming alone."""
+    sides = {label: split_side(name) for label, name in region_map.items() if label > 0}
+    if sum(side is not None for side, _ in sides.values()) < 2:
+        return {}
+    return {
+        MERGED_LEVEL: {label: stripped for label, (_, stripped) in sides.items()},
+        HEMISPHERE_LEVEL: {label: side or "Midline" for label, (side, _) in sides.items()},
+    }
+
+def load_levels(region_file, region_map):
+    """All coarser levels for an atlas: the sidecar's levels first, then the automatic ones."""
+    levels = {}
+    path = hierarchy_path(region_file)
+    if resource_exists(path):
+        with open_resource(path, 'r') as f:
+            for level, parents in json.load(f).get("levels", {}).items():
+                levels[level] = {int(label): parent for label, parent in parents.items()}
+    for level, parents in automatic_levels(region_map).items():
+        levels.setdefault(level, parents)
+    return levels
+
+def derive_level(volume, region_map, colormap, parents):
+    """Relabel a volume to one of its coarser levels with a single LUT gather.
+
+    Group IDs follow the order of their first member label. Each group takes
+    the colour of that first member and lists its members as region info.
+    Returns (volume, region_map, colormap, region_info).
+    """
+    groups = {}
+    lut = np.zeros(max(max(region_map), int(volume.max())) + 1, dtype=np.uint16)
+    members = {}
+    for label in sorted(label for label in region_map if label > 0):
+        parent = parents.get(label)
+        if parent is None:
+            continue
+        if parent not in groups:
+            groups[parent] = len(groups) + 1
+            members[groups[parent]] = []
+        lut[label] = groups[parent]
+        members[groups[parent]].append(region_map[label])
+    derived_map = {0: region_map.get(0, "Background")}
+    derived_colors = {0: (0, 0, 0)}
+    derived_info = {}
+    for parent, group_id in groups.items():
+        derived_map[group_id] = parent
+        first_label = int(np.flatnonzero(lut == group_id)[0])
+        derived_colors[group_id] = colormap.get(first_label, (128, 128, 128))
+        derived_info[str(group_id)] = {"name": parent, "structure": [f"Includes: {', '.join(members[group_id])}"],
+                                       "function": []}
+    derived = volume.relabel(lut) if isinstance(volume, RLEVolume) else lut[volume]
+    return derived, derived_map, derived_colors, derived_info
@@ -0,0 +1,61 @@
+import os
+import gzip
+import json
+import time
+from pathlib import Path
+
+TRACE_VERSION = 1
+TRACE_DIR = os.path.join(Path.home(), ".neuroguessr", "traces")
+
+# Event kinds and their arguments:
+#   wheel   plane, delta          scroll over a slice view
+#   click   x, y, plane           press on a slice view
+#   drag    x, y, plane           move with the button held
+#   slider  plane, value          slice slider dragged by hand
+#   oblique enabled, tilt, rotate oblique view toggled or turned
+#   start                         Start Game pressed
+#   guess                         guess confirmed
+#   type    text                  Name It answer edited
+#   name    label                 Name It answer submitted
+EVENT_KINDS = ("wheel", "click", "drag", "slider", "oblique", "start", "guess", "type", "name")
+
+def default_trace_path(atlas):
+    safe_atlas = "".join(c if c.isalnum() else "_" for c in atlas)
+    return os.path.join(TRACE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{safe_atlas}.trace.json.gz")
+
+class TraceRecorder:
+    """Collects the input events of one session from the landing page to the menu.
+
+    Events are kept as compact [ms since start, kind, *args] rows and written as
+    gzipped JSON together with the settings and RNG seed needed to replay them.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = dict(header)
+        self.start = time.perf_counter()
+        self.events = []
+
+    def record(self, kind, *args):
+        self.events.append([round((time.perf_counter() - self.start) * 1000.0, 1), kind, *args])
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        data = dict(self.header, version=TRACE_VERSION, events=self.events)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        return self.path
+
+def load_trace(path):
+    """Read a trace written by TraceRecorder (gzipped or plain JSON)."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        trace = json.load(f)
+    if trace.get("version") != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {trace.get('version')} in {path}.")
+    unknown = {event[1] for event in trace["events"]} - set(EVENT_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown trace events {sorted(unknown)} in {path}.")
+    return trace
@@ -0,0 +1,126 @@
+"""Atlas manifest: what every bundled atlas contains, without decoding it at startup.
+
+    python manifest.py           # refresh data/atlas_manifest.json
+    python manifest.py --force   # re-inspect every atlas
+"""
+import os
+import json
+import argparse
+import numpy as np
+from atlas_registry import get_resource_path, discover_atlases, read_lut
+from data_pack import resource_exists, resource_stat, load_nifti, open_resource
+from cache_utils import get_cache_dir, file_hash, atomic_write_json
+from resampling import label_array
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "data/atlas_manifest.json"
+
+def manifest_path():
+    """The game keeps its up-to-date copy in the cache; data/atlas_manifest.json is only the seed."""
+    return os.path.join(get_cache_dir(), "atlas_manifest.json")
+
+def sidecar_files(lut):
+    """Existing sidecars of a LUT, relative to the resource root."""
+    stem = os.path.splitext(lut)[0]
+    candidates = {"info": stem + ".json", "hierarchy": stem + "_hierarchy.json", "probabilities": stem + ".probs"}
+    return {kind: rel for kind, rel in candidates.items() if resource_exists(get_resource_path(rel))}
+
+def file_state(rel, previous=None):
+    """(size, mtime, hash) of a file; the hash is reused while size and mtime are unchanged."""
+    size, mtime_ns = resource_stat(get_resource_path(rel))
+    state = {"size": size, "mtime_ns": mtime_ns}
+    if previous and previous.get("size") == state["size"] and previous.get("mtime_ns") == state["mtime_ns"]:
+        state["hash"] = previous["hash"]
+    else:
+        state["hash"] = file_hash(get_resource_path(rel))
+    return state
+
+def inspect_atlas(atlas, lut):
+    """Decode one atlas and summarize it: grid, labels in use and the bounds of its labelled voxels."""
+    img = load_nifti(get_resource_path(atlas))
+    labels = label_array(img)
+    region_map, _ = read_lut(get_resource_path(lut))
+    present = np.flatnonzero(np.bincount(labels[labels > 0].ravel())) if labels.max() > 0 else np.array([], dtype=int)
+    roi = None
+    if present.size:
+        bounds = [np.flatnonzero(np.any(labels > 0, axis=tuple(a for a in range(3) if a != axis))) for axis in range(3)]
+        roi = [[int(b[0]) for b in bounds], [int(b[-1]) + 1 for b in bounds]]
+    return {
+        "shape": [int(n) for n in img.shape[:3]],
+        "dtype": str(img.get_data_dtype()),
+        "zooms": [float(z) for z in img.header.get_zooms()[:3]],
+        "affine": img.affine.tolist(),
+        "label_count": int(sum(1 for label in present if int(label) in region_map)),
+        "lut_entries": int(sum(1 for label in region_map if label > 0)),
+        "roi_bounds": roi,
+    }
+
+def load_manifest(path=None):
+    path = path or manifest_path()
+    for candidate in (path, get_resource_path(MANIFEST_FILE)):
+        try:
+            with open_resource(candidate, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (OSError, json.JSONDecodeError):
+            continue
+    return {"version": MANIFEST_VERSION, "atlases": {}}
+
+def update_manifest(path=None, force=False):
+    """Bring the manifest up to date with data/, re-inspecting only atlases whose files changed.
+
+    A file counts as changed when its size or mtime differ and its content hash
+    no longer matches, so a copy of unchanged data (e.g. a fresh checkout)
+    only costs a hash. The manifest is rewritten only when something changed.
+    """
+    path = path or manifest_path()
+    manifest = load_manifest(path)
+    previous = manifest["atlases"]
+    atlases = {}
+    changed = False
+    for name, (atlas, lut) in discover_atlases().items():
+        old = previous.get(name, {})
+        if not all(resource_exists(get_resource_path(rel)) for rel in (atlas, lut)):
+            atlases[name] = {"atlas": atlas, "lut": lut, "missing": True}
+            changed |= old != atlases[name]
+            continue
+        old_files = old.get("files", {}) if old.get("atlas") == atlas and old.get("lut") == lut else {}
+        files = {rel: file_state(rel, old_files.get(rel)) for rel in (atlas, lut)}
+        entry = {"atlas": atlas, "lut": lut, "sidecars": sidecar_files(lut), "files": files}
+        same_content = all(old_files.get(rel, {}).get("hash") == state["hash"] for rel, state in files.items())
+        if same_content and not force and "shape" in old:
+            entry.update({key: old[key] for key in ("shape", "dtype", "zooms", "affine", "label_count", "lut_entries", "roi_bounds")})
+        else:
+            try:
+                entry.update(inspect_atlas(atlas, lut))
+            except Exception as e:
+                print(f"Warning: Failed to inspect atlas {name}: {e}")
+                entry["error"] = str(e)
+        atlases[name] = entry
+        changed |= old != entry
+    changed |= set(previous) != set(atlases)
+    manifest = {"version": MANIFEST_VERSION, "atlases": atlases}
+    if changed:
+        try:
+            atomic_write_json(path, manifest, indent=2)
+        except OSError as e:
+            print(f"Warning: Failed to write atlas manifest {path}: {e}")
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the atlas manifest from data/.")
+    parser.add_argument("--force", action="store_true", help="re-inspect every atlas")
+    parser.add_argument("--output", default=get_resource_path(MANIFEST_FILE), help="manifest to write")
+    args = parser.parse_args()
+    manifest = update_manifest(args.output, force=args.force)
+    for name, entry in manifest["atlases"].items():
+        if entry.get("missing"):
+            print(f"{name:<24} missing files")
+        elif "error" in entry:
+            print(f"{name:<24} error: {entry['error']}")
+        else:
+            print(f"{name:<24} {entry['label_count']:>4} regions  {'x'.join(map(str, entry['shape']))}  {entry['dtype']}")
+
+if __name__ == "__main__":
+    main()
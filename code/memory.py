@@ -0,0 +1,185 @@
+"""One memory budget shared by every in-memory cache of the game.
+
+Each cache (decoded volumes, derived region levels, decoded RLE slices, edge
+maps, distance maps, scaled pixmaps, atlas thumbnails) is a BudgetedCache that
+registers itself with MEMORY under a name. When the caches together go over
+the budget, MEMORY evicts entries GreedyDual-Size style: every entry is
+stamped with clock + rebuild cost per MB when it is stored or used, the lowest
+stamp goes first and becomes the new clock. Big, cheap, long-unused entries
+therefore go before small ones that were slow to build. Pinned keys (the
+volumes on screen) count toward the budget but are never evicted.
+
+Eviction only runs on the GUI thread, where every cache owner is safe to
+touch; entries stored by worker threads are caught up by the next store on
+the GUI thread.
+"""
+import threading
+import weakref
+import numpy as np
+
+DEFAULT_BUDGET_MB = 1536
+LOW_MEMORY_BUDGET_MB = 384  # 4 GB lab machines: shares the RAM with the OS and a browser
+
+def resident_bytes(volume):
+    """Bytes a volume holds in RAM; memory maps are left to the OS page cache and count as 0."""
+    if volume is None or isinstance(volume, np.memmap):
+        return 0
+    return int(getattr(volume, "nbytes", 0))
+
+class MemoryBudget:
+    """Total byte budget over every registered BudgetedCache, with cost-aware LRU eviction."""
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.budget = int(budget_mb * 2 ** 20)
+        self.low_memory = False
+        self.clock = 0.0
+        self.caches = weakref.WeakSet()
+        self.evictions = {}
+        self.lock = threading.Lock()
+
+    def configure(self, budget_mb=None, low_memory=False):
+        """Set the budget; the low-memory profile defaults to LOW_MEMORY_BUDGET_MB."""
+        self.low_memory = low_memory
+        if budget_mb is None:
+            budget_mb = LOW_MEMORY_BUDGET_MB if low_memory else DEFAULT_BUDGET_MB
+        self.budget = int(budget_mb * 2 ** 20)
+        self.enforce()
+
+    def register(self, cache):
+        with self.lock:
+            self.caches.add(cache)
+
+    def priority(self, nbytes, cost_ms):
+        return self.clock + max(cost_ms, 0.01) * 2 ** 20 / max(nbytes, 1)
+
+    def usage(self):
+        """{cache name: bytes} over every live cache."""
+        with self.lock:
+            caches = list(self.caches)
+        totals = {}
+        for cache in caches:
+            totals[cache.name] = totals.get(cache.name, 0) + cache.nbytes
+        return totals
+
+    @property
+    def used(self):
+        return sum(self.usage().values())
+
+    def enforce(self, keep_cache=None, keep_key=None):
+        """Evict the lowest-priority entries until usage is back under budget (GUI thread only)."""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        with self.lock:
+            caches = list(self.caches)
+        used = sum(cache.nbytes for cache in caches)
+        while used > self.budget:
+            victim = None
+            for cache in caches:
+                candidate = cache.lowest(keep_key if cache is keep_cache else None)
+                if candidate is not None and (victim is None or candidate[0] < victim[0]):
+                    victim = (candidate[0], cache, candidate[1])
+            if victim is None:
+                break
+            priority, cache, key = victim
+            self.clock = max(self.clock, priority)
+            used -= cache.nbytes
+            cache.pop(key)
+            used += cache.nbytes
+            self.evictions[cache.name] = self.evictions.get(cache.name, 0) + 1
+
+    def summary_lines(self):
+        usage = self.usage()
+        lines = [f"{'memory':<24}{'MB':>9}{'evicted':>9}"]
+        for name in sorted(usage):
+            lines.append(f"{name:<24}{usage[name] / 2 ** 20:>9.1f}{self.evictions.get(name, 0):>9}")
+        profile = " (low-memory)" if self.low_memory else ""
+        lines.append(f"total: {sum(usage.values()) / 2 ** 20:.0f} of {self.budget / 2 ** 20:.0f} MB{profile}")
+        return lines
+
+MEMORY = MemoryBudget()
+
+class BudgetedCache:
+    """A dict of rebuildable values charged to MEMORY under name.
+
+    put() takes each value's size and roughly how long it took to build. Beyond
+    max_items or max_bytes the cache evicts its own lowest-priority entries;
+    keys in pinned are never evicted.
+    """
+
+    def __init__(self, name, max_items=None, max_bytes=None):
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.entries = {}  # key -> [value, nbytes, cost_ms, priority]
+        self.pinned = set()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        MEMORY.register(self)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            entry[3] = MEMORY.priority(entry[1], entry[2])
+            return entry[0]
+
+    def __getitem__(self, key):
+        with self.lock:
+            if key not in self.entries:
+                raise KeyError(key)
+        return self.get(key)
+
+    def put(self, key, value, nbytes, cost_ms=1.0, pinned=False):
+        """Store value and return it, evicting as needed."""
+        nbytes = int(nbytes)
+        with self.lock:
+            self._drop(key)
+            self.entries[key] = [value, nbytes, cost_ms, MEMORY.priority(nbytes, cost_ms)]
+            self.nbytes += nbytes
+            if pinned:
+                self.pinned.add(key)
+            while ((self.max_items is not None and len(self.entries) > self.max_items)
+                   or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                victim = self._lowest(key)
+                if victim is None:
+                    break
+                self._drop(victim)
+        MEMORY.enforce(self, key)
+        return value
+
+    def pop(self, key, default=None):
+        with self.lock:
+            return self._drop(key, default)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.pinned.clear()
+            self.nbytes = 0
+
+    def lowest(self, keep=None):
+        """(priority, key) of the next entry to evict, or None when everything is pinned."""
+        with self.lock:
+            key = self._lowest(keep)
+            return None if key is None else (self.entries[key][3], key)
+
+    def _lowest(self, keep=None):
+        candidates = [key for key in self.entries if key not in self.pinned and key != keep]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda key: self.entries[key][3])
+
+    def _drop(self, key, default=None):
+        entry = self.entries.pop(key, None)
+        self.pinned.discard(key)
+        if entry is None:
+            return default
+        self.nbytes -= entry[1]
+        return entry[0]
@@ -0,0 +1,114 @@
+import os
+import json
+import argparse
+import hashlib
+import numpy as np
+from atlas_registry import default_atlas_options, get_template_path, read_lut
+from data_pack import load_nifti, resource_exists
+from cache_utils import get_cache_dir, file_hash, atomic_save_npy
+from volume_cache import open_atlas_on_template
+
+class MultiAtlasIndex:
+    """Every template voxel's label in every registered atlas, in one memory-mapped array.
+
+    labels has shape (nx, ny, nz, n_atlases) in C order, so the labels of one
+    voxel across all atlases are adjacent and resolve with a single read.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self.labels = np.load(os.path.join(index_dir, "labels.npy"), mmap_mode='r')
+        with open(os.path.join(index_dir, "tables.json"), 'r') as f:
+            tables = json.load(f)
+        self.atlases = tables["atlases"]
+        self.names = [{int(k): v for k, v in tables["names"][atlas].items()} for atlas in self.atlases]
+        self.affine = np.array(tables["affine"])
+        self.inv_affine = np.linalg.inv(self.affine)
+
+    @property
+    def shape(self):
+        return self.labels.shape[:3]
+
+    def lookup(self, voxel):
+        """[(atlas, label, name), ...] for the voxel, skipping atlases where it is background."""
+        row = self.labels[voxel[0], voxel[1], voxel[2]]
+        return [(atlas, int(label), self.names[i].get(int(label), f"Label_{label}"))
+                for i, (atlas, label) in enumerate(zip(self.atlases, row)) if label > 0]
+
+    def lookup_many(self, voxels):
+        """(N, n_atlases) labels for an (N, 3) integer voxel array; out-of-volume rows are 0."""
+        voxels = np.asarray(voxels, dtype=np.intp)
+        inside = np.all((voxels >= 0) & (voxels < np.array(self.shape)), axis=1)
+        out = np.zeros((len(voxels), len(self.atlases)), dtype=self.labels.dtype)
+        v = voxels[inside]
+        out[inside] = self.labels[v[:, 0], v[:, 1], v[:, 2]]
+        return out
+
+    def mm_to_voxels(self, coords_mm):
+        """Nearest voxel indices for an (N, 3) array of world coordinates."""
+        coords_mm = np.asarray(coords_mm, dtype=np.float64)
+        return np.rint(coords_mm @ self.inv_affine[:3, :3].T + self.inv_affine[:3, 3]).astype(np.intp)
+
+def index_key(atlas_options, template_file):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(file_hash(template_file).encode())
+    for name, (atlas_file, region_file) in atlas_options.items():
+        digest.update(name.encode())
+        digest.update(file_hash(atlas_file).encode())
+        digest.update(file_hash(region_file).encode())
+    return digest.hexdigest()
+
+def build_multi_atlas_index(atlas_options, template_file, index_dir):
+    """Stack every atlas (resampled onto the template grid) into labels.npy plus tables.json."""
+    template_img = load_nifti(template_file)
+    atlases = [name for name, (atlas_file, region_file) in atlas_options.items()
+               if resource_exists(atlas_file) and resource_exists(region_file)]
+    names = {}
+    max_label = 0
+    for name in atlases:
+        region_map, _ = read_lut(atlas_options[name][1])
+        names[name] = {str(k): v for k, v in region_map.items()}
+        max_label = max(max_label, max(region_map))
+    dtype = np.uint8 if max_label <= np.iinfo(np.uint8).max else np.uint16
+    labels = np.zeros(template_img.shape[:3] + (len(atlases),), dtype=dtype)
+    for i, name in enumerate(atlases):
+        _, volume = open_atlas_on_template(atlas_options[name][0], template_file, template_img)
+        labels[..., i] = np.clip(volume, 0, np.iinfo(dtype).max)
+    os.makedirs(index_dir, exist_ok=True)
+    atomic_save_npy(os.path.join(index_dir, "labels.npy"), labels)
+    with open(os.path.join(index_dir, "tables.json"), 'w') as f:
+        json.dump({"atlases": atlases, "names": names, "affine": template_img.affine.tolist()}, f)
+    return MultiAtlasIndex(index_dir)
+
+def load_multi_atlas_index(atlas_options=None, template_file=None):
+    """Open the index for the current atlas set, building it on first use."""
+    atlas_options = atlas_options or default_atlas_options()
+    template_file = template_file or get_template_path()
+    index_dir = os.path.join(get_cache_dir("multi_atlas"), index_key(atlas_options, template_file))
+    if os.path.exists(os.path.join(index_dir, "tables.json")):
+        try:
+            return MultiAtlasIndex(index_dir)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Rebuilding unreadable multi-atlas index: {e}")
+    return build_multi_atlas_index(atlas_options, template_file, index_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve coordinates in every NeuroGuessr atlas at once.")
+    parser.add_argument("coords", nargs="*", type=float, help="x y z triplets (MNI mm unless --voxel)")
+    parser.add_argument("--voxel", action="store_true", help="interpret coordinates as voxel indices")
+    parser.add_argument("--csv", help="CSV file with x,y,z columns to resolve in batch")
+    args = parser.parse_args()
+    index = load_multi_atlas_index()
+    if args.csv:
+        coords = np.loadtxt(args.csv, delimiter=",", skiprows=1, usecols=(0, 1, 2), ndmin=2)
+    else:
+        coords = np.array(args.coords, dtype=np.float64).reshape(-1, 3)
+    voxels = coords.astype(np.intp) if args.voxel else index.mm_to_voxels(coords)
+    labels = index.lookup_many(voxels)
+    print(",".join(["x", "y", "z"] + index.atlases))
+    for coord, row in zip(coords, labels):
+        cells = [index.names[i].get(int(label), "") if label > 0 else "" for i, label in enumerate(row)]
+        print(",".join([f"{c:g}" for c in coord] + cells))
+
+if __name__ == "__main__":
+    main()
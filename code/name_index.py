@@ -0,0 +1,213 @@
+"""Fuzzy region-name lookup for typed answers, fast enough to run on every keystroke.
+
+Names are split into lowercase tokens at underscores, hyphens, spaces,
+camelCase and letter/digit boundaries. Common LUT abbreviations also get their
+full word as a token (Sup -> superior, L -> left), and the JSON `name` of a
+region is indexed as an alias. Each typed word is matched against the distinct
+tokens through
+
+    trie       prefix -> tokens starting with it, for words still being typed
+    trigrams   trigram -> tokens containing it, for typos
+    postings   token -> the names containing it (CSR arrays, gathered with numpy)
+
+and a name scores the best match of each typed word among its tokens (exact,
+then prefix, then trigram overlap). Names matching the most words come first,
+then the highest score, then the shortest. The index is cached on disk keyed
+by the names it holds; the trie is rebuilt from the tokens when it is opened.
+
+    python name_index.py ../data/fs_a2009s.txt "sup front"   # ranked matches and lookup time
+"""
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import numpy as np
+from cache_utils import get_cache_dir, atomic_write_json
+
+INDEX_VERSION = 1
+ABBREVIATIONS = {
+    "l": "left", "r": "right", "lh": "left", "rh": "right", "sup": "superior", "inf": "inferior",
+    "mid": "middle", "med": "medial", "lat": "lateral", "ant": "anterior", "post": "posterior",
+    "orb": "orbital", "oper": "opercular", "tri": "triangular", "supp": "supplementary",
+    "g": "gyrus", "s": "sulcus", "ctx": "cortex", "wm": "white", "cingul": "cingulum",
+    "front": "frontal", "temp": "temporal", "par": "parietal", "occ": "occipital", "lob": "lobule",
+}
+STOP_WORDS = {"and", "of", "the"}
+MIN_TRIGRAM_SIMILARITY = 0.4
+_LEAF = ""  # trie key holding the ids of the tokens below a node
+
+def tokenize(text):
+    """Lowercase word and number tokens of a name or a typed query, in order."""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    return [token for token in re.findall(r"[a-z]+|\d+", text.lower()) if token not in STOP_WORDS]
+
+def name_tokens(name):
+    """Distinct tokens of a name, with the full word of every abbreviation."""
+    tokens = []
+    for token in tokenize(name):
+        for word in (token, ABBREVIATIONS.get(token)):
+            if word and word not in tokens:
+                tokens.append(word)
+    return tokens
+
+def trigrams(token):
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """Ranked fuzzy search over the region names (and aliases) of one atlas level."""
+
+    def __init__(self, entries, tokens, postings, grams):
+        self.entries = entries      # [(label, name)]
+        self.tokens = tokens        # distinct tokens, id = position
+        self.postings = postings    # token id -> entry ids
+        self.grams = grams          # trigram -> token ids
+        self.token_lengths = np.array([len(token) for token in tokens], dtype=np.float64)
+        self.name_lengths = np.array([len(name) for _, name in entries], dtype=np.intp)
+        self.posting_ptr = np.zeros(len(postings) + 1, dtype=np.intp)
+        self.posting_ptr[1:] = np.cumsum([len(entry_ids) for entry_ids in postings])
+        self.posting_entries = np.array([e for entry_ids in postings for e in entry_ids], dtype=np.intp)
+        self.trie = {}
+        for token_id, token in enumerate(tokens):
+            node = self.trie
+            for char in token:
+                node = node.setdefault(char, {})
+                node.setdefault(_LEAF, []).append(token_id)
+
+    @classmethod
+    def build(cls, names):
+        """Index {label: [name, alias, ...]}."""
+        entries, tokens, token_ids, postings = [], [], {}, []
+        for label, label_names in names.items():
+            for name in dict.fromkeys(label_names):
+                entry_id = len(entries)
+                entries.append((int(label), name))
+                for token in name_tokens(name):
+                    if token not in token_ids:
+                        token_ids[token] = len(tokens)
+                        tokens.append(token)
+                        postings.append([])
+                    postings[token_ids[token]].append(entry_id)
+        grams = {}
+        for token_id, token in enumerate(tokens):
+            for gram in trigrams(token):
+                grams.setdefault(gram, []).append(token_id)
+        return cls(entries, tokens, postings, grams)
+
+    def to_dict(self):
+        return {"version": INDEX_VERSION, "entries": self.entries, "tokens": self.tokens,
+                "postings": self.postings, "grams": self.grams}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError("stale name index")
+        return cls([tuple(entry) for entry in data["entries"]], data["tokens"], data["postings"], data["grams"])
+
+    def word_matches(self, word):
+        """(token ids, scores in (0, 1]) of the tokens a typed word may stand for."""
+        scores = np.zeros(len(self.tokens))
+        node = self.trie
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            prefixed = np.asarray(node.get(_LEAF, ()), dtype=np.intp)
+            lengths = self.token_lengths[prefixed]
+            scores[prefixed] = np.where(lengths == len(word), 1.0, 0.6 + 0.3 * len(word) / lengths)
+        if len(word) >= 3:
+            postings = [self.grams[gram] for gram in trigrams(word) if gram in self.grams]
+            if postings:
+                shared = np.bincount(np.concatenate(postings), minlength=len(self.tokens))
+                # Dice coefficient; a token has as many trigrams as letters.
+                similarity = 2 * shared / (len(word) + self.token_lengths)
+                similarity[similarity < MIN_TRIGRAM_SIMILARITY] = 0
+                scores = np.maximum(scores, 0.8 * similarity)
+        token_ids = np.flatnonzero(scores)
+        return token_ids, scores[token_ids]
+
+    def search(self, query, limit=8):
+        """[(label, name)] best matches of a typed query, one per label."""
+        matched = np.zeros(len(self.entries), dtype=np.intp)
+        total = np.zeros(len(self.entries))
+        for word in dict.fromkeys(tokenize(query)):
+            token_ids, scores = self.word_matches(word)
+            if not len(token_ids):
+                continue
+            # Entries of every matching token laid end to end (CSR gather), best score per entry.
+            counts = self.posting_ptr[token_ids + 1] - self.posting_ptr[token_ids]
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            entry_ids = self.posting_entries[np.repeat(self.posting_ptr[token_ids], counts) + offsets]
+            best = np.zeros(len(self.entries))
+            np.maximum.at(best, entry_ids, np.repeat(scores, counts))
+            matched += best > 0
+            total += best
+        hits = np.flatnonzero(matched)
+        ranked = hits[np.lexsort((self.name_lengths[hits], -total[hits], -matched[hits]))]
+        results, seen = [], set()
+        for entry_id in ranked:
+            label, name = self.entries[entry_id]
+            if label not in seen:
+                seen.add(label)
+                results.append((label, name))
+                if len(results) == limit:
+                    break
+        return results
+
+def region_names(region_map, region_info=None, info_label=None):
+    """{label: [LUT name, JSON name]} for the labels of a LUT; info_label maps a label to its JSON key.
+
+    A JSON name is only kept as an alias when it shares a token with the LUT
+    name and is not another label's LUT name: some bundled JSON files are
+    shifted against their LUT, and a stray alias would accept a wrong answer.
+    """
+    owners = {tuple(tokenize(name)): label for label, name in region_map.items() if label > 0}
+    names = {}
+    for label, name in region_map.items():
+        if label <= 0:
+            continue
+        names[label] = [name]
+        info = (region_info or {}).get(str(info_label(label) if info_label else label), {})
+        alias = info.get("name")
+        if (alias and owners.get(tuple(tokenize(alias)), label) == label
+                and set(name_tokens(alias)) & set(name_tokens(name))):
+            names[label].append(alias)
+    return names
+
+def load_name_index(names):
+    """The NameIndex of {label: [names]}, from the cache when these exact names were indexed before."""
+    payload = json.dumps(sorted((int(label), list(label_names)) for label, label_names in names.items()))
+    key = hashlib.blake2b(f"{INDEX_VERSION}:{payload}".encode(), digest_size=16).hexdigest()
+    path = os.path.join(get_cache_dir("names"), f"{key}.json")
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return NameIndex.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Rebuilding unreadable name index: {e}")
+    index = NameIndex.build(names)
+    try:
+        atomic_write_json(path, index.to_dict())
+    except OSError as e:
+        print(f"Warning: Failed to write name index: {e}")
+    return index
+
+def main():
+    from atlas_registry import read_lut
+    region_map, _ = read_lut(sys.argv[1])
+    start = time.perf_counter()
+    index = load_name_index(region_names(region_map))
+    print(f"{len(index.entries)} names, {len(index.tokens)} tokens, opened in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for query in sys.argv[2:]:
+        start = time.perf_counter()
+        for _ in range(100):
+            results = index.search(query)
+        print(f"{query!r}: {(time.perf_counter() - start) * 10:.3f} ms")
+        for label, name in results:
+            print(f"  {label:>6}  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,160 @@
+import time
+STARTED = time.perf_counter()  # origin of the startup trace, taken before the heavy imports below
 import os
 import sys
 import random
 import json
-import time
+import argparse
+import threading
 import numpy as np
-import pandas as pd
 import nibabel as nib
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QPushButton, QStackedWidget, QSlider, QMessageBox,
-                             QButtonGroup, QGridLayout, QCheckBox, QTextEdit, QGroupBox)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from PyQt5.QtGui import QPixmap, QPainter, QColor, QPen, QFont, QPalette, QImage, QFontDatabase, QIcon
-
-def get_resource_path(relative_path):
-    """Get the absolute path to a resource, works for both development and PyInstaller."""
-    if hasattr(sys, '_MEIPASS'):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-    return os.path.join(base_path, relative_path)
+                             QButtonGroup, QGridLayout, QCheckBox, QTextEdit, QGroupBox, QFileDialog,
+                             QComboBox, QLineEdit, QListWidget, QListWidgetItem)
+from PyQt5.QtCore import Qt, QTimer, QThread, QSize, QEvent, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QPen, QFont, QPalette, QImage, QIcon
+from atlas_registry import get_resource_path, get_template_path, default_atlas_options, read_lut
+from volume_cache import open_volume, open_atlas_on_template, materialize, LoadTimings
+from multi_atlas import load_multi_atlas_index
+from distance_maps import DistanceMapCache, near_miss_credit
+from freesurfer import find_subject_files, load_freesurfer_subject
+from probabilistic import ProbabilisticAtlas, probability_store_path, PROBABILITY_PASS
+from hierarchy import FINE_LEVEL, load_levels, derive_level, hierarchy_path
+from rendering import build_palette, colorize_slice, slice_edges, heat_palette, EdgeMaps
+from oblique import ObliquePlane
+from perf import PERF, STARTUP
+from memory import MEMORY, BudgetedCache, resident_bytes
+from input_trace import TraceRecorder, default_trace_path
+from records import RecordStore
+from manifest import load_manifest, update_manifest
+from data_pack import resource_exists, resource_isdir, open_resource
+from heatmaps import HEATMAP_ROOT, ClickHeatmap, plane_heat, oblique_heat
+from study_sheets import atlas_preview, preview_path
+from rle_volume import unique_labels, label_voxel
+from name_index import region_names, load_name_index
+from projections import projection_key, load_glass_brain
+
+STARTUP.origin = STARTED
+STARTUP.mark("imports")
+
+GAME_MODES = ["Practice", "Contre la Montre", "Streak", "Name It"]
+DISPLAY_MODES = ["colored", "non_colored", "outline"]
+SCORE_TITLES = {"Streak": "Streak", "Name It": "Named"}
+MINIMAP_HEIGHT = 120  # pixels; the glass-brain hint is drawn at this height
+
+# The whole look of the game, parsed once for the application. Widgets are
+# selected by object name and, where they change look at runtime, by a
+# dynamic property (see restyle).
+APP_STYLE = """
+QWidget {font-family: "Helvetica [Cronyx]";}
+QLabel {color: white;}
+QLabel#appTitle {font-size: 70pt; font-weight: bold;}
+QLabel#sectionTitle {font-size: 18px; font-weight: bold;}
+QLabel#fieldLabel {font-size: 16px;}
+QLabel#recordLabel {font-size: 18px;}
+QPushButton#choice {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 15px; font-size: 16px;}
+QPushButton#choice:checked, QPushButton#choice:hover {background-color: #3E3E42; border-color: #0078D7;}
+QPushButton#choice[accent="green"]:checked, QPushButton#choice[accent="green"]:hover {border-color: #4CAF50;}
+QPushButton#choice[accent="red"]:checked, QPushButton#choice[accent="red"]:hover {border-color: #f44336;}
+QPushButton#choice[accent="orange"]:checked, QPushButton#choice[accent="orange"]:hover {border-color: #FF9800;}
+QComboBox#levelCombo {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 8px; font-size: 16px; min-width: 220px;}
+QComboBox#levelCombo QAbstractItemView {background-color: #2D2D30; color: white; selection-background-color: #0078D7;}
+QPushButton#subjectButton {background-color: #2D2D30; color: white; border: 2px dashed #444; border-radius: 10px; padding: 10px; font-size: 14px;}
+QPushButton#subjectButton:hover {background-color: #3E3E42; border-color: #0078D7;}
+QGroupBox#recordBox {color: white; font-size: 18px; font-weight: bold; border: 2px solid #444; border-radius: 10px; padding: 10px;}
+QGroupBox#recordBox::title {subcontrol-origin: margin; subcontrol-position: top center; padding: 0 3px;}
+QPushButton#quitButton, QPushButton#playButton {font-size: 18px; padding: 15px 40px; color: white; border-radius: 10px; border: none; font-weight: bold;}
+QPushButton#quitButton {background-color: #f44336;}
+QPushButton#quitButton:hover {background-color: #d32f2f;}
+QPushButton#playButton {background-color: #4CAF50;}
+QPushButton#playButton:hover {background-color: #45a049;}
+QLabel#gameLabel {font-size: 14pt;}
+QLabel#activeAtlas {font-size: 14pt; font-weight: bold;}
+QCheckBox {color: white; font-size: 14px;}
+QLabel#targetLabel {font-size: 24pt; font-weight: bold; background-color: #333; padding: 5px; border-radius: 5px;}
+QLabel#timerLabel {font-size: 14pt; background-color: #333; padding: 5px; border-radius: 5px;}
+QLabel#readout {color: #CCCCCC; font-size: 12pt;}
+QLabel#minimap {background-color: black; padding: 4px;}
+QLabel#perfOverlay {font-family: Courier; font-size: 10pt; color: #7CFC00; background-color: rgba(0, 0, 0, 200); padding: 6px;}
+QLabel#sliderLabel {font-size: 12pt;}
+QPushButton#startButton, QPushButton#guessButton, QPushButton#helpButton, QPushButton#menuButton {font-size: 16px; padding: 10px; color: white; border-radius: 5px;}
+QPushButton#startButton, QPushButton#guessButton {background-color: #4CAF50;}
+QPushButton#startButton:hover, QPushButton#guessButton:hover:enabled {background-color: #45a049;}
+QPushButton#guessButton:disabled {background-color: #cccccc; color: #666666;}
+QPushButton#guessButton[picked="true"], QPushButton#guessButton[picked="false"] {background-color: #FFFFFF; color: black; border-radius: 0;}
+QPushButton#guessButton[picked="true"] {font-weight: bold;}
+QPushButton#helpButton {background-color: #2196F3;}
+QPushButton#helpButton:hover {background-color: #0b7dda;}
+QPushButton#menuButton {background-color: #FF9800;}
+QPushButton#menuButton:hover {background-color: #e68a00;}
+QLineEdit#nameInput {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 5px; padding: 8px; font-size: 16px;}
+QLineEdit#nameInput:focus {border-color: #0078D7;}
+QListWidget#nameMatches {background-color: #2D2D30; color: white; border: 1px solid #444; font-size: 14px;}
+QListWidget#nameMatches::item:selected {background-color: #0078D7;}
+QLabel#memoTitle {font-size: 16pt; font-weight: bold;}
+QTextEdit#memoText {background-color: #2D2D30; color: white; border: 1px solid #444; border-radius: 5px; padding: 5px; font-size: 14px;}
+BrainSliceView {background-color: black;}
+QLabel#sliceTitle {background-color: rgba(0, 0, 0, 0); font-size: 12pt; font-weight: bold;}
+"""
+
+def apply_app_style(app):
+    """Install APP_STYLE on the application unless it already has it."""
+    if app.styleSheet() != APP_STYLE:
+        app.setStyleSheet(APP_STYLE)
+
+def restyle(widget, name, value):
+    """Set a dynamic property the style sheet selects on and re-apply the sheet to the widget."""
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+class VolumeLoadThread(QThread):
+    """Pages memory-mapped volumes fully into RAM after the first frame is shown."""
+    volumes_loaded = pyqtSignal(int, object, object)  # generation, brain, template
+
+    def __init__(self, generation, brain_volume, template_volume, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.brain_volume = brain_volume
+        self.template_volume = template_volume
+
+    def run(self):
+        self.volumes_loaded.emit(self.generation, materialize(self.brain_volume),
+                                 materialize(self.template_volume))
+
+class TaskThread(QThread):
+    """Runs one callable off the GUI thread and hands its result back through a signal."""
+    task_done = pyqtSignal(object)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        try:
+            result = self.task()
+        except Exception as e:
+            print(f"Warning: Background task failed: {e}")
+            result = None
+        self.task_done.emit(result)
+
+def wait_for_thread(thread):
+    """Block until a QThread has finished; one already removed by deleteLater has."""
+    if thread is None:
+        return
+    try:
+        thread.wait()
+    except RuntimeError:
+        pass
 
 class BrainSliceView(QLabel):
     """Widget to display a single brain slice with click, drag, and zoom functionality."""
     slice_clicked = pyqtSignal(int, int, int)  # x, y, plane_index
     slice_changed = pyqtSignal(int, int)       # plane_index, delta
+    slice_hovered = pyqtSignal(int, int, int)  # x, y, plane_index; (-1, -1) when the cursor leaves
 
     def __init__(self, plane_index, parent=None):
         super().__init__(parent)
@@ -33,11 +163,18 @@ class BrainSliceView(QLabel):
         self.zoom_factor = 1.5
         self.setMinimumSize(300, 300)
         self.setAlignment(Qt.AlignCenter)
-        self.setStyleSheet("background-color: black;")
         self.slice_data = None
         self.template_data = None
-        self.plane_names = ["Axial", "Coronal", "Sagittal"]
+        self.colormap = None
+        self.highlight_region = None
+        self.show_atlas = True
+        self.edges = None
+        self.overlay = None
+        self.palette = None
+        self.palette_source = None
+        self.plane_names = ["Axial", "Coronal", "Sagittal", "Oblique"]
         self.original_pixmap = None
+        self.scaled_pixmaps = BudgetedCache("pixmaps", max_items=1)
         self.setMouseTracking(True)
         self.setFocusPolicy(Qt.WheelFocus)
         self.dragging = False
@@ -46,11 +183,17 @@ class BrainSliceView(QLabel):
         self.blink_state = True
         self.blink_timer = QTimer()
         self.blink_timer.timeout.connect(self.toggle_blink)
+        self.hover_pos = None
+        self.hover_timer = QTimer()
+        self.hover_timer.setSingleShot(True)
+        screen = QApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen and screen.refreshRate() > 0 else 60.0
+        self.hover_timer.setInterval(int(1000 / refresh_rate))
+        self.hover_timer.timeout.connect(self.emit_hover)
         
         self.title = QLabel(self.plane_names[plane_index])
         self.title.setAlignment(Qt.AlignCenter)
-        self.title.setStyleSheet("color: white; background-color: rgba(0, 0, 0, 0);")
-        self.title.setFont(QFont("Helvetica [Cronyx]", 12, QFont.Bold))
+        self.title.setObjectName("sliceTitle")
 
     def start_blinking(self):
         self.blinking = True
@@ -60,11 +203,11 @@ class BrainSliceView(QLabel):
         self.blinking = False
         self.blink_timer.stop()
         self.blink_state = True
-        self.update_slice(self.slice_data, self.template_data, self.colormap, self.highlight_region, self.show_atlas)
+        self.update_slice(self.slice_data, self.template_data, self.colormap, self.highlight_region, self.show_atlas, self.edges, self.overlay)
 
     def toggle_blink(self):
         self.blink_state = not self.blink_state
-        self.update_slice(self.slice_data, self.template_data, self.colormap, self.highlight_region, self.show_atlas)
+        self.update_slice(self.slice_data, self.template_data, self.colormap, self.highlight_region, self.show_atlas, self.edges, self.overlay)
 
     def set_crosshair_3d(self, voxel_x, voxel_y, voxel_z):
         if self.plane_index == 0:
@@ -92,45 +235,29 @@ class BrainSliceView(QLabel):
                 self.slice_changed.emit(self.plane_index, step)
         event.accept()
 
-    def update_slice(self, slice_data, template_slice, colormap=None, highlight_region=None, show_atlas=True):
+    def update_slice(self, slice_data, template_slice, colormap=None, highlight_region=None, show_atlas=True, edges=None, overlay=None):
         self.slice_data = slice_data
         self.template_data = template_slice
         self.colormap = colormap
         self.highlight_region = highlight_region
         self.show_atlas = show_atlas
+        self.edges = edges
+        self.overlay = overlay
         if slice_data is None or template_slice is None:
             self.clear()
             return
-        norm_template = ((template_slice - template_slice.min()) / 
-                        (template_slice.max() - template_slice.min() + 1e-8) * 255).astype(np.uint8)
-        h, w = norm_template.shape
-        colored_slice = np.zeros((h, w, 3), dtype=np.uint8)
-        colored_slice[:, :, 0] = norm_template
-        colored_slice[:, :, 1] = norm_template
-        colored_slice[:, :, 2] = norm_template
-        
+        palette = None
         if show_atlas and colormap:
-            unique_vals = np.unique(slice_data)
-            for val in unique_vals:
-                if val in colormap and val > 0:
-                    mask = (slice_data == val)
-                    color = colormap[val]
-                    if self.blinking and val == highlight_region and self.blink_state:
-                        colored_slice[mask, 0] = 255
-                        colored_slice[mask, 1] = 255
-                        colored_slice[mask, 2] = 0
-                    else:
-                        colored_slice[mask, 0] = (0.5 * colored_slice[mask, 0] + 0.5 * color[0]).astype(np.uint8)
-                        colored_slice[mask, 1] = (0.5 * colored_slice[mask, 1] + 0.5 * color[1]).astype(np.uint8)
-                        colored_slice[mask, 2] = (0.5 * colored_slice[mask, 2] + 0.5 * color[2]).astype(np.uint8)
-        elif self.blinking and highlight_region and self.blink_state:
-            mask = (slice_data == highlight_region)
-            colored_slice[mask, 0] = 255
-            colored_slice[mask, 1] = 255
-            colored_slice[mask, 2] = 0
-        
-        qimg = QImage(colored_slice.data, w, h, w * 3, QImage.Format_RGB888)
-        self.original_pixmap = QPixmap.fromImage(qimg)
+            if colormap is not self.palette_source:
+                self.palette = build_palette(colormap)
+                self.palette_source = colormap
+            palette = self.palette
+        highlight = highlight_region if self.blinking and highlight_region and self.blink_state else None
+        with PERF.stage("colorize", self.plane_names[self.plane_index]):
+            colored_slice = colorize_slice(slice_data, template_slice, palette, highlight, edges, overlay)
+            h, w = colored_slice.shape[:2]
+            qimg = QImage(colored_slice.data, w, h, w * 3, QImage.Format_RGB888)
+            self.original_pixmap = QPixmap.fromImage(qimg)
         self.update()
 
     def paintEvent(self, event):
@@ -138,16 +265,24 @@ class BrainSliceView(QLabel):
         if not self.original_pixmap:
             return
         painter = QPainter(self)
-        img_width = int(self.original_pixmap.width() * self.zoom_factor)
-        img_height = int(self.original_pixmap.height() * self.zoom_factor)
-        label_width = self.width()
-        label_height = self.height()
-        x_offset = (label_width - img_width) // 2
-        y_offset = (label_height - img_height) // 2
-        scaled_pixmap = self.original_pixmap.scaled(img_width, img_height, 
-                                                  Qt.KeepAspectRatio, 
-                                                  Qt.SmoothTransformation)
-        painter.drawPixmap(x_offset, y_offset, scaled_pixmap)
+        with PERF.stage("paint", self.plane_names[self.plane_index]):
+            img_width = int(self.original_pixmap.width() * self.zoom_factor)
+            img_height = int(self.original_pixmap.height() * self.zoom_factor)
+            label_width = self.width()
+            label_height = self.height()
+            x_offset = (label_width - img_width) // 2
+            y_offset = (label_height - img_height) // 2
+            # Crosshair moves and expose events repaint the same slice at the same size.
+            key = (self.original_pixmap.cacheKey(), img_width, img_height)
+            scaled_pixmap = self.scaled_pixmaps.get(key)
+            if scaled_pixmap is None:
+                start = time.perf_counter()
+                scaled_pixmap = self.original_pixmap.scaled(img_width, img_height, 
+                                                          Qt.KeepAspectRatio, 
+                                                          Qt.SmoothTransformation)
+                self.scaled_pixmaps.put(key, scaled_pixmap, scaled_pixmap.width() * scaled_pixmap.height() * 4,
+                                        (time.perf_counter() - start) * 1000)
+            painter.drawPixmap(x_offset, y_offset, scaled_pixmap)
         
         pen = QPen(QColor(255, 0, 0))
         pen.setWidth(1)
@@ -181,6 +316,7 @@ class BrainSliceView(QLabel):
         painter.setFont(QFont("Helvetica [Cronyx]", 12, QFont.Bold))
         painter.drawText(0, 20, label_width, 20, Qt.AlignCenter, self.plane_names[self.plane_index])
         painter.end()
+        STARTUP.mark("first_slice")
 
     def mousePressEvent(self, event):
         if not self.original_pixmap or event.button() != Qt.LeftButton:
@@ -202,8 +338,44 @@ class BrainSliceView(QLabel):
         self.dragging = True
         self.last_mouse_pos = event.pos()
 
+    def map_to_slice(self, pos_x, pos_y):
+        """Widget coordinates to slice pixel coordinates, or None outside the image."""
+        img_width = int(self.original_pixmap.width() * self.zoom_factor)
+        img_height = int(self.original_pixmap.height() * self.zoom_factor)
+        x_offset = (self.width() - img_width) // 2
+        y_offset = (self.height() - img_height) // 2
+        orig_x = int((pos_x - x_offset) / self.zoom_factor)
+        orig_y = int((pos_y - y_offset) / self.zoom_factor)
+        if 0 <= orig_x < self.original_pixmap.width() and 0 <= orig_y < self.original_pixmap.height():
+            return orig_x, orig_y
+        return None
+
+    def label_at(self, x, y):
+        """Label under slice pixel (x, y), read from the cached label slice."""
+        if self.slice_data is None or not (0 <= y < self.slice_data.shape[0] and 0 <= x < self.slice_data.shape[1]):
+            return 0
+        return int(self.slice_data[y, x])
+
+    def emit_hover(self):
+        if self.hover_pos is None:
+            self.slice_hovered.emit(-1, -1, self.plane_index)
+        else:
+            self.slice_hovered.emit(self.hover_pos[0], self.hover_pos[1], self.plane_index)
+
+    def leaveEvent(self, event):
+        self.hover_pos = None
+        if not self.hover_timer.isActive():
+            self.hover_timer.start()
+        super().leaveEvent(event)
+
     def mouseMoveEvent(self, event):
-        if not self.original_pixmap or not self.dragging:
+        if not self.original_pixmap:
+            return
+        if not self.dragging:
+            # Coalesce hover updates to at most one per display refresh.
+            self.hover_pos = self.map_to_slice(event.x(), event.y())
+            if not self.hover_timer.isActive():
+                self.hover_timer.start()
             return
         img_width = int(self.original_pixmap.width() * self.zoom_factor)
         img_height = int(self.original_pixmap.height() * self.zoom_factor)
@@ -231,7 +403,8 @@ class NeuroGuessrGame(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("NeuroGuessr")
-        self.showMaximized()
+        self.setWindowState(Qt.WindowMaximized)
+        apply_app_style(QApplication.instance())
         self.score = 0
         self.errors = 0
         self.consecutive_errors = 0
@@ -241,10 +414,27 @@ class NeuroGuessrGame(QMainWindow):
         self.time_remaining = 180
         self.correct_guesses = []
         self.incorrect_guesses = []
+        self.near_miss_credit = {}  # target -> best near-miss credit while it is unfound
+        self.probability_score = 0.0
+        self.prob_atlas = None
+        self.probabilistic_scoring = False
+        self.distance_maps = None
         self.streak_guessed_regions = []
         self.brain_data = None
         self.template_data = None
+        self.brain_volume = None
+        self.template_volume = None
+        self.load_generation = 0
+        self.load_thread = None
+        self.load_timings = None
         self.region_map = None
+        self.original_label_ids = None
+        self.native_subjects = {}
+        self.region_level = FINE_LEVEL
+        self.atlas_levels = BudgetedCache("region_levels")
+        self.volumes = BudgetedCache("volumes")
+        self.thumbnails = BudgetedCache("thumbnails")
+        self.level_parents = {}
         self.colormap = {}
         self.region_info = {}
         self.current_slices = [None, None, None]
@@ -253,107 +443,53 @@ class NeuroGuessrGame(QMainWindow):
         self.crosshair_3d = (0, 0, 0)
         self.show_atlas = True
         self.use_colored_atlas = True
+        self.display_mode = "colored"
+        self.edge_maps = None
+        self.edge_maps_key = None
+        self.oblique_enabled = False
+        self.oblique_plane = None
+        self.oblique_plane_key = None
+        self.oblique_depth = 0.0
+        self.heatmap_root = HEATMAP_ROOT
+        self.heatmap = None
+        self.heatmap_key = None
+        self.show_heatmap = False
+        self.heat_palette = heat_palette()
+        self.heat_points = None
+        self.heat_points_key = None
+        self.glass_brain = None
+        self.glass_brain_thread = None
+        self.glass_brain_cancel = threading.Event()
+        self.name_index = None
+        self.record_traces = False
+        self.trace_path = None
+        self.trace = None
+        self.next_seed = None
+        self.session_seed = None
+        self.hover_readout_enabled = False
+        self.cross_atlas_enabled = False
+        self.multi_atlas_index = None
+        self.multi_atlas_thread = None
+        self.preview_thread = None
+        self.closing = False
+        self.startup_finished = False
         self.all_regions = []
         self.remaining_regions = []
         self.start_time = None
         self.total_time = 0
         self.pr_file = os.path.join(Path.home(), ".neuroguessr", "pr.json")
-        self.atlas_options = {
-            "AAL": (
-                get_resource_path("data/aal_stride_regrid.nii.gz"),
-                get_resource_path("data/aal.txt")
-            ),
-            "Brodmann": (
-                get_resource_path("data/brodmann_grid_stride.nii.gz"),
-                get_resource_path("data/brodmann.txt")
-            ),
-            "Harvard Oxford": (
-                get_resource_path("data/HarvardOxford-cort-maxprob-thr25-1mm_stride.nii.gz"),
-                get_resource_path("data/HarvardOxford-Cortical.txt")
-            ),
-            "Subcortical": (
-                get_resource_path("data/ICBM2009b_asym-SubCorSeg-1mm_nn_stride.nii.gz"),
-                get_resource_path("data/subcortical_bb.txt")
-            ),
-            "Cerebellum": (
-                get_resource_path("data/Cerebellum-MNIfnirt-maxprob-thr25-1mm_stride.nii.gz"),
-                get_resource_path("data/Cerebellum_MNIfnirt.txt")
-            ),
-            "Xtract": (
-                get_resource_path("data/xtract_stride.nii.gz"),
-                get_resource_path("data/xtract.txt")
-            ) ,
-            "Thalamus": (
-                get_resource_path("data/Thalamus-thr0_stride_nn_sub.nii.gz"),
-                get_resource_path("data/thalamus_lut.txt")
-            )  ,
-            "Brain Stem": (
-                get_resource_path("data/Brainstem-thr0_stride_nn_sub.nii.gz"),
-                get_resource_path("data/brainstem_lut.txt")
-            )  ,
-            "Hippocampus Amygdala": (
-                get_resource_path("data/HippoAmyg_left-thr0_stride_nn_sub.nii.gz"),
-                get_resource_path("data/hippoamyg_left_lut.txt")
-            )  ,
-            "JHU": (
-                get_resource_path("data/JHU-WhiteMatter-labels-1mm_stride.nii.gz"),
-                get_resource_path("data/JHU_labels.txt")
-            )
-        }
-        self.pr_data = self.load_pr()
+        self.atlas_options = default_atlas_options()
+        # The stored manifest is enough to label the landing page; it is brought
+        # up to date once the page is on screen (finish_startup).
+        self.atlas_manifest = load_manifest()["atlases"]
+        self.records = RecordStore(self.pr_file)
         self.current_atlas = "AAL"
+        self.game_widget = None
         self.setup_ui()
-        self.game_timer = QTimer()
-        self.game_timer.timeout.connect(self.update_timer)
-
-    def load_pr(self):
-        """Load personal records from JSON file, migrating old data to colored mode."""
-        os.makedirs(os.path.dirname(self.pr_file), exist_ok=True)
-        try:
-            with open(self.pr_file, 'r') as f:
-                data = json.load(f)
-                for atlas in self.atlas_options.keys():
-                    if atlas not in data:
-                        data[atlas] = {
-                            "colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0},
-                            "non_colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}
-                        }
-                    else:
-                        # Migrate old data to colored mode if it exists at the atlas level
-                        if "time" in data[atlas]:
-                            old_pr = data[atlas]
-                            data[atlas] = {
-                                "colored": {
-                                    "time": old_pr.get("time", float("inf")),
-                                    "errors": old_pr.get("errors", 0),
-                                    "best_ratio": old_pr.get("best_ratio", 0.0),
-                                    "best_streak": old_pr.get("best_streak", 0)
-                                },
-                                "non_colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}
-                            }
-                        else:
-                            # Ensure both colored and non_colored exist
-                            data[atlas].setdefault("colored", {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0})
-                            data[atlas].setdefault("non_colored", {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0})
-                return data
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {
-                atlas: {
-                    "colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0},
-                    "non_colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}
-                }
-                for atlas in self.atlas_options.keys()
-            }
-
-    def save_pr(self):
-        """Save personal records to JSON file."""
-        try:
-            with open(self.pr_file, 'w') as f:
-                json.dump(self.pr_data, f, indent=4)
-        except Exception as e:
-            print(f"Warning: Failed to save PR data: {e}")
+        STARTUP.mark("window_built")
 
     def setup_ui(self):
+        """Build the landing page; the game screen waits for the first game (ensure_game_screen)."""
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
 
@@ -378,15 +514,13 @@ class NeuroGuessrGame(QMainWindow):
         top_layout.addWidget(logo_label)
         
         title_label = QLabel("NeuroGuessr")
-        title_label.setFont(QFont("Helvetica [Cronyx]", 70, QFont.Bold))
-        title_label.setStyleSheet("color: white;")
+        title_label.setObjectName("appTitle")
         top_layout.addWidget(title_label)
         
         landing_layout.addLayout(top_layout)
 
         mode_label = QLabel("Game Mode")
-        mode_label.setStyleSheet("color: white; font-size: 18px;")
-        mode_label.setFont(QFont("Helvetica [Cronyx]", 20, QFont.Bold))
+        mode_label.setObjectName("sectionTitle")
         mode_label.setAlignment(Qt.AlignCenter)
         landing_layout.addWidget(mode_label)
         
@@ -396,12 +530,7 @@ class NeuroGuessrGame(QMainWindow):
         self.mode_button_group = QButtonGroup(self)
         
         practice_button = QPushButton("Practice")
-        practice_button.setStyleSheet("""
-            QPushButton {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 15px; font-size: 16px;}
-            QPushButton:checked {background-color: #3E3E42; border: 2px solid #0078D7;}
-            QPushButton:hover {background-color: #3E3E42; border: 2px solid #0078D7;}
-        """)
-        practice_button.setFont(QFont("Helvetica [Cronyx]", 16))
+        practice_button.setObjectName("choice")
         practice_button.setCheckable(True)
         practice_button.setChecked(True)
         self.mode_button_group.addButton(practice_button, 0)
@@ -412,12 +541,7 @@ class NeuroGuessrGame(QMainWindow):
         contre_pixmap = QPixmap(contre_icon_path)
         if not contre_pixmap.isNull():
             contre_button.setIcon(QIcon(contre_pixmap.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)))
-        contre_button.setStyleSheet("""
-            QPushButton {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 15px; font-size: 16px;}
-            QPushButton:checked {background-color: #3E3E42; border: 2px solid #0078D7;}
-            QPushButton:hover {background-color: #3E3E42; border: 2px solid #0078D7;}
-        """)
-        contre_button.setFont(QFont("Helvetica [Cronyx]", 16))
+        contre_button.setObjectName("choice")
         contre_button.setCheckable(True)
         self.mode_button_group.addButton(contre_button, 1)
         
@@ -427,23 +551,24 @@ class NeuroGuessrGame(QMainWindow):
         streak_pixmap = QPixmap(streak_icon_path)
         if not streak_pixmap.isNull():
             streak_button.setIcon(QIcon(streak_pixmap.scaled(24, 24, Qt.KeepAspectRatio, Qt.SmoothTransformation)))
-        streak_button.setStyleSheet("""
-            QPushButton {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 15px; font-size: 16px;}
-            QPushButton:checked {background-color: #3E3E42; border: 2px solid #0078D7;}
-            QPushButton:hover {background-color: #3E3E42; border: 2px solid #0078D7;}
-        """)
-        streak_button.setFont(QFont("Helvetica [Cronyx]", 16))
+        streak_button.setObjectName("choice")
         streak_button.setCheckable(True)
         self.mode_button_group.addButton(streak_button, 2)
+
+        name_button = QPushButton("Name It")
+        name_button.setObjectName("choice")
+        name_button.setCheckable(True)
+        name_button.setToolTip("A region blinks: type its name")
+        self.mode_button_group.addButton(name_button, 3)
         
         mode_buttons_layout.addWidget(practice_button)
         mode_buttons_layout.addWidget(contre_button)
         mode_buttons_layout.addWidget(streak_button)
+        mode_buttons_layout.addWidget(name_button)
         landing_layout.addLayout(mode_buttons_layout)
 
         atlas_color_label = QLabel("Atlas Coloration")
-        atlas_color_label.setStyleSheet("color: white; font-size: 18px;")
-        atlas_color_label.setFont(QFont("Helvetica [Cronyx]", 20, QFont.Bold))
+        atlas_color_label.setObjectName("sectionTitle")
         atlas_color_label.setAlignment(Qt.AlignCenter)
         landing_layout.addWidget(atlas_color_label)
         
@@ -453,50 +578,45 @@ class NeuroGuessrGame(QMainWindow):
         self.color_button_group = QButtonGroup(self)
         
         colored_button = QPushButton("Colored Atlas")
-        colored_button.setStyleSheet("""
-            QPushButton {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 15px; font-size: 16px;}
-            QPushButton:checked {background-color: #3E3E42; border: 2px solid #4CAF50;}
-            QPushButton:hover {background-color: #3E3E42; border: 2px solid #4CAF50;}
-        """)
-        colored_button.setFont(QFont("Helvetica [Cronyx]", 16))
+        colored_button.setObjectName("choice")
+        colored_button.setProperty("accent", "green")
         colored_button.setCheckable(True)
         colored_button.setChecked(True)
         self.color_button_group.addButton(colored_button, 0)
         
         non_colored_button = QPushButton("No Colors")
-        non_colored_button.setStyleSheet("""
-            QPushButton {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 15px; font-size: 16px;}
-            QPushButton:checked {background-color: #3E3E42; border: 2px solid #f44336;}
-            QPushButton:hover {background-color: #3E3E42; border: 2px solid #f44336;}
-        """)
-        non_colored_button.setFont(QFont("Helvetica [Cronyx]", 16))
+        non_colored_button.setObjectName("choice")
+        non_colored_button.setProperty("accent", "red")
         non_colored_button.setCheckable(True)
         self.color_button_group.addButton(non_colored_button, 1)
         
+        outline_button = QPushButton("Outlines")
+        outline_button.setObjectName("choice")
+        outline_button.setProperty("accent", "orange")
+        outline_button.setCheckable(True)
+        self.color_button_group.addButton(outline_button, 2)
+        
         color_buttons_layout.addWidget(colored_button)
         color_buttons_layout.addWidget(non_colored_button)
+        color_buttons_layout.addWidget(outline_button)
         landing_layout.addLayout(color_buttons_layout)
 
         atlas_label = QLabel("Select Atlas")
-        atlas_label.setStyleSheet("color: white; font-size: 18px;")
-        atlas_label.setFont(QFont("Helvetica [Cronyx]", 20, QFont.Bold))
+        atlas_label.setObjectName("sectionTitle")
         atlas_label.setAlignment(Qt.AlignCenter)
         landing_layout.addWidget(atlas_label)
         
         atlas_buttons_layout = QGridLayout()
         atlas_buttons_layout.setSpacing(10)
+        self.atlas_buttons_layout = atlas_buttons_layout
         
         self.atlas_button_group = QButtonGroup(self)
         
         atlas_names = list(self.atlas_options.keys())
         for i, atlas_name in enumerate(atlas_names):
-            atlas_button = QPushButton(atlas_name)
-            atlas_button.setStyleSheet("""
-                QPushButton {background-color: #2D2D30; color: white; border: 2px solid #444; border-radius: 10px; padding: 15px; font-size: 16px;}
-                QPushButton:checked {background-color: #3E3E42; border: 2px solid #0078D7;}
-                QPushButton:hover {background-color: #3E3E42; border: 2px solid #0078D7;}
-            """)
-            atlas_button.setFont(QFont("Helvetica [Cronyx]", 16))
+            atlas_button = QPushButton(self.atlas_button_text(atlas_name))
+            atlas_button.setToolTip(self.atlas_tooltip(atlas_name))
+            atlas_button.setObjectName("choice")
             atlas_button.setCheckable(True)
             if atlas_name == self.current_atlas:
                 atlas_button.setChecked(True)
@@ -506,13 +626,27 @@ class NeuroGuessrGame(QMainWindow):
             atlas_buttons_layout.addWidget(atlas_button, row, col)
         
         landing_layout.addLayout(atlas_buttons_layout)
+
+        level_layout = QHBoxLayout()
+        level_layout.setAlignment(Qt.AlignCenter)
+        level_label = QLabel("Region Level")
+        level_label.setObjectName("fieldLabel")
+        level_layout.addWidget(level_label)
+        self.level_combo = QComboBox()
+        self.level_combo.setObjectName("levelCombo")
+        self.level_combo.currentIndexChanged.connect(self.update_pr_label)
+        level_layout.addWidget(self.level_combo)
+        landing_layout.addLayout(level_layout)
+        self.atlas_button_group.buttonClicked.connect(self.refresh_level_options)
+        self.refresh_level_options()
+
+        subject_button = QPushButton("Load FreeSurfer Subject...")
+        subject_button.setObjectName("subjectButton")
+        subject_button.clicked.connect(self.add_freesurfer_subject)
+        landing_layout.addWidget(subject_button)
         
         self.pr_box = QGroupBox("Personal Best")
-        self.pr_box.setStyleSheet("""
-            QGroupBox {color: white; font-size: 18px; font-weight: bold; border: 2px solid #444; border-radius: 10px; padding: 10px;}
-            QGroupBox::title {subcontrol-origin: margin; subcontrol-position: top center; padding: 0 3px;}
-        """)
-        self.pr_box.setFont(QFont("Helvetica [Cronyx]", 20, QFont.Bold))
+        self.pr_box.setObjectName("recordBox")
         self.pr_box.setAlignment(Qt.AlignCenter)
         pr_layout = QVBoxLayout(self.pr_box)
         pr_layout.setSpacing(20)
@@ -529,8 +663,7 @@ class NeuroGuessrGame(QMainWindow):
             ratio_icon.setText("⚡")
         ratio_layout.addWidget(ratio_icon)
         self.ratio_pr_label = QLabel("Accuracy: 0")
-        self.ratio_pr_label.setStyleSheet("color: white; font-size: 18px;")
-        self.ratio_pr_label.setFont(QFont("Helvetica [Cronyx]", 22))
+        self.ratio_pr_label.setObjectName("recordLabel")
         ratio_layout.addWidget(self.ratio_pr_label)
         ratio_layout.addSpacing(10)
         pr_layout.addLayout(ratio_layout)
@@ -546,8 +679,7 @@ class NeuroGuessrGame(QMainWindow):
             time_icon.setText("⏱")
         time_layout.addWidget(time_icon)
         self.time_pr_label = QLabel("Time: 0")
-        self.time_pr_label.setStyleSheet("color: white; font-size: 18px;")
-        self.time_pr_label.setFont(QFont("Helvetica [Cronyx]", 22))
+        self.time_pr_label.setObjectName("recordLabel")
         time_layout.addWidget(self.time_pr_label)
         time_layout.addSpacing(10)
         pr_layout.addLayout(time_layout)
@@ -564,8 +696,7 @@ class NeuroGuessrGame(QMainWindow):
             streak_icon.setText("🔥")
         streak_layout.addWidget(streak_icon)
         self.streak_pr_label = QLabel("Streak: 0")
-        self.streak_pr_label.setStyleSheet("color: white; font-size: 18px;")
-        self.streak_pr_label.setFont(QFont("Helvetica [Cronyx]", 22))
+        self.streak_pr_label.setObjectName("recordLabel")
         streak_layout.addWidget(self.streak_pr_label)
         streak_layout.addSpacing(10)
         
@@ -578,19 +709,11 @@ class NeuroGuessrGame(QMainWindow):
         buttons_layout.setSpacing(20)
         
         quit_button = QPushButton("Quit")
-        quit_button.setStyleSheet("""
-            QPushButton {font-size: 18px; padding: 15px 40px; background-color: #f44336; color: white; border-radius: 10px; border: none; font-weight: bold;}
-            QPushButton:hover {background-color: #d32f2f;}
-        """)
-        quit_button.setFont(QFont("Helvetica [Cronyx]", 18, QFont.Bold))
+        quit_button.setObjectName("quitButton")
         quit_button.clicked.connect(QApplication.instance().quit)
 
         play_button = QPushButton("Play")
-        play_button.setStyleSheet("""
-            QPushButton {font-size: 18px; padding: 15px 40px; background-color: #4CAF50; color: white; border-radius: 10px; border: none; font-weight: bold;}
-            QPushButton:hover {background-color: #45a049;}
-        """)
-        play_button.setFont(QFont("Helvetica [Cronyx]", 18, QFont.Bold))
+        play_button.setObjectName("playButton")
         play_button.clicked.connect(self.start_game_from_landing)
         
         buttons_layout.addWidget(quit_button)
@@ -599,7 +722,16 @@ class NeuroGuessrGame(QMainWindow):
         landing_layout.addStretch()
 
         self.stacked_widget.addWidget(self.landing_widget)
+        self.stacked_widget.setCurrentWidget(self.landing_widget)
+        self.landing_widget.installEventFilter(self)
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def ensure_game_screen(self):
+        """Build the game screen the first time it is needed."""
+        if self.game_widget is None:
+            self.setup_game_screen()
 
+    def setup_game_screen(self):
         self.game_widget = QWidget()
         main_game_layout = QHBoxLayout(self.game_widget)
 
@@ -609,40 +741,52 @@ class NeuroGuessrGame(QMainWindow):
         selection_layout = QHBoxLayout()
         atlas_layout = QHBoxLayout()
         atlas_label = QLabel("Active Atlas:")
-        atlas_label.setStyleSheet("color: white;")
-        atlas_label.setFont(QFont("Helvetica [Cronyx]", 14))
+        atlas_label.setObjectName("gameLabel")
         self.active_atlas_label = QLabel(self.current_atlas)
-        self.active_atlas_label.setStyleSheet("color: white; font-weight: bold;")
-        self.active_atlas_label.setFont(QFont("Helvetica [Cronyx]", 14, QFont.Bold))
+        self.active_atlas_label.setObjectName("activeAtlas")
         atlas_layout.addWidget(atlas_label)
         atlas_layout.addWidget(self.active_atlas_label)
         self.atlas_toggle = QCheckBox("Show Atlas Regions")
         self.atlas_toggle.setChecked(True)
-        self.atlas_toggle.setStyleSheet("color: white; font-size: 14px;")
-        self.atlas_toggle.setFont(QFont("Helvetica [Cronyx]", 14))
         self.atlas_toggle.stateChanged.connect(self.toggle_atlas_visibility)
         atlas_layout.addWidget(self.atlas_toggle)
+        self.hover_toggle = QCheckBox("Hover Readout")
+        self.hover_toggle.setChecked(False)
+        self.hover_toggle.stateChanged.connect(self.toggle_hover_readout)
+        atlas_layout.addWidget(self.hover_toggle)
+        self.cross_atlas_toggle = QCheckBox("Cross-Atlas")
+        self.cross_atlas_toggle.setChecked(False)
+        self.cross_atlas_toggle.stateChanged.connect(self.toggle_cross_atlas)
+        atlas_layout.addWidget(self.cross_atlas_toggle)
+        self.prob_toggle = QCheckBox("Probabilistic Scoring")
+        self.prob_toggle.setChecked(False)
+        self.prob_toggle.setEnabled(False)
+        self.prob_toggle.stateChanged.connect(self.toggle_probabilistic_scoring)
+        atlas_layout.addWidget(self.prob_toggle)
+        self.oblique_toggle = QCheckBox("Oblique View")
+        self.oblique_toggle.setChecked(False)
+        self.oblique_toggle.stateChanged.connect(self.toggle_oblique_view)
+        atlas_layout.addWidget(self.oblique_toggle)
+        self.heatmap_toggle = QCheckBox("Click Heatmap")
+        self.heatmap_toggle.setChecked(False)
+        self.heatmap_toggle.setToolTip("Where players clicked while looking for the current target and missed it")
+        self.heatmap_toggle.stateChanged.connect(self.toggle_heatmap)
+        atlas_layout.addWidget(self.heatmap_toggle)
         selection_layout.addLayout(atlas_layout)
         selection_layout.addStretch()
         game_layout.addLayout(selection_layout)
 
         status_layout = QHBoxLayout()
         self.target_label = QLabel("Target: Not Started")
-        self.target_label.setFont(QFont("Helvetica [Cronyx]", 24, QFont.Bold))
-        self.target_label.setStyleSheet("color: white; background-color: #333; padding: 5px; border-radius: 5px;")
+        self.target_label.setObjectName("targetLabel")
         self.target_label.setAlignment(Qt.AlignCenter)
         self.timer_label = QLabel("Time: 3:00")
-        self.timer_label.setFont(QFont("Helvetica [Cronyx]", 14))
-        self.target_label.setStyleSheet("color: white; background-color: #333; padding: 5px; border-radius: 5px;")
-        self.timer_label.setFont(QFont("Helvetica [Cronyx]", 14))
-        self.timer_label.setStyleSheet("color: white; background-color: #333; padding: 5px; border-radius: 5px;")
+        self.timer_label.setObjectName("timerLabel")
         score_layout = QVBoxLayout()
         self.score_label = QLabel("Correct: 0")
-        self.score_label.setFont(QFont("Helvetica [Cronyx]", 14))
-        self.score_label.setStyleSheet("color: white;")
+        self.score_label.setObjectName("gameLabel")
         self.error_label = QLabel("Errors: 0")
-        self.error_label.setFont(QFont("Helvetica [Cronyx]", 14))
-        self.error_label.setStyleSheet("color: white;")
+        self.error_label.setObjectName("gameLabel")
         score_layout.addWidget(self.score_label)
         score_layout.addWidget(self.error_label)
         status_layout.addWidget(self.target_label, 3)
@@ -650,92 +794,143 @@ class NeuroGuessrGame(QMainWindow):
         status_layout.addLayout(score_layout, 1)
         game_layout.addLayout(status_layout)
 
+        self.hover_label = QLabel("")
+        self.hover_label.setObjectName("readout")
+        self.hover_label.setAlignment(Qt.AlignCenter)
+        self.hover_label.setVisible(False)
+        game_layout.addWidget(self.hover_label)
+
+        self.cross_atlas_label = QLabel("")
+        self.cross_atlas_label.setObjectName("readout")
+        self.cross_atlas_label.setAlignment(Qt.AlignCenter)
+        self.cross_atlas_label.setWordWrap(True)
+        self.cross_atlas_label.setVisible(False)
+        game_layout.addWidget(self.cross_atlas_label)
+
+        self.minimap_label = QLabel("")
+        self.minimap_label.setObjectName("minimap")
+        self.minimap_label.setAlignment(Qt.AlignCenter)
+        self.minimap_label.setToolTip("The target seen through the whole brain from above, the front and the side; "
+                                      "the red dot is the crosshair")
+        self.minimap_label.setVisible(False)
+        game_layout.addWidget(self.minimap_label)
+
         views_layout = QHBoxLayout()
         self.slice_views = []
-        for i in range(3):
+        for i in range(4):
             view = BrainSliceView(i)
             view.slice_clicked.connect(self.handle_slice_click)
             view.slice_changed.connect(self.handle_slice_change)
+            view.slice_hovered.connect(self.handle_slice_hover)
             self.slice_views.append(view)
             views_layout.addWidget(view)
+        self.slice_views[3].setVisible(False)
+
+        self.perf_label = QLabel(self.game_widget)
+        self.perf_label.setObjectName("perfOverlay")
+        self.perf_label.move(10, 10)
+        self.perf_label.setVisible(False)
+        self.perf_timer = QTimer()
+        self.perf_timer.timeout.connect(self.refresh_perf_overlay)
         game_layout.addLayout(views_layout, 1)
 
         slider_layout = QHBoxLayout()
         z_layout = QVBoxLayout()
         z_label = QLabel("Axial")
         z_label.setAlignment(Qt.AlignCenter)
-        z_label.setStyleSheet("color: white;")
-        z_label.setFont(QFont("Helvetica [Cronyx]", 12))
+        z_label.setObjectName("sliderLabel")
         self.z_slider = QSlider(Qt.Horizontal)
         self.z_slider.setMinimum(0)
         self.z_slider.setMaximum(100)
         self.z_slider.setValue(50)
         self.z_slider.valueChanged.connect(lambda v: self.update_slice_position(0, v))
+        self.z_slider.actionTriggered.connect(lambda _: self.record_trace("slider", 0, self.z_slider.sliderPosition()))
         z_layout.addWidget(z_label)
         z_layout.addWidget(self.z_slider)
         y_layout = QVBoxLayout()
         y_label = QLabel("Coronal")
         y_label.setAlignment(Qt.AlignCenter)
-        y_label.setStyleSheet("color: white;")
-        y_label.setFont(QFont("Helvetica [Cronyx]", 12))
+        y_label.setObjectName("sliderLabel")
         self.y_slider = QSlider(Qt.Horizontal)
         self.y_slider.setMinimum(0)
         self.y_slider.setMaximum(100)
         self.y_slider.setValue(50)
         self.y_slider.valueChanged.connect(lambda v: self.update_slice_position(1, v))
+        self.y_slider.actionTriggered.connect(lambda _: self.record_trace("slider", 1, self.y_slider.sliderPosition()))
         y_layout.addWidget(y_label)
         y_layout.addWidget(self.y_slider)
         x_layout = QVBoxLayout()
         x_label = QLabel("Sagittal")
         x_label.setAlignment(Qt.AlignCenter)
-        x_label.setStyleSheet("color: white;")
-        x_label.setFont(QFont("Helvetica [Cronyx]", 12))
+        x_label.setObjectName("sliderLabel")
         self.x_slider = QSlider(Qt.Horizontal)
         self.x_slider.setMinimum(0)
         self.x_slider.setMaximum(100)
         self.x_slider.setValue(50)
         self.x_slider.valueChanged.connect(lambda v: self.update_slice_position(2, v))
+        self.x_slider.actionTriggered.connect(lambda _: self.record_trace("slider", 2, self.x_slider.sliderPosition()))
         x_layout.addWidget(x_label)
         x_layout.addWidget(self.x_slider)
         slider_layout.addLayout(z_layout)
         slider_layout.addLayout(y_layout)
         slider_layout.addLayout(x_layout)
+        self.oblique_controls = QWidget()
+        oblique_layout = QHBoxLayout(self.oblique_controls)
+        oblique_layout.setContentsMargins(0, 0, 0, 0)
+        self.oblique_sliders = []
+        for name, limit in (("Tilt", 90), ("Rotate", 180)):
+            column = QVBoxLayout()
+            label = QLabel(name)
+            label.setAlignment(Qt.AlignCenter)
+            label.setObjectName("sliderLabel")
+            slider = QSlider(Qt.Horizontal)
+            slider.setMinimum(-limit)
+            slider.setMaximum(limit)
+            slider.setValue(0)
+            slider.valueChanged.connect(self.update_oblique_orientation)
+            column.addWidget(label)
+            column.addWidget(slider)
+            oblique_layout.addLayout(column)
+            self.oblique_sliders.append(slider)
+        self.oblique_controls.setVisible(False)
+        slider_layout.addWidget(self.oblique_controls)
         game_layout.addLayout(slider_layout)
 
+        self.name_widget = QWidget()
+        name_layout = QVBoxLayout(self.name_widget)
+        name_layout.setContentsMargins(0, 0, 0, 0)
+        self.name_input = QLineEdit()
+        self.name_input.setObjectName("nameInput")
+        self.name_input.setPlaceholderText("Name the blinking region...")
+        self.name_input.textEdited.connect(self.update_name_matches)
+        self.name_input.returnPressed.connect(self.submit_typed_name)
+        self.name_input.installEventFilter(self)
+        self.name_matches = QListWidget()
+        self.name_matches.setObjectName("nameMatches")
+        self.name_matches.setMaximumHeight(160)
+        self.name_matches.itemClicked.connect(lambda item: self.submit_name(item.data(Qt.UserRole)))
+        name_layout.addWidget(self.name_input)
+        name_layout.addWidget(self.name_matches)
+        self.name_widget.setVisible(False)
+        game_layout.addWidget(self.name_widget)
+
         button_layout = QHBoxLayout()
         self.start_button = QPushButton("Start Game")
+        self.start_button.setObjectName("startButton")
         self.start_button.clicked.connect(self.start_game)
-        self.start_button.setStyleSheet("""
-            QPushButton {font-size: 16px; padding: 10px; background-color: #4CAF50; color: white; border-radius: 5px;}
-            QPushButton:hover {background-color: #45a049;}
-        """)
-        self.start_button.setFont(QFont("Helvetica [Cronyx]", 16))
         
         self.guess_button = QPushButton("Confirm Guess")
+        self.guess_button.setObjectName("guessButton")
         self.guess_button.clicked.connect(self.validate_guess)
         self.guess_button.setEnabled(False)
-        self.guess_button.setStyleSheet("""
-            QPushButton {font-size: 16px; padding: 10px; background-color: #4CAF50; color: white; border-radius: 5px;}
-            QPushButton:disabled {background-color: #cccccc; color: #666666;}
-            QPushButton:hover:enabled {background-color: #45a049;}
-        """)
-        self.guess_button.setFont(QFont("Helvetica [Cronyx]", 16))
         
         self.help_button = QPushButton("Help")
+        self.help_button.setObjectName("helpButton")
         self.help_button.clicked.connect(self.show_help)
-        self.help_button.setStyleSheet("""
-            QPushButton {font-size: 16px; padding: 10px; background-color: #2196F3; color: white; border-radius: 5px;}
-            QPushButton:hover {background-color: #0b7dda;}
-        """)
-        self.help_button.setFont(QFont("Helvetica [Cronyx]", 16))
         
         self.menu_button = QPushButton("Menu")
+        self.menu_button.setObjectName("menuButton")
         self.menu_button.clicked.connect(self.show_menu)
-        self.menu_button.setStyleSheet("""
-            QPushButton {font-size: 16px; padding: 10px; background-color: #FF9800; color: white; border-radius: 5px;}
-            QPushButton:hover {background-color: #e68a00;}
-        """)
-        self.menu_button.setFont(QFont("Helvetica [Cronyx]", 16))
         
         button_layout.addWidget(self.start_button)
         button_layout.addWidget(self.guess_button)
@@ -749,16 +944,12 @@ class NeuroGuessrGame(QMainWindow):
         memo_layout = QVBoxLayout(self.memo_widget)
         memo_layout.setContentsMargins(10, 10, 10, 10)
         self.memo_title = QLabel("Region Information")
-        self.memo_title.setFont(QFont("Helvetica [Cronyx]", 16, QFont.Bold))
-        self.memo_title.setStyleSheet("color: white;")
+        self.memo_title.setObjectName("memoTitle")
         self.memo_title.setAlignment(Qt.AlignCenter)
         memo_layout.addWidget(self.memo_title)
         self.memo_text = QTextEdit()
+        self.memo_text.setObjectName("memoText")
         self.memo_text.setReadOnly(True)
-        self.memo_text.setStyleSheet("""
-            QTextEdit {background-color: #2D2D30; color: white; border: 1px solid #444; border-radius: 5px; padding: 5px; font-size: 14px;}
-        """)
-        self.memo_text.setFont(QFont("Helvetica [Cronyx]", 14))
         self.memo_text.setMinimumWidth(300)
         self.memo_text.setMaximumWidth(400)
         memo_layout.addWidget(self.memo_text)
@@ -767,20 +958,144 @@ class NeuroGuessrGame(QMainWindow):
         main_game_layout.addWidget(left_panel, 3)
         main_game_layout.addWidget(self.memo_widget, 1)
 
-        self.setFocusPolicy(Qt.StrongFocus)
+        self.game_timer = QTimer()
+        self.game_timer.timeout.connect(self.update_timer)
         self.keyPressEvent = self.handle_key_press
 
         self.stacked_widget.addWidget(self.game_widget)
-        self.stacked_widget.setCurrentWidget(self.landing_widget)
-        self.load_data()
+
+    def eventFilter(self, watched, event):
+        if (self.game_widget is not None and watched is self.name_input and event.type() == QEvent.KeyPress
+                and event.key() in (Qt.Key_Up, Qt.Key_Down) and self.name_matches.count()):
+            # Arrow keys walk the suggestions while the cursor stays in the answer box.
+            step = 1 if event.key() == Qt.Key_Down else -1
+            row = min(max(self.name_matches.currentRow() + step, 0), self.name_matches.count() - 1)
+            self.name_matches.setCurrentRow(row)
+            return True
+        if watched is self.landing_widget and event.type() == QEvent.Paint:
+            # Mark once this first paint is done, then do the startup work the page did not need.
+            self.landing_widget.removeEventFilter(self)
+            QTimer.singleShot(0, lambda: STARTUP.mark("landing_visible"))
+            QTimer.singleShot(0, self.finish_startup)
+        return super().eventFilter(watched, event)
+
+    def finish_startup(self):
+        """Refresh the atlas manifest and previews once the landing page is visible."""
+        self.atlas_manifest = update_manifest()["atlases"]
+        for i, atlas_name in enumerate(self.atlas_options):
+            button = self.atlas_button_group.button(i)
+            if button is not None and atlas_name not in self.native_subjects:
+                button.setText(self.atlas_button_text(atlas_name))
+                button.setToolTip(self.atlas_tooltip(atlas_name))
+        self.load_atlas_previews()
+        self.startup_finished = True
+
+    def atlas_button_text(self, atlas_name):
+        """Landing-page label of an atlas, with its region count taken from the manifest."""
+        entry = self.atlas_manifest.get(atlas_name, {})
+        if "label_count" in entry:
+            return f"{atlas_name}\n{entry['label_count']} regions"
+        return atlas_name
+
+    def load_atlas_previews(self):
+        """Show cached atlas previews on the landing page; missing ones are rendered in the background."""
+        template_file = get_template_path()
+        if not resource_exists(template_file):
+            return
+        missing = []
+        for i, (atlas_name, (atlas_file, region_file)) in enumerate(self.atlas_options.items()):
+            if atlas_name in self.native_subjects or not (resource_exists(atlas_file) and resource_exists(region_file)):
+                continue
+            path = preview_path(atlas_file, region_file, template_file)
+            if os.path.exists(path):
+                self.set_atlas_preview(i, path)
+            else:
+                missing.append((i, atlas_file, region_file))
+        if missing and self.preview_thread is None:
+            self.preview_thread = TaskThread(lambda: self.render_atlas_previews(missing, template_file), self)
+            self.preview_thread.task_done.connect(self.on_atlas_previews_ready)
+            self.preview_thread.start()
+
+    def render_atlas_previews(self, missing, template_file):
+        """Runs off the GUI thread: [(button id, preview path)] of the previews it could render."""
+        previews = []
+        for i, atlas_file, region_file in missing:
+            if self.closing:
+                break
+            try:
+                previews.append((i, atlas_preview(atlas_file, region_file, template_file)))
+            except Exception as e:
+                print(f"Warning: Failed to render atlas preview for {atlas_file}: {e}")
+        return previews
+
+    def stop_background_work(self):
+        """Wait for the worker threads before the application exits: Qt aborts on destroying a running QThread."""
+        self.closing = True
+        self.stop_glass_brain()
+        for thread in (self.load_thread, self.preview_thread, self.multi_atlas_thread):
+            wait_for_thread(thread)
+        if self.distance_maps is not None:
+            self.distance_maps.shutdown(wait=True)
+
+    def on_atlas_previews_ready(self, previews):
+        self.preview_thread = None
+        for i, path in previews or []:
+            self.set_atlas_preview(i, path)
+
+    def set_atlas_preview(self, button_id, path):
+        button = self.atlas_button_group.button(button_id)
+        if button is not None:
+            pixmap = QPixmap(path)
+            button.setIcon(QIcon(pixmap))
+            button.setIconSize(QSize(60, 72))
+            self.thumbnails.put(button_id, pixmap, pixmap.width() * pixmap.height() * 4, pinned=True)
+
+    def atlas_tooltip(self, atlas_name):
+        entry = self.atlas_manifest.get(atlas_name, {})
+        if entry.get("missing"):
+            return "Atlas files not found."
+        if "shape" not in entry:
+            return ""
+        tooltip = f"{'x'.join(map(str, entry['shape']))} voxels ({entry['dtype']})"
+        if entry["roi_bounds"]:
+            lo, hi = entry["roi_bounds"]
+            tooltip += f"\nLabelled region: {' x '.join(str(h - l) for l, h in zip(lo, hi))} voxels"
+        return tooltip
+
+    def refresh_level_options(self):
+        """List the region levels of the atlas selected on the landing page."""
+        atlas_name = list(self.atlas_options.keys())[self.atlas_button_group.checkedId()]
+        region_file = self.atlas_options[atlas_name][1]
+        levels = []
+        if resource_exists(region_file):
+            try:
+                levels = list(load_levels(region_file, read_lut(region_file)[0]))
+            except (OSError, ValueError) as e:
+                print(f"Warning: Failed to read region levels for {atlas_name}: {e}")
+        previous = self.level_combo.currentText()
+        self.level_combo.blockSignals(True)
+        self.level_combo.clear()
+        self.level_combo.addItems([FINE_LEVEL] + levels)
+        self.level_combo.setCurrentText(previous if previous in levels else FINE_LEVEL)
+        self.level_combo.blockSignals(False)
+        self.level_combo.setEnabled(bool(levels))
+
+    def record_key(self, atlas, level):
+        """Personal records are kept separately for each coarser region level."""
+        return atlas if level == FINE_LEVEL else f"{atlas} [{level}]"
+
+    def get_pr(self, atlas, color_mode):
+        """Personal record for an atlas and display mode; the atlas is read from disk on first use."""
+        return self.records.get(atlas, color_mode)
 
     def update_pr_label(self):
         atlas_names = list(self.atlas_options.keys())
         selected_atlas_id = self.atlas_button_group.checkedId()
         atlas = atlas_names[selected_atlas_id]
-        color_mode = "colored" if self.color_button_group.checkedId() == 0 else "non_colored"
-        pr = self.pr_data.get(atlas, {"colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0},
-                                      "non_colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}})[color_mode]
+        if hasattr(self, "level_combo"):
+            atlas = self.record_key(atlas, self.level_combo.currentText() or FINE_LEVEL)
+        color_mode = DISPLAY_MODES[self.color_button_group.checkedId()]
+        pr = self.get_pr(atlas, color_mode)
         
         if pr["time"] == float("inf"):
             self.time_pr_label.setText("0")
@@ -803,6 +1118,87 @@ class NeuroGuessrGame(QMainWindow):
         self.show_atlas = (state == Qt.Checked)
         self.update_all_slices()
 
+    def toggle_hover_readout(self, state):
+        self.hover_readout_enabled = (state == Qt.Checked)
+        self.hover_label.setVisible(self.hover_readout_enabled and self.game_mode == "Practice")
+        self.hover_label.setText("")
+
+    def handle_slice_hover(self, x, y, plane_index):
+        if not self.hover_readout_enabled or self.game_mode != "Practice" or self.brain_volume is None:
+            return
+        if x < 0:
+            self.hover_label.setText("")
+            return
+        region = self.slice_views[plane_index].label_at(x, y)
+        voxel = self.slice_to_voxel(x, y, plane_index)
+        affine = self.brain_data.affine
+        mm = affine[:3, :3] @ voxel + affine[:3, 3]
+        name = self.region_map.get(region, "Background/Unknown") if region > 0 else "Background"
+        space = "MNI"
+        if self.original_label_ids is not None:
+            space = "Scanner"
+            if region > 0:
+                name += f" (#{self.original_label(region)})"
+        self.hover_label.setText(f"{name}   |   {space} ({mm[0]:.0f}, {mm[1]:.0f}, {mm[2]:.0f}) mm")
+
+    def toggle_probabilistic_scoring(self, state):
+        self.probabilistic_scoring = (state == Qt.Checked) and self.prob_atlas is not None
+
+    def load_probability_store(self, region_file):
+        """Attach the atlas's quantized probability store, if one ships next to its LUT."""
+        self.prob_atlas = None
+        store_dir = probability_store_path(region_file)
+        if resource_isdir(store_dir):
+            try:
+                prob_atlas = ProbabilisticAtlas(store_dir)
+                if (prob_atlas.shape == self.brain_volume.shape
+                        and np.allclose(prob_atlas.affine, self.brain_data.affine, atol=1e-3)):
+                    self.prob_atlas = prob_atlas
+                else:
+                    print(f"Warning: Probability store {store_dir} does not match the atlas grid.")
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Failed to open probability store {store_dir}: {e}")
+        self.prob_toggle.setEnabled(self.prob_atlas is not None)
+        if self.prob_atlas is None:
+            self.prob_toggle.setChecked(False)
+        self.probabilistic_scoring = self.prob_toggle.isChecked() and self.prob_atlas is not None
+
+    def toggle_cross_atlas(self, state):
+        self.cross_atlas_enabled = (state == Qt.Checked)
+        self.cross_atlas_label.setVisible(self.cross_atlas_enabled and self.game_mode == "Practice")
+        if not self.cross_atlas_enabled:
+            return
+        if self.multi_atlas_index is None:
+            if self.multi_atlas_thread is None:
+                self.cross_atlas_label.setText("Indexing atlases...")
+                bundled = {name: paths for name, paths in self.atlas_options.items() if name not in self.native_subjects}
+                self.multi_atlas_thread = TaskThread(lambda: load_multi_atlas_index(bundled, get_template_path()), self)
+                self.multi_atlas_thread.task_done.connect(self.on_multi_atlas_index_ready)
+                self.multi_atlas_thread.start()
+        else:
+            self.update_cross_atlas_label()
+
+    def on_multi_atlas_index_ready(self, index):
+        self.multi_atlas_thread = None
+        self.multi_atlas_index = index
+        if index is None:
+            self.cross_atlas_label.setText("Cross-atlas index unavailable.")
+        else:
+            self.update_cross_atlas_label()
+
+    def update_cross_atlas_label(self):
+        if not self.cross_atlas_enabled or self.multi_atlas_index is None or self.game_mode != "Practice":
+            return
+        voxel = self.crosshair_3d
+        if self.brain_volume is None or self.brain_volume.shape != self.multi_atlas_index.shape:
+            self.cross_atlas_label.setText("")
+            return
+        matches = self.multi_atlas_index.lookup(voxel)
+        if matches:
+            self.cross_atlas_label.setText("   ·   ".join(f"{atlas}: {name}" for atlas, _, name in matches))
+        else:
+            self.cross_atlas_label.setText("No atlas labels at this voxel.")
+
     def reset_game_ui(self):
         self.start_button.show()
         self.guess_button.hide()
@@ -821,6 +1217,8 @@ class NeuroGuessrGame(QMainWindow):
         self.consecutive_errors = 0
         self.correct_guesses = []
         self.incorrect_guesses = []
+        self.near_miss_credit = {}
+        self.probability_score = 0.0
         self.streak_guessed_regions = []
         self.all_regions = []
         self.remaining_regions = []
@@ -833,8 +1231,24 @@ class NeuroGuessrGame(QMainWindow):
         for view in self.slice_views:
             view.stop_blinking()
         self.memo_widget.setVisible(False)
+        self.hover_label.setText("")
+        self.hover_label.setVisible(self.hover_readout_enabled and self.game_mode == "Practice")
+        self.hover_toggle.setVisible(self.game_mode == "Practice")
+        self.cross_atlas_toggle.setVisible(self.game_mode == "Practice")
+        self.cross_atlas_label.setText("")
+        self.cross_atlas_label.setVisible(self.cross_atlas_enabled and self.game_mode == "Practice")
+        self.minimap_label.setVisible(False)
+        self.name_input.clear()
+        self.name_matches.clear()
+        self.name_widget.setVisible(False)
 
     def handle_slice_change(self, plane_index, delta):
+        self.record_trace("wheel", plane_index, delta)
+        if plane_index == 3:
+            # Translating the oblique plane keeps its cached sampling grid.
+            self.oblique_depth += delta
+            self.update_oblique_view()
+            return
         if plane_index == 0:
             slider = self.z_slider
         elif plane_index == 1:
@@ -847,65 +1261,300 @@ class NeuroGuessrGame(QMainWindow):
         self.update_slice_position(plane_index, new_value)
 
     def start_game_from_landing(self):
-        selected_mode_id = self.mode_button_group.checkedId()
-        if selected_mode_id == 0:
-            self.game_mode = "Practice"
-        elif selected_mode_id == 1:
-            self.game_mode = "Contre la Montre"
-        else:
-            self.game_mode = "Streak"
+        STARTUP.mark("play")
+        self.ensure_game_screen()
+        self.game_mode = GAME_MODES[self.mode_button_group.checkedId()]
         selected_atlas_id = self.atlas_button_group.checkedId()
         atlas_names = list(self.atlas_options.keys())
         self.current_atlas = atlas_names[selected_atlas_id]
-        self.use_colored_atlas = self.color_button_group.checkedId() == 0
+        self.display_mode = DISPLAY_MODES[self.color_button_group.checkedId()]
+        self.use_colored_atlas = self.display_mode != "non_colored"
         self.active_atlas_label.setText(self.current_atlas)
+        self.seed_session()
         self.load_data()
+        if self.region_level != FINE_LEVEL:
+            self.active_atlas_label.setText(f"{self.current_atlas} ({self.region_level})")
         self.set_game_mode(self.game_mode)
         self.reset_game_ui()
         self.update_pr_label()
         self.memo_widget.setVisible(self.game_mode == "Practice")
         self.stacked_widget.setCurrentWidget(self.game_widget)
+        if self.record_traces:
+            self.begin_trace()
+
+    def seed_session(self):
+        """Seed target selection so that a recorded session replays identically."""
+        seed = self.next_seed if self.next_seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.next_seed = None
+        self.session_seed = seed
+        random.seed(seed)
+        np.random.seed(seed)
+
+    def begin_trace(self):
+        self.finish_trace()
+        header = {"atlas": self.current_atlas, "mode": self.game_mode, "display_mode": self.display_mode,
+                  "level": self.region_level, "seed": self.session_seed,
+                  "shape": list(self.brain_volume.shape) if self.brain_volume is not None else None,
+                  "oblique": [self.oblique_enabled] + [slider.value() for slider in self.oblique_sliders]}
+        self.trace = TraceRecorder(self.trace_path or default_trace_path(self.current_atlas), header)
+
+    def record_trace(self, kind, *args):
+        if self.trace is not None:
+            self.trace.record(kind, *args)
+
+    def finish_trace(self):
+        if self.trace is None:
+            return
+        try:
+            print(f"Trace written to {self.trace.save()}")
+        except OSError as e:
+            print(f"Warning: Failed to write trace {self.trace.path}: {e}")
+        self.trace = None
 
     def handle_key_press(self, event):
         if event.key() == Qt.Key_Space and self.guess_button.isEnabled():
             self.validate_guess()
+        elif event.key() == Qt.Key_F12:
+            self.toggle_perf_overlay()
+
+    def toggle_perf_overlay(self):
+        visible = not self.perf_label.isVisible()
+        # Timing stays on while a --perf-log session is being recorded.
+        PERF.enabled = visible or PERF.log_path is not None
+        self.perf_label.setVisible(visible)
+        if visible:
+            self.perf_label.raise_()
+            self.refresh_perf_overlay()
+            self.perf_timer.start(500)
+        else:
+            self.perf_timer.stop()
+
+    def refresh_perf_overlay(self):
+        self.perf_label.setText("\n".join(PERF.summary_lines() + [""] + MEMORY.summary_lines()))
+        self.perf_label.adjustSize()
+
+    def add_freesurfer_subject(self):
+        """Register a subject's T1 and aparc.a2009s+aseg as a native-space atlas."""
+        subject_dir = QFileDialog.getExistingDirectory(self, "Select FreeSurfer Subject Directory")
+        if not subject_dir:
+            return
+        files = find_subject_files(subject_dir)
+        if files is None:
+            t1_file, _ = QFileDialog.getOpenFileName(self, "Select T1 Volume", subject_dir,
+                                                     "Volumes (*.mgz *.nii *.nii.gz)")
+            aparc_file, _ = QFileDialog.getOpenFileName(self, "Select aparc.a2009s+aseg Volume", subject_dir,
+                                                        "Volumes (*.mgz *.nii *.nii.gz)")
+            if not t1_file or not aparc_file:
+                return
+            files = (t1_file, aparc_file)
+        atlas_name = f"FreeSurfer: {os.path.basename(os.path.normpath(subject_dir))}"
+        if atlas_name not in self.atlas_options:
+            self.atlas_options[atlas_name] = (files[1], get_resource_path("data/fs_a2009s.txt"))
+            atlas_button = QPushButton(atlas_name)
+            atlas_button.setObjectName("choice")
+            atlas_button.setCheckable(True)
+            i = len(self.atlas_options) - 1
+            self.atlas_button_group.addButton(atlas_button, i)
+            self.atlas_buttons_layout.addWidget(atlas_button, i // 3, i % 3)
+        self.native_subjects[atlas_name] = files[0]
+        self.atlas_button_group.button(list(self.atlas_options).index(atlas_name)).setChecked(True)
+        self.refresh_level_options()
+        self.update_pr_label()
+
+    def load_native_subject(self, atlas_name):
+        """Load a FreeSurfer subject with labels remapped to a dense index."""
+        aparc_file, lut_file = self.atlas_options[atlas_name]
+        (self.template_data, self.template_volume, self.brain_data, self.brain_volume,
+         self.region_map, self.colormap, self.original_label_ids) = load_freesurfer_subject(
+            self.native_subjects[atlas_name], aparc_file, lut_file)
+        self.region_info = {}
+        self.show_loaded_volumes(lut_file)
+
+    def original_label(self, region):
+        """LUT ID of a displayed region; differs from the dense ID for remapped atlases."""
+        if self.original_label_ids is None:
+            return region
+        return int(self.original_label_ids[region])
+
+    def apply_region_level(self, level):
+        """Switch the loaded atlas to a region level, deriving and caching it on first use.
+
+        Derived levels that are not on screen may be evicted under memory pressure
+        and are derived again when picked.
+        """
+        if level not in self.atlas_levels:
+            if level not in self.level_parents:
+                level = FINE_LEVEL
+            else:
+                start = time.perf_counter()
+                volume, region_map, colormap, _, _ = self.atlas_levels[FINE_LEVEL]
+                derived = derive_level(volume, region_map, colormap, self.level_parents[level]) + (None,)
+                self.atlas_levels.put(level, derived, resident_bytes(derived[0]), (time.perf_counter() - start) * 1000)
+        self.atlas_levels.pinned = {FINE_LEVEL, level}
+        (self.brain_volume, self.region_map, self.colormap, self.region_info,
+         self.original_label_ids) = self.atlas_levels[level]
+        self.region_level = level
+        self.prob_toggle.setEnabled(self.prob_atlas is not None and level == FINE_LEVEL)
+
+    def show_loaded_volumes(self, region_file):
+        # Derived levels belong to this atlas load only; drop those of the previous atlas.
+        # The fine level is charged to the budget under "volumes".
+        self.atlas_levels.clear()
+        self.atlas_levels.put(FINE_LEVEL, (self.brain_volume, self.region_map, self.colormap,
+                                           self.region_info, self.original_label_ids), 0, pinned=True)
+        self.account_volumes(self.brain_volume, self.template_volume)
+        self.level_parents = load_levels(region_file, self.region_map)
+        self.apply_region_level(self.level_combo.currentText() or FINE_LEVEL)
+        self.reset_distance_maps()
+        self.open_glass_brain()
+        self.open_name_index()
+        self.z_slider.setMaximum(self.brain_data.shape[2] - 1)
+        self.y_slider.setMaximum(self.brain_data.shape[1] - 1)
+        self.x_slider.setMaximum(self.brain_data.shape[0] - 1)
+        self.z_slider.setValue(self.brain_data.shape[2] // 2)
+        self.y_slider.setValue(self.brain_data.shape[1] // 2)
+        self.x_slider.setValue(self.brain_data.shape[0] // 2)
+        self.update_all_slices()
+        self.load_timings.mark_first_frame()
+        self.finish_loading_in_background()
 
     def load_data(self):
+        self.ensure_game_screen()
+        self.release_atlas()
         atlas_name = self.current_atlas
         atlas_file, region_file = self.atlas_options[atlas_name]
-        template_file = get_resource_path("data/tpl-ICBM_regrid_stride.nii.gz")
+        template_file = get_template_path()
         json_file = os.path.splitext(region_file)[0] + ".json"
-        try:
-            if os.path.exists(template_file):
-                self.template_data = nib.load(template_file)
-            else:
-                raise FileNotFoundError(f"Template file {template_file} not found.")
-            if os.path.exists(atlas_file) and os.path.exists(region_file):
-                self.brain_data = nib.load(atlas_file)
-                region_df = pd.read_csv(region_file, sep="\s+", comment="#", header=None,
-                                        names=["Index", "RegionName", "R", "G", "B", "A"])
-                self.region_map = {row["Index"]: row["RegionName"] for _, row in region_df.iterrows()}
-                self.colormap = {row["Index"]: (row["R"], row["G"], row["B"]) for _, row in region_df.iterrows()}
-                if os.path.exists(json_file):
-                    with open(json_file, 'r') as f:
-                        self.region_info = json.load(f)
+        self.load_generation += 1
+        self.load_timings = LoadTimings(atlas_name)
+        self.original_label_ids = None
+        with PERF.stage("load_data"):
+            try:
+                if atlas_name in self.native_subjects:
+                    self.load_native_subject(atlas_name)
+                    return
+                if resource_exists(template_file):
+                    self.template_data, self.template_volume, _ = open_volume(template_file)
                 else:
-                    self.region_info = {}
-                    print(f"Warning: JSON file {json_file} not found.")
-                if self.brain_data.shape != self.template_data.shape:
-                    raise ValueError("Atlas and template dimensions do not match.")
-                self.z_slider.setMaximum(self.brain_data.shape[2] - 1)
-                self.y_slider.setMaximum(self.brain_data.shape[1] - 1)
-                self.x_slider.setMaximum(self.brain_data.shape[0] - 1)
-                self.z_slider.setValue(self.brain_data.shape[2] // 2)
-                self.y_slider.setValue(self.brain_data.shape[1] // 2)
-                self.x_slider.setValue(self.brain_data.shape[0] // 2)
-                self.update_all_slices()
-            else:
+                    raise FileNotFoundError(f"Template file {template_file} not found.")
+                if resource_exists(atlas_file) and resource_exists(region_file):
+                    self.region_map, self.colormap = read_lut(region_file)
+                    if resource_exists(json_file):
+                        with open_resource(json_file, 'r') as f:
+                            self.region_info = json.load(f)
+                    else:
+                        self.region_info = {}
+                        print(f"Warning: JSON file {json_file} not found.")
+                    self.brain_data, self.brain_volume = open_atlas_on_template(atlas_file, template_file, self.template_data)
+                    self.load_probability_store(region_file)
+                    self.show_loaded_volumes(region_file)
+                else:
+                    self.load_dummy_data()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load data: {str(e)}\nUsing dummy data.")
                 self.load_dummy_data()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load data: {str(e)}\nUsing dummy data.")
-            self.load_dummy_data()
+
+    def release_atlas(self):
+        """Drop the previous atlas and everything derived from it before the next one is opened,
+        so the two are never held at once."""
+        if self.distance_maps is not None:
+            self.distance_maps.shutdown()
+            self.distance_maps = None
+        self.edge_maps = None
+        self.edge_maps_key = None
+        self.heat_points = None
+        self.heat_points_key = None
+        self.stop_glass_brain()
+        self.glass_brain = None
+        self.prob_atlas = None
+        self.probabilistic_scoring = False
+        self.atlas_levels.clear()
+        self.volumes.clear()
+        self.brain_data = self.brain_volume = None
+        self.template_data = self.template_volume = None
+
+    def account_volumes(self, brain_volume, template_volume):
+        """Charge the displayed atlas and template to the memory budget; they are never evicted."""
+        self.volumes.put("atlas", brain_volume, resident_bytes(brain_volume), pinned=True)
+        self.volumes.put("template", template_volume, resident_bytes(template_volume), pinned=True)
+        if self.prob_atlas is not None:
+            self.volumes.put("probabilities", self.prob_atlas, resident_bytes(self.prob_atlas.data), pinned=True)
+
+    def open_glass_brain(self):
+        """Open the minimap projections of the displayed atlas level, building them off the GUI thread on first use."""
+        atlas_file, region_file = self.atlas_options[self.current_atlas]
+        files = [atlas_file, region_file]
+        if self.region_level != FINE_LEVEL and resource_exists(hierarchy_path(region_file)):
+            files.append(hierarchy_path(region_file))
+        template = None
+        if self.current_atlas not in self.native_subjects:
+            # Native subjects' T1s are not skull-stripped: outline their labels instead.
+            files.append(get_template_path())
+            template = self.template_volume
+        if self.glass_brain_thread is not None:
+            return
+        labels, level, generation = self.brain_volume, self.region_level, self.load_generation
+        cancel = self.glass_brain_cancel = threading.Event()
+        thread = TaskThread(lambda: load_glass_brain(projection_key(files, level), labels, template, cancel), self)
+        thread.task_done.connect(lambda glass_brain: self.on_glass_brain_ready(thread, generation, glass_brain))
+        self.glass_brain_thread = thread
+        thread.start()
+
+    def stop_glass_brain(self):
+        """Cancel a projection build still running and wait for its thread to end."""
+        self.glass_brain_cancel.set()
+        wait_for_thread(self.glass_brain_thread)
+        self.glass_brain_thread = None
+
+    def on_glass_brain_ready(self, thread, generation, glass_brain):
+        if self.glass_brain_thread is thread:
+            self.glass_brain_thread = None
+        if generation != self.load_generation:
+            return
+        self.glass_brain = glass_brain
+        self.update_minimap()
+
+    def open_name_index(self):
+        """Fuzzy index of the displayed level's region names, for the Name It answers."""
+        with PERF.stage("name_index"):
+            self.name_index = load_name_index(region_names(self.region_map, self.region_info, self.original_label))
+
+    def update_minimap(self):
+        """Show where the target lies in glass-brain projections while the Practice hint is on."""
+        hint = (self.game_running and self.current_target is not None
+                and self.consecutive_errors >= 3 and self.game_mode == "Practice")
+        if not hint or self.glass_brain is None:
+            self.minimap_label.setVisible(False)
+            return
+        with PERF.stage("minimap"):
+            rgb = self.glass_brain.render(self.current_target, self.crosshair_3d)
+            h, w = rgb.shape[:2]
+            qimg = QImage(rgb.data, w, h, w * 3, QImage.Format_RGB888)
+            self.minimap_label.setPixmap(QPixmap.fromImage(qimg).scaledToHeight(MINIMAP_HEIGHT, Qt.SmoothTransformation))
+        self.minimap_label.setVisible(True)
+
+    def reset_distance_maps(self):
+        if self.distance_maps is not None:
+            self.distance_maps.shutdown()
+        self.distance_maps = DistanceMapCache(self.brain_volume, self.brain_data.header.get_zooms()[:3])
+
+    def finish_loading_in_background(self):
+        """Decode whatever the first frame did not touch without blocking the GUI."""
+        self.load_thread = VolumeLoadThread(self.load_generation, self.brain_volume, self.template_volume, self)
+        self.load_thread.volumes_loaded.connect(self.on_volumes_loaded)
+        self.load_thread.finished.connect(self.load_thread.deleteLater)
+        self.load_thread.start()
+
+    def on_volumes_loaded(self, generation, brain_volume, template_volume):
+        if generation != self.load_generation:
+            return
+        if FINE_LEVEL in self.atlas_levels:
+            self.atlas_levels.put(FINE_LEVEL, (brain_volume,) + self.atlas_levels[FINE_LEVEL][1:], 0, pinned=True)
+        if self.region_level == FINE_LEVEL:
+            self.brain_volume = brain_volume
+        self.template_volume = template_volume
+        self.account_volumes(brain_volume, template_volume)
+        self.load_timings.mark_fully_loaded()
 
     def load_dummy_data(self):
         dummy_shape = (256, 256, 256)
@@ -936,7 +1585,14 @@ class NeuroGuessrGame(QMainWindow):
         affine = np.eye(4)
         self.brain_data = nib.Nifti1Image(dummy_data, affine)
         self.template_data = nib.Nifti1Image(dummy_template, affine)
+        self.brain_volume = dummy_data.astype(np.int32)
+        self.template_volume = dummy_template
+        self.region_level = FINE_LEVEL
+        self.atlas_levels.clear()
+        self.account_volumes(self.brain_volume, self.template_volume)
+        self.reset_distance_maps()
         self.region_map = regions
+        self.open_name_index()
         self.z_slider.setMaximum(dummy_shape[2] - 1)
         self.y_slider.setMaximum(dummy_shape[1] - 1)
         self.x_slider.setMaximum(dummy_shape[0] - 1)
@@ -956,21 +1612,28 @@ class NeuroGuessrGame(QMainWindow):
             self.timer_label.setText("Time: 0'00\" ")
             self.score_label.setText("Regions Found: 0")
             self.memo_widget.setVisible(False)
+        elif mode == "Name It":
+            self.timer_label.setText("Time: N/A")
+            self.score_label.setText("Named: 0")
+            self.memo_widget.setVisible(False)
         else:
             self.timer_label.setText("Time: N/A")
             self.score_label.setText("Streak: 0")
             self.memo_widget.setVisible(False)
 
     def start_game(self):
+        self.record_trace("start")
         self.score = 0
         self.errors = 0
         self.consecutive_errors = 0
         self.correct_guesses = []
         self.incorrect_guesses = []
+        self.near_miss_credit = {}
+        self.probability_score = 0.0
         self.streak_guessed_regions = []
         self.game_running = True
         if self.game_mode == "Contre la Montre":
-            self.all_regions = [int(val) for val in np.unique(self.brain_data.get_fdata().astype(np.int32))
+            self.all_regions = [int(val) for val in unique_labels(self.brain_volume)
                                if val > 0 and val in self.region_map]
             self.remaining_regions = self.all_regions.copy()
             random.shuffle(self.remaining_regions)
@@ -979,11 +1642,12 @@ class NeuroGuessrGame(QMainWindow):
             self.timer_label.setText("Time: 0'00\" ")
         else:
             self.time_remaining = 180 if self.game_mode == "Contre la Montre" else 0
-            self.score_label.setText(f"{'Streak' if self.game_mode == 'Streak' else 'Correct'}: {self.score}")
+            self.score_label.setText(f"{SCORE_TITLES.get(self.game_mode, 'Correct')}: {self.score}")
             self.timer_label.setText("Time: N/A")
         self.error_label.setText("Errors: 0")
         self.start_button.hide()
-        self.guess_button.show()
+        self.guess_button.setVisible(self.game_mode != "Name It")
+        self.name_widget.setVisible(self.game_mode == "Name It")
         self.menu_button.show()
         self.guess_button.setEnabled(False)
         self.memo_widget.setVisible(self.game_mode == "Practice")
@@ -1000,7 +1664,7 @@ class NeuroGuessrGame(QMainWindow):
         if not self.current_target or self.game_mode != "Practice":
             self.memo_text.setText("")
             return
-        region_id = str(self.current_target)
+        region_id = str(self.original_label(self.current_target))
         if region_id in self.region_info:
             info = self.region_info[region_id]
             content = f"""
@@ -1030,32 +1694,139 @@ class NeuroGuessrGame(QMainWindow):
             self.crosshair_3d = (self.crosshair_3d[0], value, self.crosshair_3d[2])
         elif plane_index == 2:
             self.crosshair_3d = (value, self.crosshair_3d[1], self.crosshair_3d[2])
+        if self.oblique_enabled:
+            self.oblique_depth = self.get_oblique_plane().depth_of(self.crosshair_3d)
         self.update_all_slices()
 
+    def highlighted_region(self):
+        """Region drawn in yellow while it blinks: the Practice hint, or the region to name."""
+        if self.game_mode == "Name It" or (self.consecutive_errors >= 3 and self.game_mode == "Practice"):
+            return self.current_target
+        return None
+
     def update_all_slices(self):
-        if self.brain_data is None or self.template_data is None:
+        if self.brain_volume is None or self.template_volume is None:
+            return
+        with PERF.stage("update_all_slices"):
+            with PERF.stage("extract_slices"):
+                brain_3d = self.brain_volume
+                template_3d = self.template_volume
+                z, y, x = self.current_positions
+                brain_shape = self.brain_data.shape
+                x = min(max(x, 0), brain_shape[0] - 1)
+                y = min(max(y, 0), brain_shape[1] - 1)
+                z = min(max(z, 0), brain_shape[2] - 1)
+                axial_slice = brain_3d[:, :, z].T
+                coronal_slice = brain_3d[:, y, :].T
+                sagittal_slice = brain_3d[x, :, :].T
+                axial_template = template_3d[:, :, z].T
+                coronal_template = template_3d[:, y, :].T
+                sagittal_template = template_3d[x, :, :].T
+                highlight_region = self.highlighted_region()
+                colormap = self.colormap if self.use_colored_atlas else None
+                edges = [None, None, None]
+                if self.display_mode == "outline" and self.show_atlas:
+                    edge_maps = self.get_edge_maps()
+                    edges = [edge_maps.slice_edges(0, z), edge_maps.slice_edges(1, y), edge_maps.slice_edges(2, x)]
+            overlays = [None, None, None]
+            heat = self.get_heat_points()
+            if heat is not None:
+                with PERF.stage("heatmap"):
+                    overlays = [(plane_heat(*heat, plane_index, index, brain_3d.shape), self.heat_palette)
+                                for plane_index, index in enumerate((z, y, x))]
+            self.slice_views[0].update_slice(axial_slice, axial_template, colormap, highlight_region, self.show_atlas, edges[0], overlays[0])
+            self.slice_views[1].update_slice(coronal_slice, coronal_template, colormap, highlight_region, self.show_atlas, edges[1], overlays[1])
+            self.slice_views[2].update_slice(sagittal_slice, sagittal_template, colormap, highlight_region, self.show_atlas, edges[2], overlays[2])
+            voxel_x, voxel_y, voxel_z = self.crosshair_3d
+            for view in self.slice_views:
+                view.set_crosshair_3d(voxel_x, voxel_y, voxel_z)
+            self.update_oblique_view()
+            self.update_minimap()
+        PERF.frame()
+
+    def toggle_oblique_view(self, state):
+        self.oblique_enabled = (state == Qt.Checked)
+        self.record_trace("oblique", self.oblique_enabled, self.oblique_sliders[0].value(), self.oblique_sliders[1].value())
+        self.slice_views[3].setVisible(self.oblique_enabled)
+        self.oblique_controls.setVisible(self.oblique_enabled)
+        if self.oblique_enabled and self.brain_volume is not None:
+            self.oblique_depth = self.get_oblique_plane().depth_of(self.crosshair_3d)
+            self.update_oblique_view()
+
+    def get_oblique_plane(self):
+        """Oblique sampling plane for the loaded volumes, rebuilt only when the grid changes."""
+        key = (self.load_generation, self.brain_volume.shape)
+        if self.oblique_plane is None or self.oblique_plane_key != key:
+            self.oblique_plane = ObliquePlane(self.brain_volume.shape, self.brain_data.header.get_zooms()[:3])
+            self.oblique_plane.set_orientation(self.oblique_sliders[1].value(), self.oblique_sliders[0].value())
+            self.oblique_plane_key = key
+        return self.oblique_plane
+
+    def update_oblique_orientation(self):
+        self.record_trace("oblique", self.oblique_enabled, self.oblique_sliders[0].value(), self.oblique_sliders[1].value())
+        if self.brain_volume is None:
+            return
+        plane = self.get_oblique_plane()
+        plane.set_orientation(self.oblique_sliders[1].value(), self.oblique_sliders[0].value())
+        # Rotate about the crosshair rather than the volume centre.
+        self.oblique_depth = plane.depth_of(self.crosshair_3d)
+        self.update_oblique_view()
+
+    def update_oblique_view(self):
+        if not self.oblique_enabled or self.brain_volume is None or self.template_volume is None:
             return
-        brain_3d = self.brain_data.get_fdata().astype(np.int32)
-        template_3d = self.template_data.get_fdata()
-        z, y, x = self.current_positions
-        brain_shape = self.brain_data.shape
-        x = min(max(x, 0), brain_shape[0] - 1)
-        y = min(max(y, 0), brain_shape[1] - 1)
-        z = min(max(z, 0), brain_shape[2] - 1)
-        axial_slice = brain_3d[:, :, z].T
-        coronal_slice = brain_3d[:, y, :].T
-        sagittal_slice = brain_3d[x, :, :].T
-        axial_template = template_3d[:, :, z].T
-        coronal_template = template_3d[:, y, :].T
-        sagittal_template = template_3d[x, :, :].T
-        highlight_region = self.current_target if self.consecutive_errors >= 3 and self.game_mode == "Practice" else None
+        plane = self.get_oblique_plane()
+        with PERF.stage("extract_slices", "Oblique"):
+            centre = plane.centre(self.oblique_depth)
+            labels = plane.sample_labels(self.brain_volume, centre)
+            template = plane.sample_linear(self.template_volume, centre)
+        highlight_region = self.highlighted_region()
         colormap = self.colormap if self.use_colored_atlas else None
-        self.slice_views[0].update_slice(axial_slice, axial_template, colormap, highlight_region, self.show_atlas)
-        self.slice_views[1].update_slice(coronal_slice, coronal_template, colormap, highlight_region, self.show_atlas)
-        self.slice_views[2].update_slice(sagittal_slice, sagittal_template, colormap, highlight_region, self.show_atlas)
-        voxel_x, voxel_y, voxel_z = self.crosshair_3d
-        for view in self.slice_views:
-            view.set_crosshair_3d(voxel_x, voxel_y, voxel_z)
+        edges = slice_edges(labels) if self.display_mode == "outline" and self.show_atlas else None
+        heat = self.get_heat_points()
+        overlay = (oblique_heat(*heat, plane, centre), self.heat_palette) if heat is not None else None
+        view = self.slice_views[3]
+        view.update_slice(labels, template, colormap, highlight_region, self.show_atlas, edges, overlay)
+        view.crosshair_pos = plane.project(self.crosshair_3d, centre)
+        view.update()
+
+    def toggle_heatmap(self, state):
+        self.show_heatmap = (state == Qt.Checked)
+        self.update_all_slices()
+
+    def get_heatmap(self):
+        """Click heatmap of the loaded atlas and level; the previous one is saved when they change."""
+        key = (self.record_key(self.current_atlas, self.region_level), self.brain_volume.shape)
+        if self.heatmap is None or self.heatmap_key != key:
+            self.save_heatmap()
+            self.heatmap = ClickHeatmap(key[0], key[1], self.heatmap_root)
+            self.heatmap_key = key
+        return self.heatmap
+
+    def save_heatmap(self):
+        if self.heatmap is not None:
+            self.heatmap.save_session()
+
+    def get_heat_points(self):
+        """Missed clicks for the current target as (voxels, counts), or None when the overlay is off."""
+        if not self.show_heatmap or self.current_target is None or self.brain_volume is None:
+            return None
+        heatmap = self.get_heatmap()
+        key = (self.heatmap_key, self.load_generation, self.current_target, heatmap.version)
+        if self.heat_points_key != key:
+            points, counts = heatmap.target_points(self.current_target)
+            missed = self.brain_volume[points[:, 0], points[:, 1], points[:, 2]] != self.current_target
+            self.heat_points = (points[missed], counts[missed])
+            self.heat_points_key = key
+        return self.heat_points
+
+    def get_edge_maps(self):
+        """Outline edge maps of the displayed labels, rebuilt only when the atlas or level changes."""
+        key = (self.load_generation, self.region_level)
+        if self.edge_maps is None or self.edge_maps_key != key:
+            self.edge_maps = EdgeMaps(self.brain_volume)
+            self.edge_maps_key = key
+        return self.edge_maps
 
     def select_new_target(self):
         if self.game_mode == "Contre la Montre":
@@ -1064,7 +1835,7 @@ class NeuroGuessrGame(QMainWindow):
                 return
             self.current_target = self.remaining_regions.pop(0)
         else:
-            valid_regions = [int(val) for val in np.unique(self.brain_data.get_fdata().astype(np.int32))
+            valid_regions = [int(val) for val in unique_labels(self.brain_volume)
                             if val > 0 and val in self.region_map]
             if not valid_regions:
                 QMessageBox.warning(self, "Error", "No valid regions found.")
@@ -1081,12 +1852,84 @@ class NeuroGuessrGame(QMainWindow):
         self.consecutive_errors = 0
         for view in self.slice_views:
             view.stop_blinking()
+        self.distance_maps.prefetch(self.current_target)
         self.update_memo_content()
+        self.update_minimap()
+        if self.game_mode == "Name It":
+            self.show_region_to_name()
+        if self.show_heatmap:
+            self.update_all_slices()
 
-    def handle_slice_click(self, x, y, plane_index):
-        if not self.game_running or not self.brain_data:
+    def show_region_to_name(self):
+        """Move the crosshair into the target and make it blink."""
+        self.target_label.setText("Name the blinking region")
+        voxel = label_voxel(self.brain_volume, self.current_target)
+        if voxel is not None:
+            x, y, z = voxel
+            self.crosshair_3d = (x, y, z)
+            self.current_positions = [z, y, x]
+            for slider, value in ((self.z_slider, z), (self.y_slider, y), (self.x_slider, x)):
+                slider.blockSignals(True)
+                slider.setValue(value)
+                slider.blockSignals(False)
+            if self.oblique_enabled:
+                self.oblique_depth = self.get_oblique_plane().depth_of(self.crosshair_3d)
+        for view in self.slice_views:
+            view.start_blinking()
+        self.update_all_slices()
+        self.name_input.setFocus()
+
+    def update_name_matches(self, text):
+        """Refill the suggestions for the typed answer; runs on every keystroke."""
+        self.record_trace("type", text)
+        self.name_matches.clear()
+        if self.name_index is None or not text.strip():
             return
-        brain_shape = self.brain_data.shape
+        with PERF.stage("name_search"):
+            matches = self.name_index.search(text)
+        for label, _ in matches:
+            # The LUT name, even when an alias matched: it is the answer being checked.
+            item = QListWidgetItem(self.region_map.get(label, str(label)))
+            item.setData(Qt.UserRole, label)
+            self.name_matches.addItem(item)
+        self.name_matches.setCurrentRow(0)
+
+    def submit_typed_name(self):
+        item = self.name_matches.currentItem()
+        if item is not None:
+            self.submit_name(item.data(Qt.UserRole))
+
+    def submit_name(self, label):
+        if not self.game_running or self.game_mode != "Name It":
+            return
+        self.record_trace("name", int(label))
+        target_name = self.region_map.get(self.current_target, "Unknown")
+        answer_name = self.region_map.get(label, "Unknown")
+        self.name_input.clear()
+        self.name_matches.clear()
+        if label == self.current_target:
+            self.score += 1
+            self.correct_guesses.append(target_name)
+            self.score_label.setText(f"Named: {self.score}")
+            QMessageBox.information(self, "Correct!", f"That's the {target_name}!")
+            self.select_new_target()
+            return
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.incorrect_guesses.append((target_name, answer_name, None))
+        self.error_label.setText(f"Errors: {self.errors}")
+        if self.consecutive_errors >= 3:
+            QMessageBox.warning(self, "Incorrect", f"Not the {answer_name}.\nThis is the {target_name}.")
+            self.select_new_target()
+        else:
+            QMessageBox.warning(self, "Incorrect", f"Not the {answer_name}. Try again!")
+
+    def slice_to_voxel(self, x, y, plane_index):
+        """Map a pixel of one slice view to (x, y, z) voxel indices."""
+        brain_shape = self.brain_volume.shape
+        if plane_index == 3:
+            plane = self.get_oblique_plane()
+            return plane.voxel_at(x, y, plane.centre(self.oblique_depth))
         if plane_index == 0:
             voxel_x = min(max(x, 0), brain_shape[0] - 1)
             voxel_y = min(max(y, 0), brain_shape[1] - 1)
@@ -1099,32 +1942,56 @@ class NeuroGuessrGame(QMainWindow):
             voxel_x = self.current_positions[2]
             voxel_y = min(max(x, 0), brain_shape[1] - 1)
             voxel_z = min(max(y, 0), brain_shape[2] - 1)
+        return voxel_x, voxel_y, voxel_z
+
+    def handle_slice_click(self, x, y, plane_index):
+        self.record_trace("drag" if self.slice_views[plane_index].dragging else "click", x, y, plane_index)
+        if not self.game_running or self.brain_volume is None:
+            return
+        voxel_x, voxel_y, voxel_z = self.slice_to_voxel(x, y, plane_index)
+        oblique_depth = self.oblique_depth
         self.current_positions = [voxel_z, voxel_y, voxel_x]
         self.z_slider.setValue(voxel_z)
         self.y_slider.setValue(voxel_y)
         self.x_slider.setValue(voxel_x)
         self.selected_position = (voxel_x, voxel_y, voxel_z)
         self.crosshair_3d = (voxel_x, voxel_y, voxel_z)
+        if plane_index == 3:
+            # Keep the plane where it was instead of snapping it onto the rounded voxel.
+            self.oblique_depth = oblique_depth
         self.update_all_slices()
+        self.update_cross_atlas_label()
+        if self.game_mode == "Name It":
+            return
         self.guess_button.setEnabled(True)
         self.guess_button.setText("Confirm Guess")
-        self.guess_button.setStyleSheet("font-size: 16px; padding: 10px; background-color: #FFFFFF; font-weight: bold;")  ##4CAF50
+        restyle(self.guess_button, "picked", True)
 
     def validate_guess(self):
-        if not self.selected_position or not self.game_running:
+        if not self.selected_position or not self.game_running or self.game_mode == "Name It":
             return
+        self.record_trace("guess")
         voxel_x, voxel_y, voxel_z = self.selected_position
-        brain_data = self.brain_data.get_fdata().astype(np.int32)
         try:
-            clicked_region = int(brain_data[voxel_x, voxel_y, voxel_z])
+            clicked_region = int(self.brain_volume[voxel_x, voxel_y, voxel_z])
         except IndexError:
             clicked_region = 0
+        self.get_heatmap().add(self.current_target, self.selected_position)
         target_name = self.region_map.get(self.current_target, "Unknown")
         clicked_name = self.region_map.get(clicked_region, "Background/Unknown")
+        probability_text = ""
+        if self.probabilistic_scoring and self.region_level == FINE_LEVEL:
+            probability = self.prob_atlas.probability(self.current_target, self.selected_position)
+            self.probability_score += probability
+            is_correct = probability >= PROBABILITY_PASS
+            probability_text = f"\nProbability of {target_name} here: {probability * 100:.0f}%"
+        else:
+            is_correct = clicked_region == self.current_target
         
-        if clicked_region == self.current_target:
+        if is_correct:
             self.score += 1
             self.correct_guesses.append(target_name)
+            self.near_miss_credit.pop(self.current_target, None)
             if self.game_mode == "Practice":
                 self.score_label.setText(f"Correct: {self.score}")
             elif self.game_mode == "Streak":
@@ -1132,9 +1999,9 @@ class NeuroGuessrGame(QMainWindow):
                 self.score_label.setText(f"Streak: {self.score}")
             elif self.game_mode == "Contre la Montre":
                 self.score_label.setText(f"Regions Found: {self.score}/{len(self.all_regions)}")
-            QMessageBox.information(self, "Correct!", f"You found the {target_name}!")
+            QMessageBox.information(self, "Correct!", f"You found the {target_name}!{probability_text}")
             self.guess_button.setEnabled(False)
-            self.guess_button.setStyleSheet("font-size: 16px; padding: 10px; background-color: #FFFFFF;")
+            restyle(self.guess_button, "picked", False)
             self.consecutive_errors = 0
             for view in self.slice_views:
                 view.stop_blinking()
@@ -1145,23 +2012,32 @@ class NeuroGuessrGame(QMainWindow):
         else:
             self.errors += 1
             self.consecutive_errors += 1
-            self.incorrect_guesses.append((target_name, clicked_name))
+            distance = self.distance_maps.distance_mm(self.current_target, self.selected_position)
+            self.incorrect_guesses.append((target_name, clicked_name, distance))
             self.error_label.setText(f"Errors: {self.errors}")
+            miss_text = f"\nYou were {distance:.0f} mm away." if distance is not None else ""
+            miss_text += probability_text
             if self.game_mode == "Practice":
                 self.score_label.setText(f"Correct: {self.score}")
                 if self.consecutive_errors >= 3:
-                    QMessageBox.warning(self, "Incorrect", f"That's the {clicked_name}.\nFind the {target_name}.\nThe correct region is now blinking!")
+                    QMessageBox.warning(self, "Incorrect", f"That's the {clicked_name}.\nFind the {target_name}.{miss_text}\nThe correct region is now blinking, and the map shows where it lies.")
                     for view in self.slice_views:
                         view.start_blinking()
+                    self.update_minimap()
                 else:
-                    QMessageBox.warning(self, "Incorrect", f"That's the {clicked_name}.\nFind the {target_name}.")
+                    QMessageBox.warning(self, "Incorrect", f"That's the {clicked_name}.\nFind the {target_name}.{miss_text}")
             elif self.game_mode == "Streak":
                 self.end_game()
             else:
+                credit = near_miss_credit(distance)
+                if credit > self.near_miss_credit.get(self.current_target, 0.0):
+                    self.near_miss_credit[self.current_target] = credit
                 self.score_label.setText(f"Regions Found: {self.score}/{len(self.all_regions)}")
-                QMessageBox.warning(self, "Incorrect", f"That's the {clicked_name}.\nFind the {target_name}.")
+                if credit > 0:
+                    miss_text += f" Near miss: +{credit:.2f}"
+                QMessageBox.warning(self, "Incorrect", f"That's the {clicked_name}.\nFind the {target_name}.{miss_text}")
             self.guess_button.setEnabled(True)
-            self.guess_button.setStyleSheet("font-size: 16px; padding: 10px; background-color: #FFFFFF;")
+            restyle(self.guess_button, "picked", False)
 
     def update_timer(self):
         if self.game_mode != "Contre la Montre":
@@ -1174,84 +2050,98 @@ class NeuroGuessrGame(QMainWindow):
     def end_game(self):
         self.game_running = False
         self.game_timer.stop()
+        self.save_heatmap()
+        record_atlas = self.record_key(self.current_atlas, self.region_level)
         
         if self.game_mode in ["Practice", "Contre la Montre"]:
             if self.score > 0:
                 accuracy = (self.score / (self.score + self.errors)) * 100
             else:
                 accuracy = 0.0 if self.errors > 0 else 100.0
-            color_mode = "colored" if self.use_colored_atlas else "non_colored"
-            current_pr = self.pr_data.get(self.current_atlas, {
-                "colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0},
-                "non_colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}
-            })[color_mode]
+            color_mode = self.display_mode
+            current_pr = self.get_pr(record_atlas, color_mode)
             
             if accuracy > current_pr["best_ratio"]:
-                self.pr_data[self.current_atlas][color_mode]["best_ratio"] = accuracy
-                self.save_pr()
+                self.records.update(record_atlas, color_mode, best_ratio=accuracy)
                 self.update_pr_label()
                 if accuracy == 100.0:
-                    QMessageBox.information(self, "Perfect Run!", f"Perfect run with 100% accuracy for {self.current_atlas} ({color_mode})!")
+                    QMessageBox.information(self, "Perfect Run!", f"Perfect run with 100% accuracy for {record_atlas} ({color_mode})!")
                 else:
-                    QMessageBox.information(self, "New Accuracy Record!", f"New best accuracy for {self.current_atlas} ({color_mode}): {accuracy:.1f}%!")
+                    QMessageBox.information(self, "New Accuracy Record!", f"New best accuracy for {record_atlas} ({color_mode}): {accuracy:.1f}%!")
         else:
             accuracy = 0.0
         
         if self.game_mode == "Contre la Montre":
             if self.errors == 0:
                 current_time = self.total_time
-                color_mode = "colored" if self.use_colored_atlas else "non_colored"
-                current_pr = self.pr_data.get(self.current_atlas, {
-                    "colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0},
-                    "non_colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}
-                })[color_mode]
+                color_mode = self.display_mode
+                current_pr = self.get_pr(record_atlas, color_mode)
                 if current_time < current_pr["time"]:
-                    self.pr_data[self.current_atlas][color_mode]["time"] = current_time
-                    self.save_pr()
+                    self.records.update(record_atlas, color_mode, time=current_time)
                     self.update_pr_label()
                     QMessageBox.information(self, "New Personal Record!",
-                                            f"New PR for {self.current_atlas} ({color_mode}): {current_time // 60}'{current_time % 60:02d} \" !")
+                                            f"New PR for {record_atlas} ({color_mode}): {current_time // 60}'{current_time % 60:02d} \" !")
             recap = f"Game Over!\n\nAll regions found in {self.total_time} seconds.\n"
             recap += f"Accuracy: {accuracy:.1f}%\n"
+            recap += f"Score with near misses: {self.score + sum(self.near_miss_credit.values()):.1f}/{len(self.all_regions)}\n"
+            recap += self.format_probability_score()
             recap += f"Errors: {self.errors}\n"
             if self.incorrect_guesses:
-                recap += "Incorrect guesses:\n" + "\n".join([f"- Looked for {target}, clicked {clicked}"
-                                                           for target, clicked in self.incorrect_guesses])
+                recap += "Incorrect guesses:\n" + self.format_incorrect_guesses()
             else:
                 recap += "No errors."
         elif self.game_mode == "Streak":
-            color_mode = "colored" if self.use_colored_atlas else "non_colored"
-            current_pr = self.pr_data.get(self.current_atlas, {
-                "colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0},
-                "non_colored": {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}
-            })[color_mode]
+            color_mode = self.display_mode
+            current_pr = self.get_pr(record_atlas, color_mode)
             if self.score > current_pr["best_streak"]:
-                self.pr_data[self.current_atlas][color_mode]["best_streak"] = self.score
-                self.save_pr()
+                self.records.update(record_atlas, color_mode, best_streak=self.score)
                 self.update_pr_label()
-                QMessageBox.information(self, "New Streak Record!", f"New best streak for {self.current_atlas} ({color_mode}): {self.score}!")
+                QMessageBox.information(self, "New Streak Record!", f"New best streak for {record_atlas} ({color_mode}): {self.score}!")
             recap = f"Game Over!\n\nStreak: {self.score}\n"
+            recap += self.format_probability_score()
             if self.correct_guesses:
                 recap += "Regions found:\n" + "\n".join([f"- {region}" for region in self.correct_guesses])
             else:
                 recap += "No regions found."
+        elif self.game_mode == "Name It":
+            recap = f"Game Over!\n\nRegions named: {self.score}\nErrors: {self.errors}\n"
+            if self.incorrect_guesses:
+                recap += "Wrong names:\n" + "\n".join(f"- {target}, answered {answer}"
+                                                       for target, answer, _ in self.incorrect_guesses)
+            else:
+                recap += "No errors."
         else:
             recap = f"Practice Ended!\n\nCorrect Guesses: {self.score}\n"
             recap += f"Accuracy: {accuracy:.1f}%\n"
+            recap += self.format_probability_score()
             if self.correct_guesses:
                 recap += "Regions found:\n" + "\n".join([f"- {region}" for region in self.correct_guesses]) + "\n\n"
             else:
                 recap += "No regions found.\n\n"
             recap += f"Errors: {self.errors}\n"
             if self.incorrect_guesses:
-                recap += "Incorrect guesses:\n" + "\n".join([f"- Looked for {target}, clicked {clicked}"
-                                                           for target, clicked in self.incorrect_guesses])
+                recap += "Incorrect guesses:\n" + self.format_incorrect_guesses()
             else:
                 recap += "No errors."
         QMessageBox.information(self, "Game Over", recap)
         self.reset_game_ui()
         self.stacked_widget.setCurrentWidget(self.landing_widget)
 
+    def format_probability_score(self):
+        if not self.probabilistic_scoring or self.region_level != FINE_LEVEL:
+            return ""
+        guesses = self.score + self.errors
+        return f"Probability score: {self.probability_score:.2f}/{guesses}\n"
+
+    def format_incorrect_guesses(self):
+        lines = []
+        for target, clicked, distance in self.incorrect_guesses:
+            line = f"- Looked for {target}, clicked {clicked}"
+            if distance is not None:
+                line += f" ({distance:.0f} mm away)"
+            lines.append(line)
+        return "\n".join(lines)
+
     def show_help(self):
         if self.game_mode == "Practice":
             QMessageBox.information(self, "How to Play",
@@ -1266,6 +2156,12 @@ class NeuroGuessrGame(QMainWindow):
                                     "3. Find all regions in the atlas as quickly as possible\n4. Click or drag to move the crosshair\n"
                                     "5. Press Space or click 'Confirm Guess'\n6. Toggle atlas visibility with 'Show Atlas Regions' checkbox\n"
                                     "7. Results show time taken and errors at the end!")
+        elif self.game_mode == "Name It":
+            QMessageBox.information(self, "How to Play",
+                                    "Name It:\n1. Select an atlas and coloration mode\n2. Choose 'Name It' mode\n"
+                                    "3. A region blinks in the views\n4. Type its name; suggestions appear as you type\n"
+                                    "5. Press Enter or click a suggestion to answer (arrow keys pick another)\n"
+                                    "6. After three wrong answers the name is shown\n7. Return to menu to end!")
         else:
             QMessageBox.information(self, "How to Play",
                                     "Streak:\n1. Select an atlas and coloration mode\n2. Choose 'Streak' mode\n"
@@ -1274,13 +2170,35 @@ class NeuroGuessrGame(QMainWindow):
                                     "7. Game ends on the first error!")
 
     def show_menu(self):
+        self.finish_trace()
+        self.save_heatmap()
         self.game_running = False
         self.game_timer.stop()
         self.reset_game_ui()
         self.stacked_widget.setCurrentWidget(self.landing_widget)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="NeuroGuessr")
+    parser.add_argument("--perf-log", metavar="JSON", help="record per-stage render timings and write them to JSON on exit")
+    parser.add_argument("--record-trace", nargs="?", const="", metavar="PATH",
+                        help="record input traces for replay.py (default: ~/.neuroguessr/traces/)")
+    parser.add_argument("--startup-log", metavar="JSON", help="write the startup milestones to JSON once the first slice is shown")
+    parser.add_argument("--startup-budget", nargs=2, type=float, metavar=("LANDING_MS", "SLICE_MS"),
+                        help="warn when the landing page, or the first slice after Play, takes longer")
+    parser.add_argument("--startup-check", action="store_true",
+                        help="click Play as soon as the landing page is visible, quit after the first slice; "
+                             "exits non-zero when over --startup-budget")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="total size of the in-memory caches before the least valuable entries are evicted")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="profile for 4 GB machines: smaller budget, run-length encoded atlases, volumes left memory-mapped")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    MEMORY.configure(args.memory_budget, args.low_memory)
+    if args.perf_log:
+        PERF.enabled = True
+        PERF.log_path = args.perf_log
+        app.aboutToQuit.connect(lambda: PERF.dump(args.perf_log))
     app.setStyle("Fusion")
     dark_palette = QPalette()
     dark_palette.setColor(QPalette.Window, QColor(53, 53, 53))
@@ -1296,6 +2214,26 @@ if __name__ == "__main__":
     dark_palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
     dark_palette.setColor(QPalette.HighlightedText, QColor(0, 0, 0))
     app.setPalette(dark_palette)
+    apply_app_style(app)
+    STARTUP.log_path = args.startup_log
+    if args.startup_budget:
+        STARTUP.budgets = {"landing_visible": args.startup_budget[0], "first_slice": args.startup_budget[1]}
     game = NeuroGuessrGame()
+    if args.startup_check:
+        STARTUP.hooks["landing_visible"] = lambda: QTimer.singleShot(0, game.start_game_from_landing)
+
+        def finish_startup_check():
+            game.stop_background_work()
+            app.exit(1 if STARTUP.over_budget() else 0)
+
+        # Leave the paint that reached the milestone before tearing down.
+        STARTUP.hooks["first_slice"] = lambda: QTimer.singleShot(0, finish_startup_check)
+    if args.record_trace is not None:
+        game.record_traces = True
+        game.trace_path = args.record_trace or None
+        app.aboutToQuit.connect(game.finish_trace)
+    app.aboutToQuit.connect(game.stop_background_work)
+    app.aboutToQuit.connect(game.records.close)
+    app.aboutToQuit.connect(game.save_heatmap)
     game.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,122 @@
+import numpy as np
+from rle_volume import RLEVolume
+
+def rotation(yaw_deg, pitch_deg):
+    """Rotation that tilts the axial plane by pitch (about x), then turns it by yaw (about z)."""
+    yaw, pitch = np.radians(yaw_deg), np.radians(pitch_deg)
+    rz = np.array([[np.cos(yaw), -np.sin(yaw), 0], [np.sin(yaw), np.cos(yaw), 0], [0, 0, 1]])
+    rx = np.array([[1, 0, 0], [0, np.cos(pitch), -np.sin(pitch)], [0, np.sin(pitch), np.cos(pitch)]])
+    return rz @ rx
+
+def flat_view(volume):
+    """1D view of a volume plus its per-axis element strides; copies only non-contiguous arrays."""
+    if not (volume.flags.c_contiguous or volume.flags.f_contiguous):
+        volume = np.ascontiguousarray(volume)
+    return volume.ravel(order='K'), np.array(volume.strides[:3]) // volume.itemsize
+
+class ObliquePlane:
+    """An arbitrary plane through a volume, sampled on a square grid in voxel space.
+
+    The plane is placed by its depth along the normal, measured from the volume
+    centre. The in-plane offset grid depends only on the orientation and the
+    voxel spacing, so it is cached; translating the plane only adds the centre.
+    """
+
+    def __init__(self, shape, zooms=(1.0, 1.0, 1.0)):
+        self.shape = np.array(shape[:3])
+        zooms = np.asarray(zooms[:3], dtype=np.float64)
+        self.step = zooms.min() / zooms  # one sample per finest voxel spacing, in voxel units
+        self.size = int(np.ceil(np.linalg.norm(self.shape * zooms) / zooms.min()))
+        self.origin = (self.shape - 1) / 2.0
+        self.yaw = 0.0
+        self.pitch = 0.0
+        self._grid = None
+        self._grid_key = None
+
+    def set_orientation(self, yaw_deg, pitch_deg):
+        self.yaw, self.pitch = float(yaw_deg), float(pitch_deg)
+
+    def axes(self):
+        """(u, v, normal) in voxel units: columns, rows and the plane normal."""
+        r = rotation(self.yaw, self.pitch)
+        return r[:, 0] * self.step, r[:, 1] * self.step, r[:, 2] * self.step
+
+    def grid(self):
+        """(3, size, size) voxel offsets from the plane centre, cached per orientation."""
+        key = (self.yaw, self.pitch)
+        if self._grid_key != key:
+            u, v, _ = self.axes()
+            t = np.arange(self.size, dtype=np.float32) - (self.size - 1) / 2.0
+            self._grid = (u.astype(np.float32)[:, None, None] * t[None, None, :] +
+                          v.astype(np.float32)[:, None, None] * t[None, :, None])
+            self._grid_key = key
+        return self._grid
+
+    def centre(self, depth):
+        """Voxel position of the slice centre for a plane depth in sample steps."""
+        _, _, normal = self.axes()
+        return (self.origin + depth * normal).astype(np.float32)
+
+    def depth_of(self, voxel):
+        """Depth of the parallel plane that passes through a voxel."""
+        _, _, normal = self.axes()
+        return float((np.asarray(voxel, dtype=np.float64) - self.origin) @ normal / (normal @ normal))
+
+    def sample_labels(self, volume, centre):
+        """Nearest-neighbour label slice; outside the volume reads as 0."""
+        coords = np.rint(self.grid() + np.asarray(centre, dtype=np.float32)[:, None, None]).astype(np.intp)
+        inside = np.all(coords.astype(np.uintp) < self.shape[:, None, None].astype(np.uintp), axis=0)
+        out = np.zeros(inside.shape, dtype=volume.dtype)
+        if isinstance(volume, RLEVolume):
+            out[inside] = volume[tuple(coords[:, inside])]
+            return out
+        flat, strides = flat_view(volume)
+        index = np.tensordot(strides, coords, axes=1)
+        out[inside] = flat[index[inside]]
+        return out
+
+    def sample_linear(self, volume, centre):
+        """Trilinearly interpolated slice; outside the volume reads as 0."""
+        coords = self.grid() + np.asarray(centre, dtype=np.float32)[:, None, None]
+        base = np.floor(coords)
+        frac = coords - base
+        base = base.astype(np.intp)
+        inside = np.all(base.astype(np.uintp) < (self.shape - 1)[:, None, None].astype(np.uintp), axis=0)
+        flat, strides = flat_view(volume)
+        index = np.tensordot(strides, base, axes=1)[inside]
+        fx, fy, fz = frac[0][inside], frac[1][inside], frac[2][inside]
+        sx, sy, sz = (int(step) for step in strides)
+        # Separable blend: along z, then y, then x.
+        corner = lambda offset: flat[index + offset].astype(np.float32)
+        c00 = corner(0) + fz * (corner(sz) - corner(0))
+        c01 = corner(sy) + fz * (corner(sy + sz) - corner(sy))
+        c10 = corner(sx) + fz * (corner(sx + sz) - corner(sx))
+        c11 = corner(sx + sy) + fz * (corner(sx + sy + sz) - corner(sx + sy))
+        c0 = c00 + fy * (c01 - c00)
+        c1 = c10 + fy * (c11 - c10)
+        out = np.zeros(inside.shape, dtype=np.float32)
+        out[inside] = c0 + fx * (c1 - c0)
+        return out
+
+    def voxel_at(self, col, row, centre):
+        """Voxel index under a pixel of the sampled slice, clipped to the volume."""
+        point = np.rint(self.grid()[:, row, col] + centre).astype(int)
+        return tuple(int(c) for c in np.clip(point, 0, self.shape - 1))
+
+    def project(self, voxel, centre):
+        """(col, row) of the pixel closest to a voxel, for drawing the crosshair."""
+        u, v, _ = self.axes()
+        d = np.asarray(voxel, dtype=np.float64) - centre
+        half = (self.size - 1) / 2.0
+        col = d @ u / (u @ u) + half
+        row = d @ v / (v @ v) + half
+        return int(round(col)), int(round(row))
+
+    def project_points(self, points, centre):
+        """(cols, rows, depths) of many voxels: nearest pixel and distance from the plane in samples."""
+        u, v, normal = self.axes()
+        d = np.asarray(points, dtype=np.float64) - centre
+        half = (self.size - 1) / 2.0
+        cols = np.rint(d @ u / (u @ u) + half).astype(np.intp)
+        rows = np.rint(d @ v / (v @ v) + half).astype(np.intp)
+        return cols, rows, d @ normal / (normal @ normal)
@@ -0,0 +1,193 @@
+import os
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+import numpy as np
+
+# Log-spaced histogram bins from 10 us to 10 s, in milliseconds.
+HISTOGRAM_EDGES_MS = np.logspace(-2, 4, 61)
+
+class StageStats:
+    """Rolling window of recent durations plus a session-long log-binned histogram."""
+
+    def __init__(self, window):
+        self.recent = np.zeros(window, dtype=np.float64)
+        self.filled = 0
+        self.next = 0
+        self.histogram = np.zeros(len(HISTOGRAM_EDGES_MS) + 1, dtype=np.int64)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        self.recent[self.next] = ms
+        self.next = (self.next + 1) % len(self.recent)
+        self.filled = min(self.filled + 1, len(self.recent))
+        self.histogram[np.searchsorted(HISTOGRAM_EDGES_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def percentiles(self, *qs):
+        """Percentiles of the rolling window, for the live overlay."""
+        if self.filled == 0:
+            return [0.0 for _ in qs]
+        return list(np.percentile(self.recent[:self.filled], qs))
+
+    def session_percentiles(self, *qs):
+        """Percentiles over the whole session, read from the histogram (log-interpolated within a bin)."""
+        if self.count == 0:
+            return [0.0 for _ in qs]
+        cumulative = np.cumsum(self.histogram)
+        values = []
+        for q in qs:
+            rank = q / 100.0 * self.count
+            b = min(int(np.searchsorted(cumulative, rank, side='left')), len(self.histogram) - 1)
+            # Bin b holds durations in (edges[b - 1], edges[b]]; the outer bins are clamped to the range.
+            lo = HISTOGRAM_EDGES_MS[max(b - 1, 0)]
+            hi = HISTOGRAM_EDGES_MS[min(b, len(HISTOGRAM_EDGES_MS) - 1)]
+            below = cumulative[b] - self.histogram[b]
+            fraction = (rank - below) / self.histogram[b] if self.histogram[b] else 0.0
+            values.append(float(lo * (hi / lo) ** min(max(fraction, 0.0), 1.0)))
+        return values
+
+class _StageTimer:
+    __slots__ = ("monitor", "stage", "started")
+
+    def __init__(self, monitor, stage):
+        self.monitor = monitor
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.monitor.record(self.stage, (time.perf_counter() - self.started) * 1000.0)
+        return False
+
+_DISABLED = nullcontext()
+
+class PerfMonitor:
+    """Per-stage render timings. While disabled, stage() hands back a shared no-op context."""
+
+    def __init__(self, window=256):
+        self.enabled = False
+        self.log_path = None
+        self.window = window
+        self.stages = {}
+        self.frames = deque()
+        self.session_start = time.time()
+
+    def stage(self, name, view=None):
+        if not self.enabled:
+            return _DISABLED
+        return _StageTimer(self, f"{name}/{view}" if view else name)
+
+    def record(self, stage, ms):
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats(self.window)
+        stats.add(ms)
+
+    def frame(self):
+        """Count one completed redraw for the renders-per-second figure."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frames.append(now)
+        while self.frames and now - self.frames[0] > 1.0:
+            self.frames.popleft()
+
+    def renders_per_second(self):
+        now = time.perf_counter()
+        while self.frames and now - self.frames[0] > 1.0:
+            self.frames.popleft()
+        return len(self.frames)
+
+    def summary_lines(self):
+        lines = [f"{'stage':<24}{'p50 ms':>9}{'p95 ms':>9}{'n':>7}"]
+        for stage in sorted(self.stages):
+            stats = self.stages[stage]
+            p50, p95 = stats.percentiles(50, 95)
+            lines.append(f"{stage:<24}{p50:>9.2f}{p95:>9.2f}{stats.count:>7}")
+        lines.append(f"renders/s: {self.renders_per_second()}")
+        return lines
+
+    def to_dict(self):
+        stages = {}
+        for stage, stats in self.stages.items():
+            p50, p95, p99 = stats.session_percentiles(50, 95, 99)
+            stages[stage] = {"count": stats.count, "mean_ms": stats.total_ms / stats.count,
+                             "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+                             "histogram": stats.histogram.tolist()}
+        return {"session_start": self.session_start, "session_end": time.time(),
+                "histogram_edges_ms": HISTOGRAM_EDGES_MS.tolist(), "stages": stages}
+
+    def dump(self, path):
+        """Write the session's timings as JSON; the file is replaced atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+PERF = PerfMonitor()
+
+class StartupTrace:
+    """Startup milestones in ms since origin: when the landing page is first painted and,
+    separately, how long the first slice takes to appear once Play is clicked."""
+
+    BUDGETED = {"landing_visible": None, "first_slice": "play"}  # milestone -> milestone it is timed from
+
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.milestones = {}
+        self.budgets = {}
+        self.log_path = None
+        self.hooks = {}
+
+    def mark(self, name):
+        """Record a milestone the first time it is reached."""
+        if name in self.milestones:
+            return
+        self.milestones[name] = (time.perf_counter() - self.origin) * 1000.0
+        if name == "first_slice":
+            self.report()
+        hook = self.hooks.get(name)
+        if hook is not None:
+            hook()
+
+    def elapsed(self, name):
+        """Duration of a budgeted milestone, or None until it (and its start) is reached."""
+        since = self.BUDGETED[name]
+        if name not in self.milestones or (since and since not in self.milestones):
+            return None
+        return self.milestones[name] - (self.milestones[since] if since else 0.0)
+
+    def over_budget(self):
+        """[(milestone, ms, budget ms)] of the milestones that missed their budget."""
+        return [(name, self.elapsed(name), budget) for name, budget in self.budgets.items()
+                if self.elapsed(name) is not None and self.elapsed(name) > budget]
+
+    def to_dict(self):
+        return {"milestones_ms": dict(self.milestones), "budgets_ms": dict(self.budgets),
+                "landing_visible_ms": self.elapsed("landing_visible"),
+                "first_slice_ms": self.elapsed("first_slice"),
+                "over_budget": [name for name, _, _ in self.over_budget()]}
+
+    def report(self):
+        landing, first_slice = self.elapsed("landing_visible"), self.elapsed("first_slice")
+        parts = [f"landing page {landing:.0f} ms" if landing is not None else "landing page not painted",
+                 f"first slice {first_slice:.0f} ms after Play" if first_slice is not None else "no slice shown"]
+        print(f"[startup] {', '.join(parts)}")
+        for name, ms, budget in self.over_budget():
+            print(f"Warning: Startup milestone {name} took {ms:.0f} ms, over its {budget:.0f} ms budget.")
+        if self.log_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, 'w') as f:
+                    json.dump(self.to_dict(), f, indent=2)
+            except OSError as e:
+                print(f"Warning: Failed to write startup trace {self.log_path}: {e}")
+
+STARTUP = StartupTrace()
@@ -0,0 +1,77 @@
+import os
+import json
+import numpy as np
+from cache_utils import atomic_save_npy
+from data_pack import open_resource, load_npy
+
+PROBABILITY_PASS = 0.25  # same threshold as the shipped *-maxprob-thr25 atlases
+
+def probability_store_path(region_file):
+    """Probability store that belongs to a LUT, e.g. data/aal.txt -> data/aal.probs."""
+    return os.path.splitext(region_file)[0] + ".probs"
+
+def write_probability_store(prob_img, store_dir):
+    """Quantize a 4D probability atlas into per-region uint8 blocks.
+
+    Volume r of the 4D image becomes label r + 1. Each region keeps only its
+    bounding box (voxels with non-zero probability), scaled so 255 == 1.0, and
+    all boxes are concatenated into one flat data.npy described by index.json.
+    """
+    shape = prob_img.shape
+    blocks, regions, offset = [], [], 0
+    for r in range(shape[3]):
+        probs = np.asanyarray(prob_img.dataobj[..., r], dtype=np.float32)
+        if probs.max() > 1.0:  # FSL atlases store percentages
+            probs = probs / 100.0
+        nonzero = np.argwhere(probs > 0)
+        if nonzero.size == 0:
+            continue
+        lo = nonzero.min(axis=0)
+        hi = nonzero.max(axis=0) + 1
+        block = np.rint(np.clip(probs[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]], 0, 1) * 255).astype(np.uint8)
+        regions.append({"label": r + 1, "lo": lo.tolist(), "shape": list(block.shape), "offset": offset})
+        blocks.append(block.ravel())
+        offset += block.size
+    os.makedirs(store_dir, exist_ok=True)
+    atomic_save_npy(os.path.join(store_dir, "data.npy"),
+                    np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.uint8))
+    with open(os.path.join(store_dir, "index.json"), 'w') as f:
+        json.dump({"shape": list(shape[:3]), "affine": prob_img.affine.tolist(), "regions": regions}, f)
+
+class ProbabilisticAtlas:
+    """Read-only view of a quantized probability store, memory-mapped from disk."""
+
+    def __init__(self, store_dir):
+        with open_resource(os.path.join(store_dir, "index.json"), 'r') as f:
+            index = json.load(f)
+        self.shape = tuple(index["shape"])
+        self.affine = np.array(index["affine"])
+        self.data = load_npy(os.path.join(store_dir, "data.npy"))
+        self.regions = {}
+        for region in index["regions"]:
+            size = int(np.prod(region["shape"]))
+            self.regions[region["label"]] = (np.array(region["lo"]), tuple(region["shape"]), region["offset"], size)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def block(self, label):
+        """(origin, uint8 block) for a label, or None when the store does not know it."""
+        entry = self.regions.get(label)
+        if entry is None:
+            return None
+        lo, shape, offset, size = entry
+        return lo, self.data[offset:offset + size].reshape(shape)
+
+    def probability(self, label, voxel):
+        """Probability in [0, 1] that voxel belongs to label."""
+        entry = self.regions.get(label)
+        if entry is None:
+            return 0.0
+        lo, shape, offset, _ = entry
+        local = np.asarray(voxel) - lo
+        if np.any(local < 0) or np.any(local >= shape):
+            return 0.0
+        flat = np.ravel_multi_index(tuple(local), shape)
+        return float(self.data[offset + flat]) / 255.0
@@ -0,0 +1,175 @@
+"""Glass-brain projections: where a region lies, seen through the whole brain at once.
+
+Every label's mask is cut to its bounding box and reduced with any() along
+each plane's slice axis, giving its axial, coronal and sagittal maximum
+intensity projections in the orientation the slice views use. The projections
+are bit-packed into one flat array with a JSON index, next to the projected
+brain silhouette, and cached on disk per atlas, region level and template.
+Drawing the minimap for any target is then a lookup.
+
+    python projections.py AAL            # build (or reuse) the cache and time a lookup
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import numpy as np
+from scipy import ndimage
+from cache_utils import get_cache_dir, file_hash, atomic_save_npy, atomic_write_json
+from rendering import PLANE_AXES, HIGHLIGHT_COLOR, _mark_edges
+from rle_volume import RLEVolume
+
+PROJECTION_VERSION = 1  # bump when the stored projections would change
+BRAIN_FILL = (40, 40, 40)
+BRAIN_OUTLINE = (150, 150, 150)
+POINT_COLOR = (255, 0, 0)
+GAP = 8  # pixels between the three projections
+
+def projection_key(files, level):
+    """Cache key of the projections of one region level; files are the atlas, LUT, hierarchy and template."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in files:
+        digest.update(file_hash(path).encode())
+    digest.update(f"{level}:{PROJECTION_VERSION}".encode())
+    return digest.hexdigest()
+
+def _project(mask, plane_index):
+    """(rows, cols) projection of a 3D mask along a plane's slice axis, as the views show it."""
+    return mask.transpose(PLANE_AXES[plane_index]).any(axis=0)
+
+def build_projections(labels, template, store_dir, cancel=None):
+    """Write every label's three projections plus the brain silhouette to store_dir.
+
+    The silhouette is template > 0 (the templates are skull-stripped), or the
+    labelled voxels when there is no template. Returns False, having written
+    nothing, when the cancel event is set before the build completes.
+    """
+    if isinstance(labels, RLEVolume):
+        boxes = labels.find_objects()
+    else:
+        boxes = ndimage.find_objects(np.asarray(labels).astype(np.int32, copy=False))
+    brain = np.asarray(template) > 0 if template is not None else np.asarray(labels) > 0
+    chunks, entries, offset = [], {}, 0
+
+    def add(key, mask, lo):
+        nonlocal offset
+        planes = []
+        for plane_index in range(3):
+            projection = _project(mask, plane_index)
+            _, row_axis, col_axis = PLANE_AXES[plane_index]
+            packed = np.packbits(projection, axis=None)
+            planes.append([int(lo[row_axis]), int(lo[col_axis])] + list(projection.shape) + [offset])
+            chunks.append(packed)
+            offset += packed.size
+        entries[key] = planes
+
+    add("brain", brain, (0, 0, 0))
+    for i, box in enumerate(boxes):
+        if cancel is not None and cancel.is_set():
+            return False
+        if box is None:
+            continue
+        label = i + 1
+        add(str(label), np.asarray(labels[box]) == label, [s.start for s in box])
+    os.makedirs(store_dir, exist_ok=True)
+    atomic_save_npy(os.path.join(store_dir, "bits.npy"),
+                    np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8))
+    atomic_write_json(os.path.join(store_dir, "index.json"), {"shape": list(labels.shape[:3]), "regions": entries})
+    return True
+
+class GlassBrain:
+    """Read-only per-label projections of one atlas level, memory-mapped from the cache."""
+
+    def __init__(self, store_dir):
+        with open(os.path.join(store_dir, "index.json"), 'r') as f:
+            index = json.load(f)
+        self.shape = tuple(index["shape"])
+        self.regions = index["regions"]
+        self.bits = np.load(os.path.join(store_dir, "bits.npy"), mmap_mode='r')
+        self.backgrounds = {}
+
+    def projection(self, key, plane_index):
+        """(row, col, bool mask) of a label's projection on one plane, or None for unknown labels."""
+        planes = self.regions.get(str(key))
+        if planes is None:
+            return None
+        row, col, h, w, offset = planes[plane_index]
+        mask = np.unpackbits(self.bits[offset:offset + (h * w + 7) // 8], count=h * w).reshape(h, w)
+        return row, col, mask.astype(bool)
+
+    def plane_shape(self, plane_index):
+        _, row_axis, col_axis = PLANE_AXES[plane_index]
+        return self.shape[row_axis], self.shape[col_axis]
+
+    def render_plane(self, label, plane_index, point=None):
+        """RGB projection of one plane: brain silhouette and outline, the label on top, and point (x, y, z) as a dot."""
+        if plane_index not in self.backgrounds:
+            background = np.zeros(self.plane_shape(plane_index) + (3,), dtype=np.uint8)
+            brain = self.projection("brain", plane_index)
+            if brain is not None:
+                background[brain[2]] = BRAIN_FILL
+                background[_mark_edges(brain[2].astype(np.uint8), (0, 1))] = BRAIN_OUTLINE
+            self.backgrounds[plane_index] = background
+        rgb = self.backgrounds[plane_index].copy()
+        region = self.projection(label, plane_index)
+        if region is not None:
+            row, col, mask = region
+            rgb[row:row + mask.shape[0], col:col + mask.shape[1]][mask] = HIGHLIGHT_COLOR
+        if point is not None:
+            _, row_axis, col_axis = PLANE_AXES[plane_index]
+            r, c = int(point[row_axis]), int(point[col_axis])
+            rgb[max(r - 1, 0):r + 2, max(c - 1, 0):c + 2] = POINT_COLOR
+        return rgb
+
+    def render(self, label, point=None):
+        """The axial, coronal and sagittal projections side by side in one RGB image."""
+        planes = [self.render_plane(label, plane_index, point) for plane_index in range(3)]
+        height = max(plane.shape[0] for plane in planes)
+        width = sum(plane.shape[1] for plane in planes) + GAP * (len(planes) - 1)
+        rgb = np.zeros((height, width, 3), dtype=np.uint8)
+        col = 0
+        for plane in planes:
+            top = (height - plane.shape[0]) // 2
+            rgb[top:top + plane.shape[0], col:col + plane.shape[1]] = plane
+            col += plane.shape[1] + GAP
+        return rgb
+
+def load_glass_brain(key, labels, template, cancel=None):
+    """Open the cached projections for key, building them from labels and template on first use.
+
+    Returns None when the cancel event interrupts the build.
+    """
+    store_dir = os.path.join(get_cache_dir("projections"), key)
+    if os.path.exists(os.path.join(store_dir, "index.json")):
+        try:
+            return GlassBrain(store_dir)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Rebuilding unreadable projection cache: {e}")
+    if not build_projections(labels, template, store_dir, cancel):
+        return None
+    return GlassBrain(store_dir)
+
+def main():
+    from atlas_registry import default_atlas_options, get_template_path
+    from volume_cache import open_volume, open_atlas_on_template
+    from hierarchy import FINE_LEVEL
+    atlas_options = default_atlas_options()
+    name = sys.argv[1] if len(sys.argv) > 1 else "AAL"
+    if name not in atlas_options:
+        sys.exit(f"Unknown atlas {name}.")
+    atlas_file, region_file = atlas_options[name]
+    template_file = get_template_path()
+    template_img, template, _ = open_volume(template_file)
+    _, labels = open_atlas_on_template(atlas_file, template_file, template_img)
+    start = time.perf_counter()
+    glass_brain = load_glass_brain(projection_key([atlas_file, region_file, template_file], FINE_LEVEL), labels, template)
+    print(f"{name}: {len(glass_brain.regions) - 1} regions, {glass_brain.bits.nbytes / 1024:.0f} KB, "
+          f"opened in {(time.perf_counter() - start) * 1000:.0f} ms")
+    label = next(key for key in glass_brain.regions if key != "brain")
+    start = time.perf_counter()
+    glass_brain.render(label)
+    print(f"minimap of label {label} drawn in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import atexit
+import threading
+from cache_utils import FileLock, atomic_write_json
+
+# How concurrent values of one field are reconciled: keep the better one.
+MERGE_RULES = {"time": min, "best_ratio": max, "best_streak": max}
+
+def new_pr_record():
+    return {"time": float("inf"), "errors": 0, "best_ratio": 0.0, "best_streak": 0}
+
+def migrate_entry(entry):
+    """Bring one atlas entry of pr.json to the {display mode: record} layout."""
+    if not isinstance(entry, dict):
+        return {}
+    if "time" in entry:  # pre display-mode files kept a single record per atlas
+        return {"colored": {"time": entry.get("time", float("inf")), "errors": entry.get("errors", 0),
+                            "best_ratio": entry.get("best_ratio", 0.0), "best_streak": entry.get("best_streak", 0)}}
+    return {mode: dict(new_pr_record(), **record) for mode, record in entry.items() if isinstance(record, dict)}
+
+def merge_record(ours, theirs):
+    merged = dict(theirs)
+    for field, value in ours.items():
+        rule = MERGE_RULES.get(field)
+        merged[field] = rule(value, theirs[field]) if rule and field in theirs else value
+    return merged
+
+class RecordStore:
+    """Personal records in pr.json, loaded per atlas on first use and written behind the GUI.
+
+    Updates are applied in memory at once and batched to disk by a background
+    thread. Each write takes a file lock, re-reads the file, merges the pending
+    records with whatever other instances saved meanwhile (best value wins) and
+    replaces the file atomically.
+    """
+
+    def __init__(self, path, flush_delay=1.0):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.flush_delay = flush_delay
+        self.records = {}
+        self.dirty = set()
+        self.snapshot = None
+        self.snapshot_key = None
+        self.mutex = threading.Lock()
+        self.file_mutex = threading.Lock()
+        self.wake = threading.Event()
+        self.closing = False
+        self.writer = None
+        atexit.register(self.close)
+
+    def read_file(self, fresh=False):
+        """Parsed pr.json, re-read only when its mtime or size changed, or always when fresh.
+
+        Coarse mtimes (HFS+, FAT, some NFS homes) can hide a same-size write by
+        another instance, so the read-merge-write under the file lock is fresh.
+        """
+        with self.file_mutex:
+            return self._read_file(fresh)
+
+    def _read_file(self, fresh=False):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return {}
+        key = (stat.st_mtime_ns, stat.st_size)
+        if fresh or key != self.snapshot_key:
+            try:
+                with open(self.path, 'r') as f:
+                    self.snapshot = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Warning: Failed to read personal records {self.path}: {e}")
+                self.snapshot = {}
+            self.snapshot_key = key
+        return self.snapshot if isinstance(self.snapshot, dict) else {}
+
+    def atlas_records(self, atlas):
+        with self.mutex:
+            if atlas not in self.records:
+                self.records[atlas] = migrate_entry(self.read_file().get(atlas, {}))
+            return self.records[atlas]
+
+    def get(self, atlas, mode):
+        """Copy of the record for an atlas and display mode (defaults when there is none)."""
+        record = self.atlas_records(atlas).get(mode)
+        return dict(record) if record else new_pr_record()
+
+    def update(self, atlas, mode, **fields):
+        records = self.atlas_records(atlas)
+        with self.mutex:
+            records[mode] = dict(records.get(mode) or new_pr_record(), **fields)
+            self.dirty.add((atlas, mode))
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_loop, name="pr-writer", daemon=True)
+            self.writer.start()
+        self.wake.set()
+
+    def write_loop(self):
+        while not self.closing:
+            self.wake.wait()
+            if self.closing:
+                break
+            # Give a burst of updates a moment to arrive, then write them together.
+            time.sleep(self.flush_delay)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self.mutex:
+            pending = {key: dict(self.records[key[0]][key[1]]) for key in self.dirty}
+            self.dirty.clear()
+        if not pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with FileLock(self.lock_path):
+                data = dict(self.read_file(fresh=True))
+                for (atlas, mode), record in pending.items():
+                    entry = migrate_entry(data.get(atlas, {}))
+                    entry[mode] = merge_record(record, entry.get(mode, new_pr_record()))
+                    data[atlas] = entry
+                atomic_write_json(self.path, data, indent=4)
+        except OSError as e:
+            print(f"Warning: Failed to save PR data: {e}")
+            with self.mutex:
+                self.dirty.update(pending)
+            return
+        with self.mutex:
+            # Adopt better records other instances wrote for the atlases we touched.
+            for atlas in {atlas for atlas, _ in pending}:
+                for mode, record in data[atlas].items():
+                    current = self.records[atlas].get(mode)
+                    self.records[atlas][mode] = merge_record(current, record) if current else dict(record)
+
+    def close(self):
+        """Stop the writer and write anything still pending."""
+        self.closing = True
+        self.wake.set()
+        if self.writer is not None and self.writer is not threading.current_thread():
+            self.writer.join(timeout=5.0)
+        self.flush()
@@ -0,0 +1,124 @@
+import time
+import numpy as np
+from memory import BudgetedCache
+from rle_volume import RLEVolume
+
+HIGHLIGHT_COLOR = (255, 255, 0)
+# Click heatmap colours, from dark red through orange to pale yellow.
+HEAT_STOPS = [(0.0, (96, 0, 0)), (0.4, (220, 30, 0)), (0.75, (255, 160, 0)), (1.0, (255, 255, 180))]
+
+def build_palette(colormap):
+    """Dense (N, 3) uint8 colour table plus a mask of the labels the colormap defines."""
+    size = int(max(colormap)) + 1 if colormap else 1
+    palette = np.zeros((size, 3), dtype=np.uint8)
+    known = np.zeros(size, dtype=bool)
+    for label, color in colormap.items():
+        if label > 0:
+            palette[int(label)] = np.clip(color, 0, 255)
+            known[int(label)] = True
+    return palette, known
+
+def heat_palette():
+    """(256, 3) palette for click heatmap levels, in the same (colours, known) form as build_palette."""
+    t = np.linspace(0.0, 1.0, 256)
+    stops = np.array([stop for stop, _ in HEAT_STOPS])
+    colors = np.array([color for _, color in HEAT_STOPS], dtype=np.float64)
+    palette = np.stack([np.interp(t, stops, colors[:, c]) for c in range(3)], axis=1).astype(np.uint8)
+    known = np.ones(256, dtype=bool)
+    known[0] = False
+    return palette, known
+
+def normalize_template(template_slice):
+    """Min-max scale a template slice to uint8 grey levels."""
+    template_slice = np.asarray(template_slice, dtype=np.float32)
+    lo = template_slice.min()
+    hi = template_slice.max()
+    return ((template_slice - lo) / (hi - lo + 1e-8) * 255).astype(np.uint8)
+
+def _blend(rgb, index_slice, palette):
+    colors, known = palette
+    in_range = (index_slice > 0) & (index_slice < len(known))
+    safe = np.where(in_range, index_slice, 0)
+    mask = in_range & known[safe]
+    rgb[mask] = ((rgb[mask].astype(np.uint16) + colors[safe[mask]]) // 2).astype(np.uint8)
+
+def colorize_slice(label_slice, template_slice, palette=None, highlight_region=None, edges=None, overlay=None):
+    """RGB image of one slice: grey template, labels blended 50/50 or drawn as outlines.
+
+    palette is the (colours, known) pair from build_palette, or None to show the
+    bare template. When edges is given only those pixels are coloured, at full
+    strength. overlay is an optional (levels, palette) pair blended on top, such
+    as a click heatmap. highlight_region is painted solid yellow.
+    """
+    grey = normalize_template(template_slice)
+    rgb = np.repeat(grey[:, :, None], 3, axis=2)
+    if palette is not None:
+        colors, known = palette
+        labels = np.asarray(label_slice)
+        in_range = (labels > 0) & (labels < len(known))
+        safe = np.where(in_range, labels, 0)
+        mask = in_range & known[safe]
+        if edges is not None:
+            mask &= edges
+            rgb[mask] = colors[safe[mask]]
+        else:
+            rgb[mask] = ((rgb[mask].astype(np.uint16) + colors[safe[mask]]) // 2).astype(np.uint8)
+    if overlay is not None:
+        _blend(rgb, *overlay)
+    if highlight_region is not None:
+        rgb[np.asarray(label_slice) == highlight_region] = HIGHLIGHT_COLOR
+    return rgb
+
+# Display orientation of each plane's slices, matching update_all_slices:
+# the packed volume is indexed [slice, row, column].
+PLANE_AXES = {0: (2, 1, 0), 1: (1, 2, 0), 2: (0, 2, 1)}
+
+def _mark_edges(labels, axes):
+    """Pixels of a label array that differ from a neighbour along any of the given axes."""
+    edges = np.zeros(labels.shape, dtype=bool)
+    for axis in axes:
+        lead = [slice(None)] * labels.ndim
+        trail = [slice(None)] * labels.ndim
+        lead[axis] = slice(1, None)
+        trail[axis] = slice(None, -1)
+        lead, trail = tuple(lead), tuple(trail)
+        differs = labels[lead] != labels[trail]
+        edges[lead] |= differs & (labels[lead] > 0)
+        edges[trail] |= differs & (labels[trail] > 0)
+    return edges
+
+def label_edges(volume, plane_index):
+    """Boolean volume of in-plane label boundaries, as [slice, row, column] for one plane."""
+    return _mark_edges(np.asarray(volume).transpose(PLANE_AXES[plane_index]), (1, 2))
+
+def slice_edges(label_slice):
+    """Label boundaries of a single resampled slice, such as the oblique view."""
+    return _mark_edges(np.asarray(label_slice), (0, 1))
+
+class EdgeMaps:
+    """Bit-packed label boundaries per plane, computed on first use and reused for every redraw."""
+
+    def __init__(self, label_volume):
+        self.label_volume = label_volume
+        self.packed = BudgetedCache("edge_maps")
+        self.widths = {}
+
+    @property
+    def nbytes(self):
+        return self.packed.nbytes
+
+    def slice_edges(self, plane_index, slice_index):
+        if isinstance(self.label_volume, RLEVolume):
+            # Never expanded whole: outline the (cached) decoded slice instead.
+            index = [slice(None)] * 3
+            index[PLANE_AXES[plane_index][0]] = slice_index
+            return slice_edges(self.label_volume[tuple(index)].T)
+        packed = self.packed.get(plane_index)
+        if packed is None:
+            start = time.perf_counter()
+            edges = label_edges(self.label_volume, plane_index)
+            self.widths[plane_index] = edges.shape[2]
+            packed = np.packbits(edges, axis=2)
+            self.packed.put(plane_index, packed, packed.nbytes, (time.perf_counter() - start) * 1000)
+        row = np.unpackbits(packed[slice_index], axis=1)
+        return row[:, :self.widths[plane_index]].astype(bool)
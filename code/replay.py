@@ -0,0 +1,140 @@
+"""Replay a recorded input trace offscreen, as fast as possible, and report frame times.
+
+    python neuroguessr.py --record-trace session.trace.json.gz   # record
+    python replay.py session.trace.json.gz --repeat 3 --json replay.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from input_trace import load_trace
+from perf import PERF
+from records import RecordStore
+
+def frame_stats(times):
+    times = np.asarray(times, dtype=np.float64)
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    return {"count": int(times.size), "mean_ms": float(times.mean()), "p50_ms": float(p50),
+            "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(times.max())}
+
+def setup_session(game, trace):
+    """Select the recorded atlas, mode, display and level on the landing page and start."""
+    from neuroguessr import DISPLAY_MODES, GAME_MODES
+    atlas_names = list(game.atlas_options)
+    if trace["atlas"] not in atlas_names:
+        raise ValueError(f"Atlas {trace['atlas']} of the trace is not available here.")
+    game.atlas_button_group.button(atlas_names.index(trace["atlas"])).setChecked(True)
+    game.mode_button_group.button(GAME_MODES.index(trace["mode"])).setChecked(True)
+    game.color_button_group.button(DISPLAY_MODES.index(trace["display_mode"])).setChecked(True)
+    game.refresh_level_options()
+    game.level_combo.setCurrentText(trace["level"])
+    game.next_seed = trace["seed"]
+    game.start_game_from_landing()
+    enabled, tilt, rotate = trace["oblique"]
+    game.oblique_sliders[0].setValue(tilt)
+    game.oblique_sliders[1].setValue(rotate)
+    game.oblique_toggle.setChecked(enabled)
+
+def apply_event(game, event):
+    kind, args = event[1], event[2:]
+    if kind == "wheel":
+        plane_index, delta = args
+        game.slice_views[plane_index].slice_changed.emit(plane_index, delta)
+    elif kind in ("click", "drag"):
+        x, y, plane_index = args
+        view = game.slice_views[plane_index]
+        view.dragging = kind == "drag"
+        view.crosshair_pos = (x, y)
+        view.slice_clicked.emit(x, y, plane_index)
+        view.dragging = False
+    elif kind == "slider":
+        plane_index, value = args
+        [game.z_slider, game.y_slider, game.x_slider][plane_index].setValue(value)
+    elif kind == "oblique":
+        enabled, tilt, rotate = args
+        game.oblique_sliders[0].setValue(tilt)
+        game.oblique_sliders[1].setValue(rotate)
+        game.oblique_toggle.setChecked(enabled)
+    elif kind == "start":
+        game.start_game()
+    elif kind == "guess":
+        game.validate_guess()
+    elif kind == "type":
+        game.name_input.setText(args[0])
+        game.update_name_matches(args[0])
+    elif kind == "name":
+        game.submit_name(args[0])
+
+def replay(trace, repeat=1):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    # Dialogs are modal and would stall the replay.
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+    from neuroguessr import NeuroGuessrGame
+    game = NeuroGuessrGame()
+    # Replayed games must not touch the player's records or click heatmaps.
+    scratch = tempfile.mkdtemp(prefix="neuroguessr-replay-")
+    game.records = RecordStore(os.path.join(scratch, "pr.json"))
+    game.heatmap_root = os.path.join(scratch, "heatmaps")
+    game.show()
+    PERF.enabled = True
+    by_kind = {}
+    all_frames = []
+    targets = []
+    for _ in range(repeat):
+        setup_session(game, trace)
+        app.processEvents()
+        run_targets = [game.current_target]
+        for event in trace["events"]:
+            start = time.perf_counter()
+            apply_event(game, event)
+            app.processEvents()  # include the repaint in the frame
+            elapsed = (time.perf_counter() - start) * 1000.0
+            by_kind.setdefault(event[1], []).append(elapsed)
+            all_frames.append(elapsed)
+            if game.current_target != run_targets[-1]:
+                run_targets.append(game.current_target)
+        targets.append(run_targets)
+        game.show_menu()
+    game.close()
+    return {
+        "atlas": trace["atlas"], "mode": trace["mode"], "events": len(trace["events"]), "repeat": repeat,
+        "deterministic": all(run == targets[0] for run in targets),
+        "frames": frame_stats(all_frames) if all_frames else None,
+        "by_event": {kind: frame_stats(times) for kind, times in by_kind.items()},
+        "stages": PERF.to_dict()["stages"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a NeuroGuessr input trace offscreen.")
+    parser.add_argument("trace", help="trace file written with neuroguessr.py --record-trace")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the trace this many times")
+    parser.add_argument("--json", help="also write the report as JSON")
+    args = parser.parse_args()
+    trace = load_trace(args.trace)
+    report = replay(trace, args.repeat)
+    print(f"{report['atlas']} / {report['mode']}: {report['events']} events x {report['repeat']}")
+    frames = report["frames"]
+    if frames:
+        print(f"frame time: p50 {frames['p50_ms']:.2f} ms, p95 {frames['p95_ms']:.2f} ms, "
+              f"p99 {frames['p99_ms']:.2f} ms, max {frames['max_ms']:.2f} ms")
+    for kind, stats in sorted(report["by_event"].items()):
+        print(f"  {kind:<8}{stats['count']:>6}  p50 {stats['p50_ms']:>7.2f}  p95 {stats['p95_ms']:>7.2f}  max {stats['max_ms']:>7.2f}")
+    for line in PERF.summary_lines()[:-1]:
+        print(f"  {line}")
+    if report["repeat"] > 1:
+        print("Targets identical across runs." if report["deterministic"] else "Warning: Targets differed between runs.")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
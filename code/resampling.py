@@ -0,0 +1,63 @@
+import os
+import numpy as np
+import nibabel as nib
+from data_pack import load_nifti
+from cache_utils import get_cache_dir, file_hash, atomic_save_npy
+
+def needs_resampling(atlas_img, template_img, atol=1e-4):
+    """True when the atlas does not already sit on the template voxel grid."""
+    return (atlas_img.shape[:3] != template_img.shape[:3]
+            or not np.allclose(atlas_img.affine, template_img.affine, atol=atol))
+
+def label_array(img):
+    """Integer label array of an image without going through float64 get_fdata()."""
+    data = np.asanyarray(img.dataobj)
+    if data.ndim != 3:
+        raise ValueError(f"Label atlas must be 3D, got shape {data.shape}.")
+    if np.issubdtype(data.dtype, np.floating):
+        data = np.rint(data)
+    return data.astype(np.int32, copy=False)
+
+def resample_labels(label_data, label_affine, target_shape, target_affine, slab_size=16):
+    """Nearest-neighbour resampling of a label volume onto a target grid, slab by slab along z."""
+    vox2vox = np.linalg.inv(label_affine) @ target_affine
+    src_shape = np.array(label_data.shape)
+    nx, ny, nz = target_shape
+    out = np.zeros(target_shape, dtype=label_data.dtype)
+    i = np.arange(nx, dtype=np.float64)[:, None, None]
+    j = np.arange(ny, dtype=np.float64)[None, :, None]
+    for k0 in range(0, nz, slab_size):
+        k = np.arange(k0, min(k0 + slab_size, nz), dtype=np.float64)[None, None, :]
+        src = []
+        valid = np.ones((nx, ny, k.shape[2]), dtype=bool)
+        for axis in range(3):
+            row = vox2vox[axis]
+            coord = np.rint(row[0] * i + row[1] * j + row[2] * k + row[3]).astype(np.intp)
+            valid &= (coord >= 0) & (coord < src_shape[axis])
+            src.append(coord)
+        slab = out[:, :, k0:k0 + k.shape[2]]
+        slab[valid] = label_data[src[0][valid], src[1][valid], src[2][valid]]
+    return out
+
+def load_resampled_atlas(atlas_file, template_file, atlas_img=None, template_img=None):
+    """Return the atlas resampled onto the template grid, using the on-disk cache when possible."""
+    if atlas_img is None:
+        atlas_img = load_nifti(atlas_file)
+    if template_img is None:
+        template_img = load_nifti(template_file)
+    key = f"{file_hash(atlas_file)}_{file_hash(template_file)}"
+    cache_file = os.path.join(get_cache_dir("resampled"), f"{key}.npy")
+    if os.path.exists(cache_file):
+        try:
+            data = np.load(cache_file, mmap_mode='r')
+            if data.shape == template_img.shape[:3]:
+                return nib.Nifti1Image(data, template_img.affine)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable resampling cache {cache_file}: {e}")
+    data = resample_labels(label_array(atlas_img), atlas_img.affine,
+                           template_img.shape[:3], template_img.affine)
+    try:
+        atomic_save_npy(cache_file, data)
+    except OSError as e:
+        print(f"Warning: Failed to write resampling cache: {e}")
+    return nib.Nifti1Image(data, template_img.affine)
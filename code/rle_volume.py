@@ -0,0 +1,271 @@
+"""Run-length encoded label volumes for atlases too fine to keep decoded in RAM.
+
+Voxels are ordered x fastest, then y, then z, and every x row is encoded as
+runs of constant label that never cross a row boundary. The volume is stored as
+two arrays, one entry per run:
+
+    ends     flat index one past the run's last voxel (uint32 when it fits)
+    values   the run's label (int32)
+
+A voxel is found with one binary search over ends. A box of rows (an axial or
+coronal slice, a distance-map ROI) expands the runs it touches with
+np.repeat. A sagittal slice takes one voxel from each row, so it is gathered
+with binary searches instead. The last few decoded slices are kept, charged to
+the shared memory budget.
+
+    python rle_volume.py ../data/aal_stride_regrid.nii.gz   # compression and decode timings
+"""
+import os
+import sys
+import time
+import numpy as np
+from memory import BudgetedCache
+from cache_utils import temp_path
+
+SLICE_CACHE_SIZE = 12  # decoded 2D slices kept, a few per view
+SLAB = 16              # z slices encoded at a time
+
+def _rows_to_runs(flat, nx, offset):
+    """(ends, values) of the runs of x rows laid end to end in flat, with ends shifted by offset."""
+    change = np.empty(flat.size, dtype=bool)
+    change[0] = True
+    np.not_equal(flat[1:], flat[:-1], out=change[1:])
+    change[::nx] = True
+    starts = np.flatnonzero(change)
+    ends = np.empty(starts.size, dtype=np.int64)
+    ends[:-1] = starts[1:]
+    ends[-1] = flat.size
+    return ends + offset, flat[starts]
+
+def _as_labels(data):
+    if np.issubdtype(data.dtype, np.floating):
+        data = np.rint(data)
+    return data.astype(np.int32, copy=False)
+
+class RLEVolume:
+    """Read-only 3D label volume stored as per-row runs; indexes like the ndarray it replaces."""
+
+    def __init__(self, shape, ends, values):
+        self.shape = tuple(int(n) for n in shape)
+        self.ends = ends
+        self.values = values
+        self.slices = BudgetedCache("rle_slices", max_items=SLICE_CACHE_SIZE)
+
+    @classmethod
+    def from_array(cls, data, slab=SLAB):
+        """Encode a 3D array (or memory map, or nibabel array proxy) a slab of z slices at a time."""
+        shape = tuple(data.shape[:3])
+        if len(data.shape) != 3:
+            raise ValueError(f"Label volume must be 3D, got shape {data.shape}.")
+        nx, ny, nz = shape
+        index_type = np.uint32 if nx * ny * nz < 2 ** 32 else np.int64
+        all_ends, all_values = [], []
+        for z0 in range(0, nz, slab):
+            block = _as_labels(np.asarray(data[:, :, z0:z0 + slab]))
+            ends, values = _rows_to_runs(block.ravel(order='F'), nx, z0 * nx * ny)
+            all_ends.append(ends.astype(index_type))
+            all_values.append(values)
+        return cls(shape, np.concatenate(all_ends), np.concatenate(all_values))
+
+    @property
+    def ndim(self):
+        return 3
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nbytes(self):
+        return self.ends.nbytes + self.values.nbytes
+
+    @property
+    def runs(self):
+        return len(self.values)
+
+    def max(self):
+        return self.values.max()
+
+    def min(self):
+        return self.values.min()
+
+    def unique(self):
+        return np.unique(self.values)
+
+    def relabel(self, lut):
+        """A new volume with every label mapped through lut (an array indexed by label)."""
+        return RLEVolume(self.shape, self.ends, np.asarray(lut)[self.values])
+
+    def run_starts(self):
+        starts = np.empty(len(self.ends), dtype=np.int64)
+        starts[0] = 0
+        starts[1:] = self.ends[:-1]
+        return starts
+
+    def find_objects(self):
+        """Bounding box slices per label like scipy.ndimage.find_objects, straight from the runs."""
+        nx, ny, _ = self.shape
+        n = int(self.values.max()) if len(self.values) else 0
+        positive = self.values > 0
+        labels = self.values[positive].astype(np.intp) - 1
+        starts = self.run_starts()[positive]
+        last = self.ends[positive].astype(np.int64) - 1
+        rows = starts // nx
+        coords = [(starts % nx, last % nx), (rows % ny, rows % ny), (rows // ny, rows // ny)]
+        lo = np.full((n, 3), np.iinfo(np.int64).max)
+        hi = np.full((n, 3), -1)
+        for axis, (first, final) in enumerate(coords):
+            np.minimum.at(lo[:, axis], labels, first)
+            np.maximum.at(hi[:, axis], labels, final)
+        return [tuple(slice(int(a), int(b) + 1) for a, b in zip(lo[i], hi[i])) if hi[i, 0] >= 0 else None
+                for i in range(n)]
+
+    def _flat(self, x, y, z):
+        nx, ny, _ = self.shape
+        return x + nx * (y + ny * z)
+
+    def _lookup(self, flat):
+        return self.values[np.searchsorted(self.ends, np.asarray(flat).astype(self.ends.dtype), side='right')]
+
+    def _expand(self, starts, length):
+        """Labels of the flat ranges [start, start + length) laid end to end."""
+        starts = starts.astype(np.int64)
+        first = np.searchsorted(self.ends, starts.astype(self.ends.dtype), side='right')
+        last = np.searchsorted(self.ends, (starts + length - 1).astype(self.ends.dtype), side='right')
+        counts = last - first + 1
+        runs = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts - first, counts)
+        range_starts = np.repeat(starts, counts)
+        run_ends = self.ends[runs].astype(np.int64)
+        run_starts = np.where(runs > 0, self.ends[np.maximum(runs - 1, 0)].astype(np.int64), 0)
+        lengths = np.minimum(run_ends, range_starts + length) - np.maximum(run_starts, range_starts)
+        return np.repeat(self.values[runs], lengths)
+
+    def _box(self, xs, ys, zs):
+        """Decoded [x0:x1, y0:y1, z0:z1] as an (x, y, z) array."""
+        (x0, x1), (y0, y1), (z0, z1) = xs, ys, zs
+        shape = (max(x1 - x0, 0), max(y1 - y0, 0), max(z1 - z0, 0))
+        if 0 in shape:
+            return np.zeros(shape, dtype=self.dtype)
+        if shape[0] == 1 and shape[1] * shape[2] > 1:
+            # One voxel per row: binary searches beat expanding whole runs.
+            y, z = np.meshgrid(np.arange(y0, y1), np.arange(z0, z1), indexing='ij')
+            return self._lookup(self._flat(x0, y, z)).reshape(shape)
+        rows = (np.arange(y0, y1)[:, None] + self.shape[1] * np.arange(z0, z1)[None, :]).ravel(order='F')
+        data = self._expand(x0 + self.shape[0] * rows, shape[0])
+        return data.reshape(shape[::-1]).transpose(2, 1, 0)
+
+    def __array__(self, dtype=None, copy=None):
+        lengths = np.diff(self.ends.astype(np.int64), prepend=0)
+        data = np.repeat(self.values, lengths).reshape(self.shape, order='F')
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        key = key + (slice(None),) * (3 - len(key))
+        if len(key) != 3 or any(k is Ellipsis or k is None for k in key):
+            return np.asarray(self)[key]
+        if all(isinstance(k, (int, np.integer)) for k in key):
+            point = [int(k) + n if k < 0 else int(k) for k, n in zip(key, self.shape)]
+            if any(not 0 <= k < n for k, n in zip(point, self.shape)):
+                raise IndexError(f"index {tuple(key)} is out of bounds for shape {self.shape}")
+            return self._lookup(self._flat(*point))
+        if any(isinstance(k, (np.ndarray, list)) for k in key):
+            if any(isinstance(k, slice) for k in key):
+                return np.asarray(self)[key]
+            index = np.broadcast_arrays(*[np.asarray(k) for k in key])
+            if any(a.dtype == bool for a in index):
+                return np.asarray(self)[key]
+            flat_index = []
+            for a, n in zip(index, self.shape):
+                a = a.astype(np.int64)
+                if a.size and (a.min() < -n or a.max() >= n):
+                    raise IndexError(f"index out of bounds for shape {self.shape}")
+                flat_index.append(np.where(a < 0, a + n, a))
+            return self._lookup(self._flat(*flat_index))
+        ranges, squeeze = [], []
+        for axis, (k, n) in enumerate(zip(key, self.shape)):
+            if isinstance(k, slice):
+                start, stop, step = k.indices(n)
+                if step != 1:
+                    return np.asarray(self)[key]
+                ranges.append((start, max(stop, start)))
+            else:
+                k = int(k) + n if k < 0 else int(k)
+                if not 0 <= k < n:
+                    raise IndexError(f"index {k} is out of bounds for axis {axis} with size {n}")
+                ranges.append((k, k + 1))
+                squeeze.append(axis)
+        cache_key = (tuple(ranges), tuple(squeeze))
+        if len(squeeze) == 1:
+            cached = self.slices.get(cache_key)
+            if cached is not None:
+                return cached
+        start = time.perf_counter()
+        data = self._box(*ranges)
+        if squeeze:
+            data = data.squeeze(axis=tuple(squeeze))
+        if len(squeeze) == 1:
+            data.flags.writeable = False
+            self.slices.put(cache_key, data, data.nbytes, (time.perf_counter() - start) * 1000)
+        return data
+
+    def save(self, path):
+        """Write the runs to .npz through a temp file so readers never see a partial file."""
+        tmp_path = temp_path(path)
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, shape=np.array(self.shape), ends=self.ends, values=self.values)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            return cls(tuple(f["shape"]), f["ends"], f["values"])
+
+def unique_labels(volume):
+    """np.unique of a label volume, without decoding run-length encoded ones."""
+    if isinstance(volume, RLEVolume):
+        return volume.unique()
+    return np.unique(volume)
+
+def label_voxel(volume, label):
+    """(x, y, z) of a voxel from the middle of a label's voxels, or None when it is absent.
+
+    Run-length encoded volumes answer from their runs without decoding.
+    """
+    if isinstance(volume, RLEVolume):
+        runs = np.flatnonzero(volume.values == label)
+        if not len(runs):
+            return None
+        run = runs[len(runs) // 2]
+        start = int(volume.ends[run - 1]) if run > 0 else 0
+        flat = (start + int(volume.ends[run]) - 1) // 2
+        return tuple(int(i) for i in np.unravel_index(flat, volume.shape, order='F'))
+    voxels = np.argwhere(np.asarray(volume) == label)
+    if not len(voxels):
+        return None
+    return tuple(int(i) for i in voxels[len(voxels) // 2])
+
+def main():
+    from data_pack import load_nifti
+    img = load_nifti(sys.argv[1])
+    start = time.perf_counter()
+    volume = RLEVolume.from_array(img.dataobj)
+    encode_ms = (time.perf_counter() - start) * 1000
+    raw = volume.size * 4
+    print(f"{volume.shape}: {volume.runs} runs, {volume.nbytes / 2 ** 20:.1f} MB "
+          f"({raw / volume.nbytes:.1f}x smaller than int32), encoded in {encode_ms:.0f} ms")
+    for name, index in (("axial", (slice(None), slice(None), volume.shape[2] // 2)),
+                        ("coronal", (slice(None), volume.shape[1] // 2, slice(None))),
+                        ("sagittal", (volume.shape[0] // 2, slice(None), slice(None)))):
+        volume.slices.clear()
+        start = time.perf_counter()
+        volume[index]
+        print(f"{name:<9} slice decoded in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Printable study sheets: every region of an atlas on its best axial, coronal and sagittal slice.
+
+The best slice of a region in a plane is the one where it covers the most
+voxels. Thumbnails are drawn with the game's colorize_slice (no window needed)
+by a process pool and cached on disk, keyed by the atlas, LUT and template
+contents; the landing page's atlas previews come from the same cache.
+
+    python study_sheets.py AAL -o sheets/            # PNGs plus sheets/AAL/index.html
+    python study_sheets.py --all -o sheets/ --pdf    # every atlas, with a PDF each
+"""
+import os
+import sys
+import json
+import html
+import zlib
+import struct
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from atlas_registry import default_atlas_options, get_template_path, read_lut
+from cache_utils import get_cache_dir, file_hash, temp_path
+from data_pack import resource_exists, open_resource
+from rendering import build_palette, colorize_slice, PLANE_AXES
+from volume_cache import open_volume, open_atlas_on_template
+
+PLANE_NAMES = ["axial", "coronal", "sagittal"]
+RENDER_VERSION = 1  # bump when thumbnails would render differently
+PREVIEW_FILE = "preview.png"
+
+def write_png(path, rgb):
+    """Write an (h, w, 3) uint8 image as an 8-bit RGB PNG."""
+    h, w = rgb.shape[:2]
+    raw = np.zeros((h, w * 3 + 1), dtype=np.uint8)  # each scanline starts with filter type 0
+    raw[:, 1:] = np.ascontiguousarray(rgb, dtype=np.uint8).reshape(h, w * 3)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    tmp_path = temp_path(path)
+    with open(tmp_path, 'wb') as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+    os.replace(tmp_path, path)
+
+def best_slices(labels, n_labels):
+    """(n_labels, 3) best (axial, coronal, sagittal) slice per label and the matching (n_labels, 3) areas.
+
+    One bincount per plane over label * n_slices + slice index gives every
+    label's area on every slice at once.
+    """
+    labels = np.asarray(labels)
+    best = np.zeros((n_labels, 3), dtype=np.intp)
+    areas = np.zeros((n_labels, 3), dtype=np.int64)
+    for plane_index in range(3):
+        axis = PLANE_AXES[plane_index][0]
+        n_slices = labels.shape[axis]
+        shape = [1, 1, 1]
+        shape[axis] = n_slices
+        keys = np.maximum(labels, 0).astype(np.int64) * n_slices + np.arange(n_slices).reshape(shape)
+        counts = np.bincount(keys.ravel(), minlength=n_labels * n_slices)[:n_labels * n_slices]
+        counts = counts.reshape(n_labels, n_slices)
+        best[:, plane_index] = counts.argmax(axis=1)
+        areas[:, plane_index] = counts.max(axis=1)
+    return best, areas
+
+def plane_slice(volume, plane_index, index):
+    """One slice oriented as the game shows it (update_all_slices)."""
+    return np.asarray(volume).transpose(PLANE_AXES[plane_index])[index]
+
+def thumbnail_key(atlas_file, region_file, template_file):
+    digest = hashlib.blake2b(digest_size=16)
+    for path in (atlas_file, region_file, template_file):
+        digest.update(file_hash(path).encode())
+    digest.update(str(RENDER_VERSION).encode())
+    return digest.hexdigest()
+
+def thumbnail_dir(atlas_file, region_file, template_file):
+    return get_cache_dir("thumbnails", thumbnail_key(atlas_file, region_file, template_file))
+
+def thumbnail_name(label, plane_index):
+    return f"region_{label}_{PLANE_NAMES[plane_index]}.png"
+
+def open_atlas(atlas_file, region_file, template_file):
+    """(labels on the template grid, template, region_map, colormap) for rendering."""
+    template_img, template, _ = open_volume(template_file)
+    _, labels = open_atlas_on_template(atlas_file, template_file, template_img)
+    region_map, colormap = read_lut(region_file)
+    return labels, template, region_map, colormap
+
+# Per-process state of the pool workers, opened once by _init_worker.
+_worker = {}
+
+def _init_worker(atlas_file, region_file, template_file):
+    labels, template, _, colormap = open_atlas(atlas_file, region_file, template_file)
+    _worker.update(labels=labels, template=template, palette=build_palette(colormap))
+
+def _render_region(task):
+    label, slices, out_dir = task
+    for plane_index, index in enumerate(slices):
+        rgb = colorize_slice(plane_slice(_worker["labels"], plane_index, index),
+                             plane_slice(_worker["template"], plane_index, index),
+                             _worker["palette"], highlight_region=label)
+        write_png(os.path.join(out_dir, thumbnail_name(label, plane_index)), rgb)
+    return label
+
+def render_preview(labels, template, colormap, path):
+    """Landing-page preview: the axial slice with the most labelled voxels, fully coloured."""
+    areas = np.count_nonzero(np.asarray(labels) > 0, axis=(0, 1))
+    z = int(areas.argmax())
+    write_png(path, colorize_slice(plane_slice(labels, 0, z), plane_slice(template, 0, z), build_palette(colormap)))
+
+def preview_path(atlas_file, region_file, template_file=None):
+    return os.path.join(thumbnail_dir(atlas_file, region_file, template_file or get_template_path()), PREVIEW_FILE)
+
+def atlas_preview(atlas_file, region_file, template_file=None):
+    """Cached preview image of an atlas, rendered on first use."""
+    template_file = template_file or get_template_path()
+    path = preview_path(atlas_file, region_file, template_file)
+    if not os.path.exists(path):
+        labels, template, _, colormap = open_atlas(atlas_file, region_file, template_file)
+        render_preview(labels, template, colormap, path)
+    return path
+
+def render_thumbnails(atlas_file, region_file, template_file=None, workers=None):
+    """Render (or reuse) every region's thumbnails; returns (cache dir, {label: (slices, areas)})."""
+    template_file = template_file or get_template_path()
+    labels, template, region_map, colormap = open_atlas(atlas_file, region_file, template_file)
+    out_dir = thumbnail_dir(atlas_file, region_file, template_file)
+    present = [int(label) for label in region_map if label > 0]
+    n_labels = max(int(np.asarray(labels).max()), max(present, default=0)) + 1
+    best, areas = best_slices(labels, n_labels)
+    regions = {label: (best[label].tolist(), areas[label].tolist()) for label in present if areas[label].max() > 0}
+    todo = [(label, slices, out_dir) for label, (slices, _) in regions.items()
+            if not all(os.path.exists(os.path.join(out_dir, thumbnail_name(label, p))) for p in range(3))]
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(atlas_file, region_file, template_file)) as pool:
+            for _ in pool.map(_render_region, todo, chunksize=max(1, len(todo) // 32)):
+                pass
+    if not os.path.exists(os.path.join(out_dir, PREVIEW_FILE)):
+        render_preview(labels, template, colormap, os.path.join(out_dir, PREVIEW_FILE))
+    return out_dir, regions
+
+def read_region_info(region_file):
+    json_file = os.path.splitext(region_file)[0] + ".json"
+    if not resource_exists(json_file):
+        return {}
+    with open_resource(json_file, 'r') as f:
+        return json.load(f)
+
+def write_index(path, atlas_name, regions, region_map, region_info):
+    """HTML index with one printable card per region."""
+    cards = []
+    for label in sorted(regions):
+        info = region_info.get(str(label), {})
+        slices, _ = regions[label]
+        images = "".join(f'<figure><img src="{thumbnail_name(label, p)}" height="200"><figcaption>{PLANE_NAMES[p]} {slices[p]}</figcaption></figure>'
+                         for p in range(3))
+        text = ""
+        for section in ("structure", "function"):
+            items = info.get(section) or []
+            if items:
+                text += f"<h3>{section.capitalize()}</h3><ul>" + "".join(f"<li>{html.escape(item)}</li>" for item in items) + "</ul>"
+        cards.append(f'<section class="card"><h2>{html.escape(str(region_map.get(label, label)))} '
+                     f'<small>#{label}</small></h2><div class="views">{images}</div>{text}</section>')
+    with open(path, 'w') as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{html.escape(atlas_name)} study sheets</title>
+<style>
+body {{font-family: Helvetica, Arial, sans-serif; margin: 2em;}}
+.card {{page-break-inside: avoid; break-inside: avoid; border-bottom: 1px solid #ccc; padding: 1em 0;}}
+.views {{display: flex; gap: 1em;}}
+figure {{margin: 0; text-align: center;}}
+img {{height: 200px; image-rendering: pixelated;}}
+small {{color: #888;}}
+</style></head><body>
+<h1>{html.escape(atlas_name)}: {len(regions)} regions</h1>
+{"".join(cards)}
+</body></html>
+""")
+
+def write_pdf(html_path, pdf_path):
+    """Print the HTML index to PDF with Qt, offscreen."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QUrl
+    from PyQt5.QtGui import QGuiApplication, QTextDocument, QImage
+    from PyQt5.QtPrintSupport import QPrinter
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+    document = QTextDocument()
+    # print_() lays out a copy of the document that cannot resolve relative
+    # image paths itself, so hand it the thumbnails up front.
+    directory = os.path.dirname(os.path.abspath(html_path))
+    for name in os.listdir(directory):
+        if name.endswith(".png"):
+            document.addResource(QTextDocument.ImageResource, QUrl(name), QImage(os.path.join(directory, name)))
+    with open(html_path, 'r') as f:
+        document.setHtml(f.read())
+    printer = QPrinter(QPrinter.HighResolution)
+    printer.setOutputFormat(QPrinter.PdfFormat)
+    printer.setOutputFileName(pdf_path)
+    document.print_(printer)
+    return app
+
+def export_atlas(atlas_name, atlas_file, region_file, output, workers=None, pdf=False):
+    cache_dir, regions = render_thumbnails(atlas_file, region_file, workers=workers)
+    out_dir = os.path.join(output, atlas_name.replace(os.sep, "_"))
+    os.makedirs(out_dir, exist_ok=True)
+    for label in regions:
+        for plane_index in range(3):
+            name = thumbnail_name(label, plane_index)
+            shutil.copyfile(os.path.join(cache_dir, name), os.path.join(out_dir, name))
+    region_map, _ = read_lut(region_file)
+    index_path = os.path.join(out_dir, "index.html")
+    write_index(index_path, atlas_name, regions, region_map, read_region_info(region_file))
+    if pdf:
+        write_pdf(index_path, os.path.join(out_dir, f"{os.path.basename(out_dir)}.pdf"))
+    return out_dir, len(regions)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export printable per-region study sheets of NeuroGuessr atlases.")
+    parser.add_argument("atlas", nargs="*", help="atlas display names (default: --all)")
+    parser.add_argument("--all", action="store_true", help="export every bundled atlas")
+    parser.add_argument("-o", "--output", default="study_sheets", help="output directory")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    parser.add_argument("--pdf", action="store_true", help="also print each index to PDF")
+    args = parser.parse_args()
+    atlas_options = default_atlas_options()
+    names = list(atlas_options) if args.all or not args.atlas else args.atlas
+    for name in names:
+        if name not in atlas_options:
+            print(f"Warning: Unknown atlas {name}, skipping.")
+            continue
+        out_dir, count = export_atlas(name, *atlas_options[name], args.output, args.workers, args.pdf)
+        print(f"{name}: {count} regions -> {out_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import os
+import time
+import numpy as np
+from data_pack import load_nifti
+from cache_utils import get_cache_dir, file_hash, atomic_save_npy
+from resampling import label_array, needs_resampling, load_resampled_atlas
+from memory import MEMORY
+from rle_volume import RLEVolume
+
+# Label volumes with at least this many voxels (128 MB as int32) are kept
+# run-length encoded in RAM instead of decoded; see rle_volume.py.
+RLE_MIN_VOXELS = 32 * 2 ** 20
+
+# Python's zlib cannot resume inflation at the bit-aligned deflate block
+# boundaries a gzip seek-point index would need, so the persisted random-access
+# structure is a decoded raw copy of each file, keyed by the gzip content hash.
+# Later launches memory-map it and only touch the pages a slice needs.
+
+def decoded_cache_path(nifti_file, labels=False):
+    kind = "labels" if labels else "image"
+    return os.path.join(get_cache_dir("decoded"), f"{file_hash(nifti_file)}_{kind}.npy")
+
+def decode_volume(img, labels=False):
+    """Fully decode an image's voxel array (int32 for label atlases)."""
+    if labels:
+        return label_array(img)
+    return np.asanyarray(img.dataobj)
+
+def rle_cache_path(nifti_file):
+    return os.path.join(get_cache_dir("decoded"), f"{file_hash(nifti_file)}_labels.rle.npz")
+
+def open_rle_labels(nifti_file, img):
+    """Run-length encoded labels of an image, from the cache when it has them."""
+    cache_file = rle_cache_path(nifti_file)
+    if os.path.exists(cache_file):
+        try:
+            volume = RLEVolume.load(cache_file)
+            if volume.shape == img.shape[:3]:
+                return volume
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable volume cache {cache_file}: {e}")
+    volume = RLEVolume.from_array(img.dataobj)
+    try:
+        volume.save(cache_file)
+    except OSError as e:
+        print(f"Warning: Failed to write volume cache: {e}")
+    return volume
+
+def open_volume(nifti_file, labels=False):
+    """Return (image, array, from_cache); the array is memory-mapped when the decoded cache exists."""
+    img = load_nifti(nifti_file)
+    cache_file = decoded_cache_path(nifti_file, labels)
+    if os.path.exists(cache_file):
+        try:
+            data = np.load(cache_file, mmap_mode='r')
+            if data.shape == img.shape:
+                return img, data, True
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable volume cache {cache_file}: {e}")
+    data = decode_volume(img, labels)
+    try:
+        atomic_save_npy(cache_file, data)
+    except OSError as e:
+        print(f"Warning: Failed to write volume cache: {e}")
+    return img, data, False
+
+def open_atlas_on_template(atlas_file, template_file, template_img):
+    """Return (image, int32 label array) for an atlas on the template grid, resampling if needed.
+
+    Grids of RLE_MIN_VOXELS or more, and every grid in the low-memory profile,
+    come back as an RLEVolume instead of an array.
+    """
+    atlas_img = load_nifti(atlas_file)
+    large = int(np.prod(template_img.shape[:3])) >= RLE_MIN_VOXELS or MEMORY.low_memory
+    if needs_resampling(atlas_img, template_img):
+        atlas_img = load_resampled_atlas(atlas_file, template_file, atlas_img, template_img)
+        data = np.asanyarray(atlas_img.dataobj)
+        return atlas_img, RLEVolume.from_array(data) if large else data
+    if large:
+        return atlas_img, open_rle_labels(atlas_file, atlas_img)
+    atlas_img, data, _ = open_volume(atlas_file, labels=True)
+    return atlas_img, data
+
+def materialize(volume):
+    """Copy a memory-mapped volume fully into RAM; run this off the GUI thread.
+
+    In the low-memory profile volumes stay mapped and the OS pages them as needed.
+    """
+    if isinstance(volume, np.memmap) and not MEMORY.low_memory:
+        return np.array(volume)
+    return volume
+
+class LoadTimings:
+    """Separate time-to-first-frame and time-to-fully-loaded for one load_data call."""
+
+    def __init__(self, label):
+        self.label = label
+        self.start = time.perf_counter()
+        self.first_frame = None
+        self.fully_loaded = None
+
+    def mark_first_frame(self):
+        self.first_frame = time.perf_counter() - self.start
+
+    def mark_fully_loaded(self):
+        self.fully_loaded = time.perf_counter() - self.start
+        print(f"[load] {self.label}: first frame {self.first_frame * 1000:.0f} ms, "
+              f"fully loaded {self.fully_loaded * 1000:.0f} ms")